@@ -0,0 +1,167 @@
+"""
+Load test for utils.draft_service: many leagues drafting at once against one service.
+
+    python -m benchmarks.load_test_draft_service                      # start a service in-process
+    python -m benchmarks.load_test_draft_service --url http://127.0.0.1:8765 --leagues 500
+
+Every league is created with a random draft slot and then drafts: other teams take players in
+ADP order (with a little noise), we take the service's recommendation. Each league sends one pick
+event per request on its own keep-alive connection, with exponential think time between picks
+(--pick-interval; 0 sends back to back and measures throughput instead). Pick latency is measured
+at the client, end to end (request sent to recommendation received).
+
+The in-process service runs as deployed by default: small solves on the event loop, large ones
+(live_draft.plan_work above --inline-work) in its solver process pool. --inline-work 0 sends every
+solve to the pool and --workers 0 none, to compare against either extreme.
+"""
+import argparse
+import asyncio
+import json
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+from utils.data_access import load_table
+from utils.draft_service import INLINE_WORK
+from utils.pipeline import PLAYER_DATA
+from utils.player_pool import find_column
+
+
+class Client:
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method, path, body=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        payload = json.dumps(body).encode() if body is not None else b""
+        self.writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+                          f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload)
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while (line := await self.reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length)) if length else None
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            await self.writer.wait_closed()
+
+
+async def run_league(host, port, league_id, draft_slot, names, picks, pick_interval, rng, latencies, errors):
+    client = Client(host, port)
+    try:
+        status, state = await client.request("POST", "/leagues", {"league_id": league_id, "draft_slot": draft_slot})
+        if status != 201:
+            errors.append((league_id, status, state))
+            return
+        # Other teams take players roughly in ADP order (neighbours swap now and then); we take
+        # the recommended player when on the clock
+        board = iter(np.argsort(np.arange(len(names)) + rng.normal(0, 2.0, len(names))))
+        drafted = set()
+        await asyncio.sleep(rng.uniform(0, pick_interval))
+        for _ in range(picks):
+            recommendation = state.get("recommendation") or {}
+            player = recommendation.get("player") if recommendation.get("on_the_clock") else None
+            while player is None or player in drafted:
+                player = names[next(board)]
+            drafted.add(player)
+
+            start = time.perf_counter()
+            status, state = await client.request("POST", f"/leagues/{league_id}/picks", {"player": player})
+            latencies.append(time.perf_counter() - start)
+            if status != 200 or "error" in (state.get("recommendation") or {}):
+                errors.append((league_id, status, state))
+                return
+            await asyncio.sleep(rng.exponential(pick_interval) if pick_interval else 0)
+        await client.request("DELETE", f"/leagues/{league_id}")
+    finally:
+        await client.close()
+
+
+async def load_test(host, port, n_leagues, picks, concurrency, pick_interval, seed=0):
+    player_df = load_table(PLAYER_DATA, dtype=np.float64).sort_values("ADP", kind="stable")
+    names = player_df[find_column(player_df, "name")].drop_duplicates().tolist()
+    rng = np.random.default_rng(seed)
+    latencies, errors = [], []
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with gate:
+            await run_league(host, port, f"load-{i}", int(rng.integers(1, 13)), names, picks,
+                             pick_interval, np.random.default_rng([seed, i]), latencies, errors)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(n_leagues)))
+    elapsed = time.perf_counter() - start
+
+    client = Client(host, port)
+    _, server_stats = await client.request("GET", "/stats")
+    await client.close()
+    return np.asarray(latencies) * 1e3, errors, elapsed, server_stats
+
+
+async def _main(args):
+    server_task = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        from utils.draft_service import load_service
+
+        host, port = "127.0.0.1", args.port
+        service = load_service(workers=args.workers, inline_work=args.inline_work)
+        ready = asyncio.Event()
+        server_task = asyncio.create_task(service.serve(host, port, ready=ready))
+        await ready.wait()
+
+    try:
+        latencies, errors, elapsed, server_stats = await load_test(host, port, args.leagues, args.picks,
+                                                                   args.concurrency or args.leagues,
+                                                                   args.pick_interval, args.seed)
+    finally:
+        if server_task is not None:
+            server_task.cancel()
+            await asyncio.gather(server_task, return_exceptions=True)
+
+    print(f"{args.leagues} leagues, {len(latencies)} pick events in {elapsed:.2f}s "
+          f"({len(latencies) / elapsed:.0f} events/s), {len(errors)} errors")
+    if len(latencies):
+        print("client latency ms: " + ", ".join(f"p{q}={np.percentile(latencies, q):.2f}" for q in (50, 95, 99))
+              + f", max={latencies.max():.2f}")
+    print(f"server: {json.dumps(server_stats)}")
+    for error in errors[:5]:
+        print(f"error: {error}")
+    return 1 if errors else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load_test_draft_service",
+                                     description="Concurrent-league load test for utils.draft_service.")
+    parser.add_argument("--url", help="running service (default: start one in-process)")
+    parser.add_argument("--port", type=int, default=8765, help="port of the in-process service")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="solver processes of the in-process service (default: the service's own, one per "
+                             "CPU; 0 solves on the event loop)")
+    parser.add_argument("--inline-work", type=float, default=INLINE_WORK,
+                        help="largest solve the in-process service runs on its event loop (0: pool only)")
+    parser.add_argument("--leagues", type=int, default=200)
+    parser.add_argument("--picks", type=int, default=40, help="pick events per league")
+    parser.add_argument("--pick-interval", type=float, default=2.0,
+                        help="mean seconds between a league's picks (0: as fast as possible, a throughput test)")
+    parser.add_argument("--concurrency", type=int, help="leagues in flight at once (default: all)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    return asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,310 @@
+"""
+Benchmarks for the draft-prep hot paths on synthetic pools (utils.synthetic_pool).
+
+    python -m benchmarks.run_benchmarks                       # full grid, JSON to benchmarks/results/
+    python -m benchmarks.run_benchmarks --quick --filter vor  # smallest sizes, matching benchmarks only
+    python -m benchmarks.run_benchmarks --compare --fail-on-regression  # against the committed baseline.json
+
+Each benchmark is run at a base size (300 players, 12 teams, 8 rounds) and then with one of
+players / teams / rounds scaled up at a time, which gives a scaling curve per dimension.
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+from paths import PROJECT_ROOT
+from utils.availability_index import AvailabilityIndex
+from utils.draft_playbook import PlaybookTable, recommend_draft_plan
+from utils.draft_pool_calcs import calculate_expected_vor, compute_proj_by_position, compute_single_vor
+from utils.draft_schedule import generate_pick_order, picks_by_team
+from utils.draft_simulator import DraftSimulator
+from utils.mip_draft_model import DraftOptimizer, PlayerDraftOptimizer
+from utils.synthetic_pool import make_player_pool, make_roster_constraints
+from utils.target_resolver import drafted_player
+from utils.vor_playbook import build_vor_playbook
+
+RESULTS_DIR = PROJECT_ROOT / "benchmarks" / "results"
+BASELINE_PATH = PROJECT_ROOT / "benchmarks" / "baseline.json"
+
+# CBC shipped with the project environment (share/cbc), ahead of whatever is first on PATH
+CBC_CANDIDATES = [PROJECT_ROOT / "share" / "cbc" / "bin" / "cbc", PROJECT_ROOT / "share" / "cbc" / "bin" / "cbc.exe",
+                  PROJECT_ROOT / "share" / "cbc" / "cbc", PROJECT_ROOT / "share" / "cbc" / "cbc.exe"]
+
+BASE_SIZE = {"n_players": 300, "num_teams": 12, "rounds": 8}
+SCALED_SIZES = {"n_players": [1000, 5000], "num_teams": [8, 16], "rounds": [14, 20]}
+
+POSITION_LIMITS = {"QB": 1, "RB": 2, "WR": 2, "TE": 1, "FLEX": 1, "PK": 1}
+
+
+def cbc_executable():
+    """The bundled CBC binary if the environment has one, else the one on PATH (None if neither)."""
+    bundled = next((path for path in CBC_CANDIDATES if path.is_file()), None)
+    return str(bundled) if bundled is not None else shutil.which("cbc")
+
+
+def _use_cbc(optimizer):
+    """Point the optimizer's solver at cbc_executable(), so every run times the same binary."""
+    from pyomo.environ import SolverFactory
+
+    executable = cbc_executable()
+    if executable is None:
+        raise RuntimeError("no cbc executable in share/cbc or on PATH")
+    optimizer._solver, optimizer._solver_name = SolverFactory("cbc", executable=executable), "cbc"
+
+
+def _pool(n_players):
+    return make_player_pool(n_players, seed=0)
+
+
+def _our_picks(num_teams, rounds, slot=1):
+    return picks_by_team(generate_pick_order(num_teams, rounds, "snake"))[slot]
+
+
+def bench_calculate_expected_vor(n_players, num_teams, rounds):
+    df = _pool(n_players)
+    return lambda: calculate_expected_vor(df, num_teams * 2 + 1, num_teams)
+
+
+def bench_compute_single_vor(n_players, num_teams, rounds):
+    df = _pool(n_players)
+    return lambda: compute_single_vor(df, num_teams * 2 + 1, num_teams * 3)
+
+
+def bench_build_vor_playbook(n_players, num_teams, rounds):
+    df = _pool(n_players)
+    return lambda: build_vor_playbook(df, max_pick=num_teams * rounds, max_gap=2 * num_teams)
+
+
+def bench_compute_proj_by_position(n_players, num_teams, rounds):
+    df = _pool(n_players).rename(columns={"position": "Position"})
+    picks = _our_picks(num_teams, rounds)
+    return lambda: compute_proj_by_position(df, picks, ["QB", "RB", "WR", "TE", "DEF", "PK"])
+
+
+def bench_recommend_draft_plan(n_players, num_teams, rounds):
+    vor_df = build_vor_playbook(_pool(n_players), max_pick=num_teams * rounds, max_gap=2 * num_teams)
+    playbook = PlaybookTable(vor_df)
+    player_picks = picks_by_team(generate_pick_order(num_teams, rounds, "snake"))
+    return lambda: recommend_draft_plan(playbook, player_picks, POSITION_LIMITS, rounds=rounds, fallback_gap=num_teams)
+
+
+def bench_simulate_draft(n_players, num_teams, rounds):
+    # One DraftSimulator.simulate draft, with extra FLEX spots so every team can fill `rounds` picks
+    bench = rounds - sum(POSITION_LIMITS.values())
+    simulator = DraftSimulator(_pool(n_players), {**POSITION_LIMITS, "FLEX": POSITION_LIMITS["FLEX"] + max(bench, 0)})
+    rng = np.random.default_rng(0)
+    return lambda: simulator.simulate(num_teams, rounds, rng)
+
+
+def bench_run_iterative_simulation(n_players, num_teams, rounds):
+    from utils.recompute_adp import run_iterative_simulation
+
+    df = _pool(n_players)
+
+    def run():
+        # The loop prints a line per iteration
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_iterative_simulation(df, max_iters=3, tolerance=0.0, n_drafts=100, rng=0)
+    return run
+
+
+def _optimizer(n_players, num_teams, rounds):
+    df = _pool(n_players).rename(columns={"position": "Position"})
+    constraints, positions = make_roster_constraints(rounds)
+    picks = _our_picks(num_teams, rounds)
+    proj_matrix = compute_proj_by_position(df, picks, positions)
+    return DraftOptimizer(picks=picks, current_roster={p: 0 for p in positions}, position_constraints=constraints,
+                          positions=positions, proj_matrix=proj_matrix, flex_limit=1)
+
+
+def bench_optimizer_build(n_players, num_teams, rounds):
+    optimizer = _optimizer(n_players, num_teams, rounds)
+    return optimizer.build
+
+
+def bench_optimizer_solve_cbc(n_players, num_teams, rounds):
+    optimizer = _optimizer(n_players, num_teams, rounds)
+    optimizer.build()
+    _use_cbc(optimizer)
+    return lambda: optimizer.solve(solver_name="cbc")
+
+
+def bench_optimizer_solve_dp(n_players, num_teams, rounds):
+    optimizer = _optimizer(n_players, num_teams, rounds)
+    return lambda: optimizer.solve(solver_name="dp")
+
+
+def _player_optimizer(n_players, num_teams, rounds):
+    constraints, positions = make_roster_constraints(rounds)
+    return PlayerDraftOptimizer(_pool(n_players), _our_picks(num_teams, rounds), {p: 0 for p in positions},
+                                constraints, positions, flex_limit=1)
+
+
+def bench_player_optimizer_prepare(n_players, num_teams, rounds):
+    optimizer = _player_optimizer(n_players, num_teams, rounds)
+    return optimizer._prepare
+
+
+def bench_player_optimizer_solve_flow(n_players, num_teams, rounds):
+    optimizer = _player_optimizer(n_players, num_teams, rounds)
+    return lambda: optimizer.solve(solver_name="flow")
+
+
+def bench_player_optimizer_solve_cbc(n_players, num_teams, rounds):
+    optimizer = _player_optimizer(n_players, num_teams, rounds)
+    optimizer.build()
+    _use_cbc(optimizer)
+    return lambda: optimizer.solve(solver_name="cbc")
+
+
+def bench_drafted_player(n_players, num_teams, rounds):
+    df = _pool(n_players)
+    index = AvailabilityIndex(df)
+    return lambda: drafted_player(df, "WR", num_teams // 2, rounds, num_teams=num_teams, index=index,
+                                  name_col="name", position_col="position")
+
+
+# name -> (setup, size dimensions the benchmark depends on)
+BENCHMARKS = {
+    "calculate_expected_vor": (bench_calculate_expected_vor, ["n_players"]),
+    "compute_single_vor": (bench_compute_single_vor, ["n_players"]),
+    "build_vor_playbook": (bench_build_vor_playbook, ["n_players", "num_teams", "rounds"]),
+    "compute_proj_by_position": (bench_compute_proj_by_position, ["n_players", "num_teams", "rounds"]),
+    "recommend_draft_plan": (bench_recommend_draft_plan, ["num_teams", "rounds"]),
+    "simulate_draft": (bench_simulate_draft, ["n_players", "num_teams", "rounds"]),
+    "run_iterative_simulation": (bench_run_iterative_simulation, ["n_players"]),
+    "DraftOptimizer.build": (bench_optimizer_build, ["rounds"]),
+    "DraftOptimizer.solve[cbc]": (bench_optimizer_solve_cbc, ["rounds"]),
+    "DraftOptimizer.solve[dp]": (bench_optimizer_solve_dp, ["rounds"]),
+    "PlayerDraftOptimizer.prepare": (bench_player_optimizer_prepare, ["n_players", "num_teams", "rounds"]),
+    "PlayerDraftOptimizer.solve[flow]": (bench_player_optimizer_solve_flow, ["n_players", "num_teams", "rounds"]),
+    "PlayerDraftOptimizer.solve[cbc]": (bench_player_optimizer_solve_cbc, ["n_players", "rounds"]),
+    "drafted_player": (bench_drafted_player, ["n_players", "num_teams", "rounds"]),
+}
+
+
+def cases(dimensions, quick=False):
+    """Base size, then each dimension the benchmark depends on scaled up on its own."""
+    yield dict(BASE_SIZE)
+    if quick:
+        return
+    for dim in dimensions:
+        for value in SCALED_SIZES[dim]:
+            yield {**BASE_SIZE, dim: value}
+
+
+def measure(func, min_time=0.2, repeat=5):
+    """
+    Per-call timings: calls are batched so each of `repeat` samples takes at least `min_time`.
+
+    Returns:
+    - Dict with min, median, mean, stdev (seconds per call), number (calls per sample) and repeat
+    """
+    start = time.perf_counter()
+    func()
+    first = time.perf_counter() - start
+    number = max(1, math.ceil(min_time / first)) if first > 0 else 1000
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return {"min": min(samples), "median": statistics.median(samples), "mean": statistics.fmean(samples),
+            "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0, "number": number, "repeat": repeat}
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"), "git_commit": commit,
+            "python": sys.version.split()[0], "numpy": np.__version__, "pandas": pd.__version__,
+            "platform": platform.platform(), "processor": platform.processor() or platform.machine(),
+            "cbc": cbc_executable()}
+
+
+def run(names=None, quick=False, min_time=0.2, repeat=5):
+    results = []
+    for name, (setup, dimensions) in BENCHMARKS.items():
+        if names and not any(n in name for n in names):
+            continue
+        for params in cases(dimensions, quick):
+            try:
+                timing = measure(setup(**params), min_time=min_time, repeat=repeat)
+            except Exception as e:  # e.g. no CBC on this machine; record it and keep going
+                print(f"{name:28s} {json.dumps(params)}  skipped: {e}")
+                results.append({"name": name, "params": params, "error": str(e)})
+                continue
+            print(f"{name:28s} {json.dumps(params)}  median {timing['median'] * 1e3:10.3f} ms")
+            results.append({"name": name, "params": params, **timing})
+    return results
+
+
+def compare(results, baseline, threshold=0.1):
+    """
+    Match results to a baseline run by (name, params) and print median ratios.
+
+    Returns:
+    - List[Dict] -> regressions (ratio above 1 + threshold)
+    """
+    key = lambda r: (r["name"], json.dumps(r["params"], sort_keys=True))
+    base = {key(r): r for r in baseline["results"] if "median" in r}
+    regressions = []
+    print(f"\n{'benchmark':28s} {'params':60s} {'baseline ms':>12s} {'current ms':>12s} {'ratio':>7s}")
+    for r in results:
+        if "median" not in r or key(r) not in base:
+            continue
+        ratio = r["median"] / base[key(r)]["median"]
+        flag = " REGRESSION" if ratio > 1 + threshold else (" faster" if ratio < 1 - threshold else "")
+        print(f"{r['name']:28s} {json.dumps(r['params']):60s} {base[key(r)]['median'] * 1e3:12.3f} "
+              f"{r['median'] * 1e3:12.3f} {ratio:7.2f}{flag}")
+        if ratio > 1 + threshold:
+            regressions.append({**r, "baseline_median": base[key(r)]["median"], "ratio": ratio})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run_benchmarks")
+    parser.add_argument("--filter", nargs="*", help="only benchmarks whose name contains one of these")
+    parser.add_argument("--quick", action="store_true", help="base size only")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timing sample")
+    parser.add_argument("--repeat", type=int, default=5, help="timing samples per case")
+    parser.add_argument("--output", help="JSON results path (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", nargs="?", const=str(BASELINE_PATH),
+                        help="baseline JSON to compare against (default: benchmarks/baseline.json)")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative slowdown reported as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit with status 1 on regressions")
+    args = parser.parse_args(argv)
+
+    report = {"environment": environment(), "results": run(args.filter, args.quick, args.min_time, args.repeat)}
+    output = args.output
+    if output is None:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        output = RESULTS_DIR / f"{report['environment']['timestamp'].replace(':', '')}.json"
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report["results"], json.load(f), args.threshold)
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
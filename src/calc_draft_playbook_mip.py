@@ -1,13 +1,16 @@
+import numpy as np
 import pandas as pd
-from collections import defaultdict
 from paths import PROJECT_ROOT
+from utils.data_access import load_table
 from utils.draft_pool_calcs import compute_proj_by_position  # assumed location
+from utils.availability_index import AvailabilityIndex
+from utils.draft_schedule import generate_pick_order, picks_by_team
 from utils.mip_draft_model import DraftOptimizer  # assumed location
 
 # Load data
 filename = "2025_cleaned_data.csv"
-player_data_path = PROJECT_ROOT / "assets" / "data" / filename
-player_df = pd.read_csv(player_data_path)
+player_df = load_table(filename, dtype=np.float64)
+availability_index = AvailabilityIndex(player_df)
 
 # Positional limits (starter slots)
 position_constraints = [
@@ -23,42 +26,34 @@ flex_limit = 1
 rounds = flex_limit + sum([con["limit"] for con in position_constraints])
 
 
-# Player pick slots in a 12-team snake draft for 8 rounds
-def generate_snake_picks(num_teams=12):
-    draft_order = []
-    for rnd in range(rounds):
-        if rnd % 2 == 0:
-            draft_order += list(range(1, num_teams + 1))
-        else:
-            draft_order += list(range(num_teams, 0, -1))
-    return draft_order
-
-# Build pick map: pick_number -> player_number
-snake_order = generate_snake_picks()
-pick_to_player = {pick + 1: player for pick, player in enumerate(snake_order)}
-
-# Reverse map: player -> list of picks
-player_picks = defaultdict(list)
-for pick, player in pick_to_player.items():
-    player_picks[player].append(pick)
+# Player -> list of overall picks for this league's draft order
+num_teams = 12
+draft_type = "snake"  # "snake", "linear" or "third_round_reversal"
+player_picks = picks_by_team(generate_pick_order(num_teams, rounds, draft_type))
 
 # Target positions for each player based on optimization
 all_results = {}
 positions = ["QB", "RB", "WR", "TE", "DEF", "PK"]
 
+optimizer = None
+
 for player_id, picks in player_picks.items():
     picks = picks[:rounds]  # only consider 8 rounds
 
-    proj_matrix = compute_proj_by_position(player_df, picks, positions)
+    proj_matrix = compute_proj_by_position(player_df, picks, positions, index=availability_index)
 
-    optimizer = DraftOptimizer(picks=picks,
-                               current_roster={p:0 for p in positions},
-                               position_constraints=position_constraints,
-                               positions=positions,
-                               proj_matrix=proj_matrix,
-                               flex_limit = flex_limit)
+    # Build the model once; later slots only swap in their picks and projections
+    if optimizer is None:
+        optimizer = DraftOptimizer(picks=picks,
+                                   current_roster={p:0 for p in positions},
+                                   position_constraints=position_constraints,
+                                   positions=positions,
+                                   proj_matrix=proj_matrix,
+                                   flex_limit = flex_limit)
+        optimizer.build()
+    else:
+        optimizer.update(picks=picks, proj_matrix=proj_matrix)
 
-    optimizer.build()
     optimizer.solve()
     draft_plan_df = optimizer.get_solu()
 
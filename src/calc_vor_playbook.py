@@ -1,28 +1,18 @@
-import pandas as pd
-from utils.draft_pool_calcs import calculate_expected_vor
+import numpy as np
+from utils.data_access import load_table
+from utils.vor_playbook import build_vor_playbook
 from paths import PROJECT_ROOT
 
-filename = "2025_cleaned_data.csv"
-projection_filepath = PROJECT_ROOT / "assets" / "data" / filename
-data_df = pd.read_csv(projection_filepath)
-
-results = []
+# League settings (as src/calc_draft_playbook.py)
+num_teams = 12
+rounds = 8
 
-for pick_number in range(1, 101):
-    for picks_until_next in range(1, 25):
-        vor = calculate_expected_vor(data_df, pick_number, picks_until_next)
-
-        results.append({
-            "pick_number": pick_number,
-            "picks_until_next": picks_until_next,
-            "rb_vor": vor.get("RB", 0),
-            "wr_vor": vor.get("WR", 0),
-            "qb_vor": vor.get("QB", 0),
-            "te_vor": vor.get("TE", 0),
-            "pk_vor": vor.get("PK", 0)
-        })
+# float64 so the written playbook matches values computed from the CSV
+filename = "2025_cleaned_data.csv"
+data_df = load_table(filename, dtype=np.float64)
 
-vor_df = pd.DataFrame(results)
+# Whole (pick_number, picks_until_next) grid in one pass: every pick of the draft, every wait between picks
+vor_df = build_vor_playbook(data_df, max_pick=num_teams * rounds, max_gap=2 * num_teams)
 vor_df.to_csv(PROJECT_ROOT / "assets" / "data" / "vor_playbook.csv", index=False)
 
 print(vor_df.head())
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Tests import the repo's top-level modules (paths, utils.*) as the scripts do
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils.adp_stream import StreamingAdp, stream_adp
+
+
+def pick_log(n_picks, n_players=60, seed=0, days=30):
+    rng = np.random.default_rng(seed)
+    player = rng.integers(0, n_players, n_picks)
+    return pd.DataFrame({
+        "Name": [f"Player {i}" for i in player],
+        "Position": np.array(["QB", "RB", "WR", "TE"])[player % 4],
+        "Team": np.array(["KC", "BUF", "PHI"])[rng.integers(0, 3, n_picks)],
+        "Overall": np.maximum(1, np.round(player * 2.5 + rng.normal(0, 6, n_picks))).astype(int),
+        "Timestamp": pd.Timestamp("2025-08-01") + pd.to_timedelta(np.sort(rng.integers(0, days * 86400, n_picks)), unit="s"),
+    })
+
+
+def reference_stats(log, half_life=None):
+    """Per-player weighted mean / sample std in one pass over the whole log."""
+    days = (log["Timestamp"] - log["Timestamp"].max()).dt.total_seconds() / 86400
+    log = log.assign(w=1.0 if half_life is None else 2.0 ** (days / half_life))
+    rows = {}
+    for name, g in log.groupby("Name"):
+        w, x = g["w"].to_numpy(), g["Overall"].to_numpy(dtype=float)
+        mean = np.sum(w * x) / w.sum()
+        effective = w.sum() - np.sum(w * w) / w.sum()
+        std = np.sqrt(np.sum(w * (x - mean) ** 2) / effective) if len(g) > 1 else 0.0
+        rows[name] = (mean, std, x.min(), x.max(), len(g))
+    return pd.DataFrame.from_dict(rows, orient="index", columns=["mean", "std", "high", "low", "count"])
+
+
+def state(estimator):
+    n = len(estimator.names)
+    weight = estimator.weight[:n]
+    effective = weight - estimator.weight_sq[:n] / weight
+    std = np.sqrt(np.divide(estimator.m2[:n], effective, out=np.zeros(n), where=estimator.count[:n] > 1))
+    return pd.DataFrame({"mean": estimator.mean[:n], "std": std, "high": estimator.high[:n],
+                         "low": estimator.low[:n], "count": estimator.count[:n]}, index=estimator.names)
+
+
+@pytest.mark.parametrize("half_life", [None, 3.0])
+def test_chunked_updates_match_the_whole_log(half_life):
+    log = pick_log(20_000)
+    expected = reference_stats(log, half_life)
+    for chunk_size in (len(log), 997, None):
+        estimator = StreamingAdp(half_life=half_life)
+        if chunk_size is None:
+            # Record by record, as parsed log lines
+            estimator.update_records(log.to_dict("records"), batch_size=333)
+        else:
+            for start in range(0, len(log), chunk_size):
+                estimator.update(log.iloc[start:start + chunk_size])
+        got = state(estimator).loc[expected.index]
+        np.testing.assert_allclose(got[["mean", "std"]], expected[["mean", "std"]], rtol=1e-9)
+        assert got[["high", "low", "count"]].astype(int).equals(expected[["high", "low", "count"]].astype(int))
+
+
+def test_rescaling_keeps_decayed_estimates():
+    # 400 days at a 2-day half-life is far past MAX_WEIGHT_EXPONENT, so the state gets rescaled on the way
+    log = pick_log(6_000, days=400)
+    estimator = StreamingAdp(half_life=2.0)
+    for start in range(0, len(log), 500):
+        estimator.update(log.iloc[start:start + 500])
+    expected = reference_stats(log, 2.0)
+    # Players only picked long ago have underflowed to weight 0; compare the ones still carrying weight
+    live = expected.index[state(estimator).loc[expected.index, "count"] > 1]
+    np.testing.assert_allclose(state(estimator).loc[live, "mean"], expected.loc[live, "mean"], rtol=1e-9)
+    assert np.isfinite(estimator.mean[:len(estimator.names)]).all()
+
+
+def test_memory_depends_on_players_not_picks():
+    log = pick_log(50_000, n_players=40)
+    estimator = StreamingAdp()
+    estimator.update(log.iloc[:1000])
+    capacity = estimator._capacity
+    for start in range(1000, len(log), 1000):
+        estimator.update(log.iloc[start:start + 1000])
+    assert estimator._capacity == capacity and len(estimator.names) == 40 and estimator.n_picks == len(log)
+
+
+def test_files_give_the_adp_table(tmp_path):
+    log = pick_log(3_000)
+    log.to_csv(tmp_path / "log.csv", index=False)
+    log.assign(Timestamp=log["Timestamp"].astype(str)).to_json(tmp_path / "log.jsonl", orient="records", lines=True)
+
+    df = stream_adp([tmp_path / "log.csv"], chunksize=250)
+    assert stream_adp([tmp_path / "log.jsonl"], chunksize=400).equals(df)
+    expected = reference_stats(log).loc[df["Name"]]
+    assert df["Overall"].tolist() == np.round(expected["mean"], 1).tolist()
+    assert df["Times Drafted"].tolist() == expected["count"].tolist()
+    assert df["Overall"].is_monotonic_increasing
+    rounds, slot = np.divmod(np.round(expected["mean"].to_numpy()) - 1, 12)
+    assert df["ADP"].tolist() == np.round(rounds + 1 + (slot + 1) / 100, 2).tolist()
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils.availability_index import AvailabilityIndex
+from utils.data_access import DATA_DIR
+from utils.draft_pool_calcs import compute_proj_by_position
+
+
+def brute_force_top(position, adp, proj, available, cutoff, k):
+    """k best rows at `position` (a bool mask) with ADP >= cutoff, best first, ties to the lower row."""
+    rows = np.flatnonzero(position & available & (adp >= cutoff) & ~np.isnan(proj))
+    rows = rows[np.lexsort((rows, -proj[rows]))][:k].tolist()
+    return rows + [-1] * (k - len(rows))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_top_available_rows_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    n = 150
+    df = pd.DataFrame({
+        "position": rng.choice(["QB", "RB", "WR", "TE"], n),
+        "ADP": np.where(rng.random(n) < 0.05, np.nan, rng.integers(1, 120, n).astype(float)),
+        # Rounded, so there are ties; a few players have no projection
+        "proj_points": np.where(rng.random(n) < 0.05, np.nan, rng.integers(50, 80, n).astype(float)),
+    })
+    index = AvailabilityIndex(df)
+    positions, adp, proj = df["position"].to_numpy(), df["ADP"].to_numpy(), df["proj_points"].to_numpy()
+    available = np.ones(n, dtype=bool)
+    cutoffs = np.concatenate([rng.uniform(0, 130, 30), [1.0, 1.0, 119.0]])
+
+    for _ in range(4):
+        for position in ["QB", "RB", "WR", "TE", "K"]:
+            for k in (1, 3, 8):
+                top = index.top_available_rows(position, cutoffs, k)
+                expected = [brute_force_top(positions == position, adp, proj, available, cutoff, k)
+                            for cutoff in cutoffs]
+                assert top.tolist() == expected
+                assert np.array_equal(top[:, 0], index.best_available_row(position, cutoffs))
+        drafted = rng.choice(np.flatnonzero(available), 20, replace=False)
+        index.remove(drafted)
+        available[drafted] = False
+
+
+def reference_proj_by_position(df, picks, positions):
+    """The original pandas compute_proj_by_position (draft_pool_calcs before AvailabilityIndex)."""
+    projection_matrix = {}
+    df = df.copy()
+    df["ADP"] = df["ADP"].astype(float)
+    df["proj_points"] = df["proj_points"].astype(float)
+    for pick in picks:
+        for pos in positions:
+            proj_samples = []
+            for offset in [0, -6, 6]:
+                adp_cutoff = pick + offset
+                available = df[(df["ADP"] >= adp_cutoff) & (df["Position"] == pos)]
+                if not available.empty:
+                    top_proj = available["proj_points"].max()
+                    proj_samples.append(top_proj)
+            avg_proj = np.mean(proj_samples) if proj_samples else 0.0
+            projection_matrix[(pick, pos)] = avg_proj
+    return projection_matrix
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_best_available_matches_the_pandas_filter(seed):
+    rng = np.random.default_rng(seed)
+    n = 200
+    df = pd.DataFrame({
+        "position": rng.choice(["QB", "RB", "WR", "TE"], n),
+        "ADP": np.where(rng.random(n) < 0.05, np.nan, rng.uniform(1, 180, n).round(1)),
+        "proj_points": np.where(rng.random(n) < 0.05, np.nan, rng.uniform(50, 300, n).round()),
+    })
+    index = AvailabilityIndex(df)
+    cutoffs = rng.uniform(-5, 200, 50)
+    pool = df
+    for _ in range(3):
+        for position in ["QB", "RB", "WR", "TE", "K"]:
+            expected = [pool[(pool["ADP"] >= cutoff) & (pool["position"] == position)]["proj_points"].max()
+                        for cutoff in cutoffs]
+            assert np.array_equal(index.best_available_batch(position, cutoffs), expected, equal_nan=True)
+            assert np.array_equal([index.best_available(position, cutoff) for cutoff in cutoffs[:5]], expected[:5],
+                                  equal_nan=True)
+        drafted = rng.choice(pool.index.to_numpy(), 30, replace=False)
+        index.remove(drafted)
+        pool = pool.drop(drafted)
+
+
+def test_proj_by_position_matches_the_pandas_version():
+    df = pd.read_csv(DATA_DIR / "2025_cleaned_data.csv")
+    picks = list(range(1, 121, 7)) + [3, 250]
+    positions = ["QB", "RB", "WR", "TE", "PK", "DEF", "K"]
+    assert compute_proj_by_position(df, picks, positions) == reference_proj_by_position(df, picks, positions)
@@ -0,0 +1,60 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+from utils.availability_model import MIN_ADP_STD, ProbabilisticAvailability, _normal_cdf, adp_std_estimate
+from utils.draft_pool_calcs import calculate_expected_vor, compute_proj_by_position
+from utils.synthetic_pool import make_player_pool
+
+
+def test_normal_cdf_is_within_the_stated_error():
+    z = np.linspace(-8, 8, 4001)
+    exact = np.array([0.5 * (1 + math.erf(x / math.sqrt(2))) for x in z])
+    assert np.abs(_normal_cdf(z) - exact).max() < 1.5e-7
+
+
+def test_std_falls_back_to_the_spread_then_a_fraction_of_adp():
+    df = pd.DataFrame({"ADP": [10.0, 50.0, 100.0, 2.0], "adp_std": [3.0, np.nan, np.nan, np.nan],
+                       "adp_high": [1.0, 40.0, np.nan, np.nan], "adp_low": [30.0, 65.0, np.nan, np.nan]})
+    assert adp_std_estimate(df).tolist() == [3.0, 5.0, 10.0, MIN_ADP_STD]
+
+
+def test_expected_best_matches_monte_carlo():
+    df = make_player_pool(150, seed=2)
+    model = ProbabilisticAvailability(df)
+    picks = np.array([1, 12, 30, 55, 90, 140])
+
+    # Independent Normal(ADP, std) draft slots, as the model assumes
+    rng = np.random.default_rng(0)
+    n_samples = 20000
+    slots = rng.normal(df["ADP"].to_numpy(), adp_std_estimate(df), (n_samples, len(df)))
+    for pos in ["QB", "RB", "WR", "TE"]:
+        at_pos = (df["position"] == pos).to_numpy()
+        proj = df["proj_points"].to_numpy()[at_pos]
+        for pick, expected in zip(picks, model.expected_best(pos, picks)):
+            available = slots[:, at_pos] > pick - 0.5
+            best = np.where(available, proj, 0.0).max(axis=1)
+            assert expected == pytest.approx(best.mean(), abs=4 * best.std() / math.sqrt(n_samples) + 1e-4)
+
+
+def test_vectorized_grid_matches_a_per_player_loop():
+    df = make_player_pool(80, seed=3)
+    model = ProbabilisticAvailability(df)
+    picks = np.arange(1, 100, 9)
+    for pos in model.positions:
+        rows = df[df["position"] == pos].sort_values("proj_points", ascending=False, kind="stable")
+        std = adp_std_estimate(rows)
+        for pick, expected in zip(picks, model.expected_best(pos, picks)):
+            value, all_gone = 0.0, 1.0
+            for adp, sd, proj in zip(rows["ADP"], std, rows["proj_points"]):
+                available = 1 - _normal_cdf((pick - 0.5 - adp) / sd)
+                value += proj * available * all_gone
+                all_gone *= 1 - available
+            assert expected == pytest.approx(value, rel=1e-6)
+
+    # The drop-in entry points are differences / lookups of the same quantity
+    matrix = compute_proj_by_position(df, picks, model.positions, method="probabilistic")
+    assert matrix[(picks[2], "RB")] == model.expected_best("RB", picks)[2]
+    best = model.expected_best("WR", [20, 27])
+    assert calculate_expected_vor(df, 20, 7, method="probabilistic")["WR"] == best[0] - best[1]
@@ -0,0 +1,64 @@
+import json
+import shutil
+
+import pytest
+from benchmarks import run_benchmarks
+from benchmarks.run_benchmarks import BASE_SIZE, BASELINE_PATH, BENCHMARKS, SCALED_SIZES, cases, compare, main
+
+
+def test_cases_scale_one_dimension_at_a_time():
+    assert list(cases(["rounds"], quick=True)) == [BASE_SIZE]
+    sizes = list(cases(["n_players", "rounds"]))
+    assert sizes[0] == BASE_SIZE and len(sizes) == 1 + len(SCALED_SIZES["n_players"]) + len(SCALED_SIZES["rounds"])
+    for size in sizes[1:]:
+        assert sum(size[dim] != BASE_SIZE[dim] for dim in BASE_SIZE) == 1
+
+
+def test_quick_run_covers_every_benchmark(tmp_path):
+    output = tmp_path / "results.json"
+    main(["--quick", "--min-time", "0", "--repeat", "1", "--output", str(output)])
+    report = json.loads(output.read_text())
+    assert {"git_commit", "python", "numpy", "pandas"} <= set(report["environment"])
+    assert [r["name"] for r in report["results"]] == list(BENCHMARKS)
+    for r in report["results"]:
+        assert r["params"] == BASE_SIZE
+        # CBC missing on this machine is recorded, anything else must time cleanly
+        assert r["median"] > 0 if "error" not in r else "cbc" in r["name"]
+
+
+def test_compare_flags_slowdowns_past_the_threshold(tmp_path, capsys):
+    params = dict(BASE_SIZE)
+    results = [{"name": "a", "params": params, "median": 1.05}, {"name": "b", "params": params, "median": 1.5},
+               {"name": "c", "params": params, "median": 0.5}, {"name": "new", "params": params, "median": 9.0},
+               {"name": "d", "params": params, "error": "no cbc"}]
+    baseline = {"results": [{"name": name, "params": dict(reversed(params.items())), "median": 1.0}
+                            for name in ["a", "b", "c", "d"]]}
+    regressions = compare(results, baseline, threshold=0.1)
+    assert [(r["name"], r["ratio"]) for r in regressions] == [("b", 1.5)]
+    assert "faster" in capsys.readouterr().out
+
+    path = tmp_path / "baseline.json"
+    path.write_text(json.dumps({"results": [{"name": "calculate_expected_vor", "params": BASE_SIZE,
+                                             "median": 1e-9}]}))
+    argv = ["--quick", "--filter", "calculate_expected_vor", "--min-time", "0", "--repeat", "1",
+            "--output", str(tmp_path / "out.json"), "--compare", str(path)]
+    main(argv)  # reported, but only fails the run when asked to
+    with pytest.raises(SystemExit):
+        main(argv + ["--fail-on-regression"])
+
+
+def test_committed_baseline_covers_the_full_grid():
+    baseline = json.loads(BASELINE_PATH.read_text())
+    timed = {(r["name"], json.dumps(r["params"], sort_keys=True)) for r in baseline["results"] if "median" in r}
+    for name, (_, dimensions) in BENCHMARKS.items():
+        for params in cases(dimensions):
+            assert (name, json.dumps(params, sort_keys=True)) in timed
+
+
+def test_cbc_prefers_the_bundled_binary(tmp_path, monkeypatch):
+    bundled = tmp_path / "share" / "cbc" / "bin" / "cbc"
+    monkeypatch.setattr(run_benchmarks, "CBC_CANDIDATES", [bundled])
+    assert run_benchmarks.cbc_executable() == shutil.which("cbc")
+    bundled.parent.mkdir(parents=True)
+    bundled.write_text("")
+    assert run_benchmarks.cbc_executable() == str(bundled)
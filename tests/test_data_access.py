@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils import data_access
+from utils.data_access import load_table
+
+
+@pytest.fixture
+def source(tmp_path):
+    (tmp_path / "players.csv").write_text(
+        "Player,Position,Team,Std Dev,proj_points,Bye\n"
+        "Ja'Marr Chase,WR,CIN,1.5,310.2,10\n"
+        "Saquon Barkley,RB,PHI,,290.0,9\n"
+        ",QB,BUF,3.0,,7\n"
+        "Brandon Aubrey,K,DAL,8.25,150.5,10\n"
+    )
+    data_access._loaded.clear()
+    yield tmp_path
+    data_access._loaded.clear()
+
+
+def test_cached_table_equals_parsed_csv(source, monkeypatch):
+    parsed = load_table("players.csv", data_dir=source, use_cache=False)
+    assert list(parsed.columns[:4]) == ["name", "position", "team", "adp_std"]
+    assert isinstance(parsed["position"].dtype, pd.CategoricalDtype)
+    assert parsed["proj_points"].dtype == np.float32
+
+    pd.testing.assert_frame_equal(load_table("players.csv", data_dir=source, cache_dir=source), parsed)
+    assert len(list(source.glob("players-*.npz"))) == 1
+
+    # A fresh process reads the .npz (missing names included) without parsing the CSV again
+    data_access._loaded.clear()
+    monkeypatch.setattr(pd, "read_csv", lambda *args, **kwargs: pytest.fail("CSV parsed despite the cache"))
+    cached = load_table("players.csv", data_dir=source, cache_dir=source)
+    pd.testing.assert_frame_equal(cached, parsed)
+    assert cached["name"].isna().tolist() == [False, False, True, False]
+
+
+def test_changed_source_replaces_its_cache(source):
+    first = load_table("players.csv", data_dir=source, cache_dir=source)
+    (source / "players.csv").write_text((source / "players.csv").read_text().replace("310.2", "300.0"))
+    second = load_table("players.csv", data_dir=source, cache_dir=source)
+    assert first["proj_points"].iloc[0] == np.float32(310.2) and second["proj_points"].iloc[0] == 300.0
+    assert len(list(source.glob("players-*.npz"))) == 1
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils.data_access import DATA_DIR
+from utils.draft_playbook import PlaybookTable, recommend_draft_plan
+from utils.draft_schedule import generate_pick_order, picks_by_team
+
+POSITION_LIMITS = {"QB": 1, "RB": 2, "WR": 2, "TE": 1, "FLEX": 1, "PK": 1}
+
+
+def reference_plan(vor_df, player_picks, position_limits, rounds=8, fallback_gap=12):
+    """The original DataFrame-filter recommend_draft_plan (src/calc_draft_playbook.py), rounds/gap made parameters."""
+    plans = {}
+    for player_id, picks in player_picks.items():
+        picks = picks[:rounds]
+        roster = {pos: 0 for pos in position_limits}
+        plan = []
+        for i, pick in enumerate(picks):
+            picks_until_next = picks[i + 1] - pick if i + 1 < len(picks) else fallback_gap
+            row = vor_df[(vor_df['pick_number'] == pick) & (vor_df['picks_until_next'] == picks_until_next)]
+            if row.empty:
+                plan.append((pick, "NA"))
+                continue
+            row = row.iloc[0]
+            position_vors = {"QB": row.get("qb_vor", 0), "RB": row.get("rb_vor", 0), "WR": row.get("wr_vor", 0),
+                             "TE": row.get("te_vor", 0), "PK": row.get("pk_vor", 0)}
+            if roster["QB"] >= position_limits["QB"]:
+                position_vors["QB"] = -float("inf")
+            if roster["RB"] >= position_limits["RB"] and roster["FLEX"] >= position_limits["FLEX"]:
+                position_vors["RB"] = -float("inf")
+            if roster["WR"] >= position_limits["WR"] and roster["FLEX"] >= position_limits["FLEX"]:
+                position_vors["WR"] = -float("inf")
+            if roster["TE"] >= position_limits["TE"]:
+                position_vors["TE"] = -float("inf")
+            if roster["PK"] >= position_limits["PK"]:
+                position_vors["PK"] = -float("inf")
+            best_pos = max(position_vors, key=position_vors.get)
+            plan.append((pick, best_pos))
+            if best_pos in ["RB", "WR"]:
+                if roster[best_pos] < position_limits[best_pos]:
+                    roster[best_pos] += 1
+                elif roster["FLEX"] < position_limits["FLEX"]:
+                    roster["FLEX"] += 1
+            else:
+                roster[best_pos] += 1
+        plans[player_id] = plan
+    return plans
+
+
+def test_schedules():
+    assert generate_pick_order(3, 4, "snake") == [1, 2, 3, 3, 2, 1, 1, 2, 3, 3, 2, 1]
+    assert generate_pick_order(3, 3, "linear") == [1, 2, 3] * 3
+    assert generate_pick_order(3, 5, "third_round_reversal") == [1, 2, 3, 3, 2, 1, 3, 2, 1, 1, 2, 3, 3, 2, 1]
+    for draft_type in ("snake", "linear", "third_round_reversal"):
+        team_picks = picks_by_team(generate_pick_order(16, 18, draft_type))
+        assert sorted(team_picks) == list(range(1, 17)) and {len(picks) for picks in team_picks.values()} == {18}
+    with pytest.raises(ValueError):
+        generate_pick_order(12, 8, "auction")
+
+
+def test_committed_playbook_gives_the_original_plans():
+    vor_df = pd.read_csv(DATA_DIR / "vor_playbook.csv")
+    player_picks = picks_by_team(generate_pick_order(12, 8))
+    assert recommend_draft_plan(PlaybookTable(vor_df), player_picks, POSITION_LIMITS, rounds=8) == \
+           reference_plan(vor_df, player_picks, POSITION_LIMITS)
+
+
+@pytest.mark.parametrize("draft_type", ["snake", "linear", "third_round_reversal"])
+def test_random_playbooks_match_the_reference(draft_type):
+    rng = np.random.default_rng(len(draft_type))
+    cells = pd.MultiIndex.from_product([range(1, 161), range(1, 30)], names=["pick_number", "picks_until_next"])
+    vor_df = pd.DataFrame({f"{pos}_vor": rng.integers(-5, 40, len(cells)).astype(float)  # ties included
+                           for pos in ["rb", "wr", "qb", "te"]}, index=cells).reset_index()
+    vor_df = vor_df.sample(frac=0.97, random_state=0)  # a few cells missing -> "NA"
+
+    for num_teams in (8, 10, 14):
+        player_picks = picks_by_team(generate_pick_order(num_teams, 12, draft_type))
+        assert recommend_draft_plan(vor_df, player_picks, POSITION_LIMITS, rounds=10, fallback_gap=num_teams) == \
+               reference_plan(vor_df, player_picks, POSITION_LIMITS, rounds=10, fallback_gap=num_teams)
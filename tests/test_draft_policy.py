@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+from utils.data_access import load_table
+from utils.draft_policy import DraftPolicy
+from utils.draft_pool_calcs import compute_proj_by_position
+from utils.mip_draft_model import DraftOptimizer
+from utils.pipeline import DEFAULT_LEAGUE, PLAYER_DATA
+
+
+@pytest.fixture(scope="module")
+def built(tmp_path_factory):
+    player_df = load_table(PLAYER_DATA, dtype=np.float64)
+    return player_df, DraftPolicy.build(player_df, path=tmp_path_factory.mktemp("policy") / "policy.npy",
+                                        max_workers=1)
+
+
+def test_policy_plans_match_the_forward_dp(built):
+    player_df, policy = built
+    league = DEFAULT_LEAGUE
+    for slot, picks in zip(policy.meta["slots"], policy.meta["picks"]):
+        optimizer = DraftOptimizer(picks, {p: 0 for p in league["positions"]}, league["position_constraints"],
+                                   league["positions"], compute_proj_by_position(player_df, picks, league["positions"]),
+                                   league["flex_limit"])
+        optimizer.solve(solver_name="dp")
+        assert policy.plan(slot) == optimizer.solution, slot
+
+
+def test_lookup_off_plan_roster(built):
+    _, policy = built
+    slot = policy.meta["slots"][0]
+    # Two QBs do not fit the roster rules; one QB after one round is a reachable state
+    assert policy.lookup(slot, 2, {"QB": 2}) is None
+    assert policy.lookup(slot, 1, {"QB": 1}) in policy.positions
+    assert policy.lookup(slot, len(policy.plan(slot)), {}) is None
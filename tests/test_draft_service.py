@@ -0,0 +1,56 @@
+import asyncio
+
+import numpy as np
+import pytest
+from utils.data_access import load_table
+from utils.draft_playbook import PlaybookTable
+from utils.draft_service import INLINE_WORK, DraftService
+from utils.live_draft import LiveDraft, plan_work
+from utils.pipeline import DEFAULT_LEAGUE, PLAYER_DATA
+
+# 3 QB, 6 RB, 6 WR, 3 TE, 2 DEF, 2 PK and 3 FLEX: far past INLINE_WORK
+DEEP_LEAGUE = {
+    "position_constraints": [{"positions_against_limit": [p], "limit": limit, "flex": p in ("RB", "WR", "TE")}
+                             for p, limit in [("QB", 3), ("RB", 6), ("WR", 6), ("TE", 3), ("DEF", 2), ("PK", 2)]],
+    "flex_limit": 3,
+}
+
+
+@pytest.fixture(scope="module")
+def tables():
+    return load_table(PLAYER_DATA, dtype=np.float64), PlaybookTable(load_table("vor_playbook.csv", dtype=np.float64))
+
+
+def draft(service, settings, n_picks=3):
+    """Create a league and record the first picks; the recommendations after each pick."""
+    async def run():
+        state = await service.create_league({"draft_slot": 3, **settings})
+        recommendations = [state["recommendation"]]
+        for player in service.player_df.sort_values("ADP")["name"].iloc[:n_picks]:
+            recommendations.append((await service.record_pick(state["league_id"], {"player": player}))["recommendation"])
+        return recommendations
+    try:
+        return asyncio.run(run())
+    finally:
+        service.close()
+
+
+@pytest.mark.parametrize("settings", [{}, DEEP_LEAGUE])
+def test_solves_run_inline_below_the_work_threshold(tables, settings):
+    default = DraftService(*tables, workers=1)
+    expected = draft(default, settings)
+    assert default.pool_solves == (0 if not settings else 4)
+
+    # Same recommendations whichever way each solve went
+    pooled, inline = DraftService(*tables, workers=1, inline_work=0), DraftService(*tables, workers=0)
+    assert draft(pooled, settings) == expected and pooled.pool_solves == 4
+    assert draft(inline, settings) == expected and inline.pool_solves == 0
+
+
+def test_plan_work_of_the_default_league(tables):
+    # 9 picks x (2 * 4 * 4 * 3 * 2 * 2) DP states x 6 positions
+    live = LiveDraft(tables[0], 1, DEFAULT_LEAGUE["position_constraints"], DEFAULT_LEAGUE["positions"],
+                     DEFAULT_LEAGUE["flex_limit"], recommend=False)
+    request = live.plan_request()
+    assert plan_work(request) == 9 * 384 * 6 < INLINE_WORK
+    assert plan_work({**request, "solver_name": "cbc"}) == float("inf")
@@ -0,0 +1,112 @@
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+import pytest
+from utils.data_access import load_table
+from utils.draft_simulator import DraftSimulator
+from utils.player_pool import PlayerPool
+from utils.recompute_adp import position_limits
+
+
+def test_set_adp_matches_a_fresh_simulator():
+    pool = PlayerPool.from_frame(load_table("2024_retrospective_data.csv").reset_index(drop=True))
+    simulator = DraftSimulator(pool, position_limits)
+    simulator.simulate_batch(20, rng=0)
+
+    # ADP as fed back by run_iterative_simulation: shuffled, with NaN for players never taken
+    adp = np.random.default_rng(1).permutation(pool.adp)
+    adp[::7] = np.nan
+    simulator.set_adp(adp)
+    fresh = DraftSimulator(pool.with_adp(adp), position_limits)
+    picks = simulator.simulate_batch(50, rng=2)
+    assert np.array_equal(picks, fresh.simulate_batch(50, rng=2))
+    assert not np.array_equal(picks, DraftSimulator(pool, position_limits).simulate_batch(50, rng=2))
+    assert simulator.simulate(rng=np.random.default_rng(3)) == fresh.simulate(rng=np.random.default_rng(3))
+
+
+def reference_candidates(pool, roster, next_pick):
+    """
+    The original pandas make_pick (recompute_adp before the array simulator), returning its whole
+    candidate set instead of sampling one: index labels of the players it could pick, None if none.
+    """
+    replacement_pool = pool[pool['ADP'] >= next_pick]
+    pos_vor = {}
+
+    for pos in pool['position'].unique():
+        expected_proj = pool[pool['position'] == pos]['proj_points'].max()
+        replacement_proj = replacement_pool[replacement_pool['position'] == pos]['proj_points'].max()
+        vor = expected_proj - replacement_proj
+
+        if pos not in roster or roster[pos] < position_limits.get(pos, 99):
+            pos_vor[pos] = vor
+        elif pos in ["RB", "WR", "TE"]:
+            flex_limit = position_limits["RB"] + position_limits["WR"] + position_limits["TE"] + position_limits["FLEX"]
+            flex_count = roster["RB"] + roster["WR"] + roster["TE"]
+            if flex_count < flex_limit:
+                pos_vor[pos] = vor
+
+    best_pos = max(pos_vor, key=pos_vor.get)
+    best_points = pool[pool['position'] == best_pos]['proj_points'].max()
+    candidates = pool[(pool['position'] == best_pos) & (pool['proj_points'] > best_points*0.9)]
+    return set(candidates.index) if not candidates.empty else None
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_make_pick_matches_the_pandas_rule(seed):
+    rng = np.random.default_rng(seed)
+    n = 80
+    pool = pd.DataFrame({
+        # A few names repeat: drafting one removes every row with it
+        "name": [f"p{i}" for i in rng.integers(0, 70, n)],
+        "position": rng.choice(["QB", "RB", "WR", "TE", "PK"], n),
+        "ADP": np.where(rng.random(n) < 0.1, np.nan, rng.integers(1, 100, n).astype(float)),
+        # Rounded so the 90% band and the VOR comparison see ties; some projections are missing
+        "proj_points": np.where(rng.random(n) < 0.1, np.nan, rng.integers(20, 40, n).astype(float)),
+    })
+    simulator = DraftSimulator(pool, position_limits)
+
+    for _ in range(10):
+        names = pool["name"].unique()
+        drafted = set(rng.choice(names, rng.integers(0, len(names) - 5), replace=False))
+        available = pool[~pool["name"].isin(drafted)]
+        roster = defaultdict(int, {pos: int(rng.integers(0, 3)) for pos in ["QB", "RB", "WR", "TE", "PK"]
+                                   if rng.random() < 0.6})
+        next_pick = int(rng.integers(1, 110))
+
+        expected = reference_candidates(available, defaultdict(int, roster), next_pick)
+        state = simulator.new_draft()
+        for row in np.flatnonzero(pool["name"].isin(drafted)):
+            simulator.draft_player(state, row)
+        # make_pick only moves the state's lazy cursors, so every draw can use the same state
+        chosen = {simulator.make_pick(state, dict(roster), next_pick, draw=draw)
+                  for draw in np.linspace(0, 1, 200, endpoint=False)}
+        assert chosen == ({None} if expected is None else expected)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_simulated_drafts_only_make_picks_the_pandas_rule_allows(seed):
+    pool = load_table("2024_retrospective_data.csv", dtype=np.float64).reset_index(drop=True)
+    team_picks = DraftSimulator(pool, position_limits).simulate(rng=seed)
+    picks = sorted((pick_num, team, name, pos) for team, rows in team_picks.items() for pick_num, name, pos, _ in rows)
+    assert [pick_num for pick_num, *_ in picks] == list(range(1, 97))
+
+    rosters = {team: defaultdict(int) for team in team_picks}
+    available = pool
+    for pick_num, team, name, pos in picks:
+        candidates = reference_candidates(available, rosters[team], pick_num + 12)
+        assert name in set(available.loc[list(candidates), "name"])
+        rosters[team][pos] += 1
+        available = available[available["name"] != name]
+
+
+def test_batch_equals_sequential_simulate_calls():
+    pool = PlayerPool.from_frame(load_table("2024_retrospective_data.csv").reset_index(drop=True))
+    simulator = DraftSimulator(pool, position_limits)
+    for num_teams, rounds in [(12, 8), (16, 7), (8, 8)]:
+        pick_rows = simulator.simulate_batch(40, num_teams, rounds, rng=np.random.default_rng(5))
+        rng = np.random.default_rng(5)
+        for rows in pick_rows:
+            team_picks = simulator.simulate(num_teams, rounds, rng=rng)
+            by_pick = sorted((pick_num, name) for picks in team_picks.values() for pick_num, name, _, _ in picks)
+            assert by_pick == [(i + 1, pool.names[row]) for i, row in enumerate(rows) if row >= 0]
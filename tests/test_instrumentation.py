@@ -0,0 +1,52 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from utils import instrumentation
+from utils.parallel_adp import ParallelDraftRunner
+from utils.recompute_adp import player_df, position_limits
+
+
+@pytest.fixture
+def recorder():
+    recorder = instrumentation.enable()
+    yield recorder
+    instrumentation.disable()
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_parallel_runner_spans_reach_the_parent(recorder, max_workers):
+    with ParallelDraftRunner(player_df, position_limits, max_workers=max_workers, chunk_size=10) as runner:
+        runner.run(30, seed=0)
+    stats = recorder.stats
+    assert stats["DraftSimulator.simulate_batch"][0] == 3
+    assert stats["DraftSimulator.batch_pick"][0] == 3 * 96
+    assert recorder.counters["DraftSimulator.batch_picks"] == 30 * 96
+    # Each span shows up once, whichever process recorded it
+    assert sum(event["name"] == "DraftSimulator.simulate_batch" for event in recorder.events) == 3
+
+
+def test_workers_do_not_record_when_the_parent_does_not():
+    assert not instrumentation.enabled()
+    with ParallelDraftRunner(player_df, position_limits, max_workers=2, chunk_size=10) as runner:
+        runner.run(20, seed=0)
+    assert not instrumentation.enabled()
+
+
+def test_spawned_workers_leave_the_trace_file_to_the_parent(tmp_path):
+    trace = tmp_path / "trace.jsonl"
+    script = (
+        "from concurrent.futures import ProcessPoolExecutor\n"
+        "import multiprocessing\n"
+        "from utils import instrumentation\n"
+        "if __name__ == '__main__':\n"
+        "    with instrumentation.span('parent'):\n"
+        "        with ProcessPoolExecutor(2, mp_context=multiprocessing.get_context('spawn')) as pool:\n"
+        "            assert not pool.submit(instrumentation.enabled).result()\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True, cwd=tmp_path, capture_output=True,
+                   env={**os.environ, "DRAFT_TRACE": str(trace), "PYTHONPATH": str(Path(__file__).parent.parent)})
+    assert [json.loads(line)["name"] for line in trace.read_text().splitlines()] == ["parent"]
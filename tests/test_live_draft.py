@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from utils.data_access import load_table
+from utils.live_draft import LiveDraft
+from utils.pipeline import DEFAULT_LEAGUE, PLAYER_DATA
+
+
+@pytest.fixture(scope="module")
+def player_df():
+    return load_table(PLAYER_DATA, dtype=np.float64).sort_values("ADP", kind="stable").reset_index(drop=True)
+
+
+def new_draft(player_df, **kwargs):
+    return LiveDraft(player_df, 1, DEFAULT_LEAGUE["position_constraints"], DEFAULT_LEAGUE["positions"],
+                     DEFAULT_LEAGUE["flex_limit"], **kwargs)
+
+
+def is_available(draft, name):
+    return draft.available[draft._rows_by_name[name]].any()
+
+
+def draft_until(draft, player_df, pick):
+    """Draft up to (not including) overall pick `pick`: others in ADP order, we as recommended."""
+    while draft.current_pick < pick:
+        if draft.current_pick in draft.our_picks:
+            draft.record_pick(draft.recommendation()["player"])
+        else:
+            draft.record_pick(next(name for name in player_df["name"] if is_available(draft, name)))
+
+
+def test_pick_over_the_roster_limit_goes_to_the_bench(player_df):
+    draft = new_draft(player_df)
+    qbs = iter(player_df.loc[player_df["position"] == "QB", "name"])
+    draft.record_pick(next(qbs))
+    draft_until(draft, player_df, 24)
+
+    # A second QB with one QB slot: the pick stands, the plan covers the remaining slots
+    second_qb = next(name for name in qbs if is_available(draft, name))
+    recommendation = draft.record_pick(second_qb)
+    assert draft.roster["QB"] == 1 and draft.bench == [second_qb]
+    assert draft.current_pick == 25 and draft.history[-1][2] == second_qb
+    assert "error" not in recommendation
+    assert len(recommendation["plan"]) == len(draft.remaining_picks)
+    assert "QB" not in set(recommendation["plan"]["position"])
+
+
+def test_infeasible_board_returns_an_error_recommendation(player_df):
+    # More rounds than roster slots: no plan fills every pick, but the session keeps working
+    draft = new_draft(player_df, rounds=10)
+    recommendation = draft.recommendation()
+    assert recommendation["player"] is None and recommendation["plan"] is None
+    assert "infeasible" in recommendation["error"]
+    draft.record_pick(draft.player_df.at[0, "name"])
+    assert draft.current_pick == 2 and "error" in draft.recommendation()
@@ -0,0 +1,212 @@
+import shutil
+
+import numpy as np
+import pytest
+from utils.mip_draft_model import ConcreteModel, DraftOptimizer, PlayerDraftOptimizer
+from utils.synthetic_pool import make_player_pool
+
+pytestmark = pytest.mark.skipif(ConcreteModel is None or shutil.which("cbc") is None,
+                                reason="needs Pyomo and the cbc executable on PATH")
+
+POSITIONS = ["QB", "RB", "WR", "TE", "DEF", "PK"]
+
+
+def random_league(rng):
+    """Random roster rules: single- and multi-position groups, some flex, some positions unconstrained."""
+    positions = list(rng.permutation(POSITIONS)[:rng.integers(2, len(POSITIONS) + 1)])
+    groups = [[p] for p in positions]
+    if len(groups) > 2 and rng.random() < 0.3:
+        groups = [groups[0] + groups[1]] + groups[2:]
+    if rng.random() < 0.2:
+        groups = groups[:-1]  # the last positions are not limited at all
+    constraints = [{"positions_against_limit": group, "limit": int(rng.integers(0, 4)), "flex": bool(rng.random() < 0.5)}
+                   for group in groups]
+    return positions, constraints, int(rng.integers(0, 3))
+
+
+def random_board(rng, positions, constraints, n_rounds):
+    """Random picks, roster so far and projection matrix (continuous, so the optimum is unique)."""
+    picks = sorted(rng.choice(np.arange(1, 200), size=n_rounds, replace=False).tolist())
+    roster = {p: 0 for p in positions}
+    for con in constraints:
+        if rng.random() < 0.5:
+            roster[con["positions_against_limit"][0]] += int(rng.integers(0, con["limit"] + 1))
+    proj_matrix = {(pick, p): float(rng.uniform(0, 300)) for pick in picks for p in positions}
+    return picks, roster, proj_matrix
+
+
+def solve(optimizer, solver_name):
+    try:
+        optimizer.solve(solver_name=solver_name)
+        return optimizer.get_solu()
+    except RuntimeError:
+        return None
+
+
+def assert_same_optimum(dp, mip, optimizer):
+    # Both infeasible (no plan fills every pick), or the same optimal points
+    assert (dp is None) == (mip is None)
+    if dp is not None:
+        assert dp["proj_points"].sum() == pytest.approx(mip["proj_points"].sum(), abs=1e-6)
+        assert dp["proj_points"].sum() == pytest.approx(optimizer.objective_value, abs=1e-6)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_dp_matches_cbc(seed):
+    rng = np.random.default_rng(seed)
+    positions, constraints, flex_limit = random_league(rng)
+    n_rounds = int(rng.integers(1, 9))
+    picks, roster, proj_matrix = random_board(rng, positions, constraints, n_rounds)
+
+    dp_optimizer = DraftOptimizer(picks, roster, constraints, positions, proj_matrix, flex_limit)
+    mip_optimizer = DraftOptimizer(picks, roster, constraints, positions, proj_matrix, flex_limit)
+    mip_optimizer.build()
+    dp, mip = solve(dp_optimizer, "dp"), solve(mip_optimizer, "cbc")
+    assert_same_optimum(dp, mip, mip_optimizer)
+
+    # The same optimizers moved to new boards with update(), as the pipeline does across slots
+    for _ in range(3):
+        picks, roster, proj_matrix = random_board(rng, positions, constraints, n_rounds)
+        for optimizer in (dp_optimizer, mip_optimizer):
+            optimizer.update(picks=picks, proj_matrix=proj_matrix, current_roster=roster)
+        dp, mip = solve(dp_optimizer, "dp"), solve(mip_optimizer, "cbc")
+        assert_same_optimum(dp, mip, mip_optimizer)
+
+
+def test_updates_reuse_one_model_and_match_a_fresh_build(capfd):
+    rng = np.random.default_rng(0)
+    positions, constraints = POSITIONS, [{"positions_against_limit": [p], "limit": 2, "flex": p in ("RB", "WR")}
+                                         for p in POSITIONS]
+    picks, roster, proj_matrix = random_board(rng, positions, constraints, 6)
+    optimizer = DraftOptimizer(picks, roster, constraints, positions, proj_matrix, flex_limit=1)
+    optimizer.build()
+    model = optimizer.model
+    optimizer.solve(solver_name="cbc")
+    solver = optimizer._solver
+
+    for _ in range(4):
+        picks, roster, proj_matrix = random_board(rng, positions, constraints, 6)
+        optimizer.update(picks=picks, proj_matrix=proj_matrix, current_roster=roster)
+        optimizer.solve(solver_name="cbc")
+        fresh = DraftOptimizer(picks, roster, constraints, positions, proj_matrix, flex_limit=1)
+        fresh.build()
+        fresh.solve(solver_name="cbc")
+        assert optimizer.objective_value == pytest.approx(fresh.objective_value, abs=1e-6)
+        assert optimizer.get_solu()["position"].tolist() == fresh.get_solu()["position"].tolist()
+    # Only Params changed: same model and solver object, and the solver stays quiet by default
+    assert optimizer.model is model and optimizer._solver is solver
+    assert "Welcome to the CBC" not in capfd.readouterr().out
+
+
+def reference_player_mip(df, picks, roster, constraints, positions, flex_limit):
+    """Unpruned player-level MIP: a variable for every player still there at every pick. None if infeasible."""
+    from pyomo.environ import Binary, NonNegativeIntegers, SolverFactory, maximize, value
+    from pyomo.environ import ConstraintList, Objective, Var
+
+    pairs = [(i, r) for i, pick in enumerate(picks) for r in range(len(df))
+             if df["position"].iloc[r] in positions and df["ADP"].iloc[r] >= pick]
+    model = ConcreteModel()
+    model.x = Var(pairs, domain=Binary)
+    model.flex = Var(range(len(constraints)), domain=NonNegativeIntegers)
+    model.total = Objective(expr=sum(df["proj_points"].iloc[r] * model.x[i, r] for i, r in pairs), sense=maximize)
+    model.rules = ConstraintList()
+    for i in range(len(picks)):
+        at_pick = [model.x[i, r] for j, r in pairs if j == i]
+        if not at_pick:
+            return None
+        model.rules.add(sum(at_pick) == 1)
+    for r in {r for _, r in pairs}:
+        model.rules.add(sum(model.x[i, s] for i, s in pairs if s == r) <= 1)
+    for j, con in enumerate(constraints):
+        group = con["positions_against_limit"]
+        drafted = sum(model.x[i, r] for i, r in pairs if df["position"].iloc[r] in group)
+        current = sum(roster.get(p, 0) for p in group)
+        model.rules.add(drafted + current <= con["limit"] + model.flex[j])
+        if not con.get("flex", False):
+            model.rules.add(model.flex[j] == 0)
+    model.rules.add(sum(model.flex[j] for j in range(len(constraints))) <= flex_limit)
+    results = SolverFactory("cbc").solve(model)
+    if results.solver.termination_condition.name != "optimal":
+        return None
+    return value(model.total)
+
+
+def player_solve(optimizer, solver_name):
+    try:
+        optimizer.solve(solver_name=solver_name)
+    except RuntimeError:
+        return None
+    if optimizer.chosen_rows is None:
+        return None
+    return optimizer.chosen_rows.copy(), optimizer.objective_value
+
+
+@pytest.mark.parametrize("seed", range(15))
+def test_player_flow_matches_the_unpruned_cbc_model(seed):
+    rng = np.random.default_rng(seed)
+    positions, constraints, flex_limit = random_league(rng)
+    df = make_player_pool(int(rng.integers(20, 60)), seed=seed)
+    df.loc[df.sample(frac=0.05, random_state=seed).index, "proj_points"] = np.nan
+    df = df[df["proj_points"].notna()].reset_index(drop=True)
+    n_rounds = int(rng.integers(1, 7))
+    picks = sorted(rng.choice(np.arange(1, 40), size=n_rounds, replace=False).tolist())
+    roster = {p: 0 for p in positions}
+
+    flow_optimizer = PlayerDraftOptimizer(df, picks, roster, constraints, positions, flex_limit)
+    mip_optimizer = PlayerDraftOptimizer(df, picks, roster, constraints, positions, flex_limit)
+    try:
+        mip_optimizer.build()
+    except RuntimeError:
+        pass  # no candidate at some pick; the reference must agree below
+    flow, mip = player_solve(flow_optimizer, "flow"), player_solve(mip_optimizer, "cbc")
+    expected = reference_player_mip(df, picks, roster, constraints, positions, flex_limit)
+
+    # Pruning keeps the optimum: the small models reach the full model's points
+    assert (flow is None) == (mip is None) == (expected is None)
+    if expected is None:
+        return
+    assert flow[1] == pytest.approx(expected, abs=1e-6) and mip[1] == pytest.approx(expected, abs=1e-6)
+    for rows, _ in (flow, mip):
+        assert len(set(rows.tolist())) == len(picks)  # never the same player twice
+        assert (df["ADP"].to_numpy()[rows] >= picks).all()  # only players still there at their pick
+        assert set(df["position"].to_numpy()[rows]) <= set(positions)
+
+
+def test_player_update_matches_a_fresh_optimizer():
+    positions, constraints = POSITIONS, [{"positions_against_limit": [p], "limit": 2, "flex": p in ("RB", "WR")}
+                                         for p in POSITIONS]
+    df = make_player_pool(120, seed=0)
+    optimizer = PlayerDraftOptimizer(df, [3, 22, 27, 46], {p: 0 for p in positions}, constraints, positions)
+    optimizer.build()
+    with pytest.raises(ValueError):
+        optimizer.update([5, 20, 29, 44], {})  # DraftOptimizer.update's positional proj_matrix
+
+    board = df.iloc[5:].reset_index(drop=True)
+    for picks, roster, players in [([5, 20, 29, 44], None, None), ([8, 17, 32, 41], {"RB": 2}, board)]:
+        optimizer.update(picks, current_roster=roster, players=players)
+        fresh = PlayerDraftOptimizer(df if players is None else players, picks, roster or {p: 0 for p in positions},
+                                     constraints, positions)
+        for solver_name in ("flow", "cbc"):
+            optimizer.solve(solver_name=solver_name)
+            fresh.solve(solver_name="flow")
+            assert optimizer.objective_value == pytest.approx(fresh.objective_value, abs=1e-6)
+            # Same players; their order across positions can differ between equal-valued plans
+            assert sorted(optimizer.get_solu()["player_name"]) == sorted(fresh.get_solu()["player_name"])
+
+
+def test_dp_picks_up_rule_changes_between_solves():
+    positions = ["QB", "RB", "WR"]
+    constraints = [{"positions_against_limit": [p], "limit": 1, "flex": p != "QB"} for p in positions]
+    picks = [1, 12, 13]
+    proj_matrix = {(pick, p): points for pick in picks for p, points in [("QB", 10.0), ("RB", 30.0), ("WR", 20.0)]}
+    optimizer = DraftOptimizer(picks, {p: 0 for p in positions}, constraints, positions, proj_matrix, flex_limit=1)
+    optimizer.solve(solver_name="dp")
+    assert sorted(optimizer.chosen_positions()) == ["RB", "RB", "WR"]
+
+    # Same roster and number of picks, different rules: the cached transitions must not be reused
+    constraints[1]["limit"] = 0
+    for solver_name in ("dp", "cbc"):
+        if solver_name == "cbc":
+            optimizer.build()
+        optimizer.solve(solver_name=solver_name)
+        assert sorted(optimizer.chosen_positions()) == ["QB", "RB", "WR"]
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+from utils.draft_simulator import DraftSimulator
+from utils.parallel_adp import ParallelDraftRunner
+from utils.recompute_adp import player_df, position_limits
+
+
+def test_results_are_bit_identical_for_any_worker_count():
+    adp = np.random.default_rng(0).permutation(player_df["ADP"].to_numpy())
+    runs = []
+    for max_workers in (1, 2, 3):
+        with ParallelDraftRunner(player_df, position_limits, max_workers=max_workers, chunk_size=15) as runner:
+            # Two runs on one pool: the workers' simulators take the new ADP on the second
+            runs.append([runner.run(100, seed=7), runner.run(100, seed=7, adp=adp)])
+
+    for (stats, points), (expected_stats, expected_points) in zip(sum(runs[1:], []), runs[0] * 2):
+        pd.testing.assert_frame_equal(stats, expected_stats, check_exact=True)
+        assert np.array_equal(points, expected_points)
+    assert not runs[0][0][0].equals(runs[0][1][0])
+
+
+def test_chunks_are_seeded_batches_merged_exactly():
+    with ParallelDraftRunner(player_df, position_limits, max_workers=1, chunk_size=30) as runner:
+        stats, points = runner.run(50, seed=3)
+
+    # Chunk k is a batch seeded by the k-th child of the run's SeedSequence
+    simulator = DraftSimulator(runner.pool, position_limits)
+    children = np.random.SeedSequence(3).spawn(2)
+    pick_rows = np.concatenate([simulator.simulate_batch(size, rng=np.random.default_rng(child))
+                                for size, child in zip([30, 20], children)])
+    pd.testing.assert_frame_equal(stats, simulator.pick_statistics(pick_rows), check_exact=True)
+    assert np.array_equal(points, simulator.team_points(pick_rows))
+    assert stats["times_drafted"].sum() == 50 * 96
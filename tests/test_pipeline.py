@@ -0,0 +1,94 @@
+import json
+
+import pandas as pd
+from utils import pipeline
+from utils.draft_playbook import PlaybookTable, recommend_draft_plan
+from utils.draft_schedule import generate_pick_order, picks_by_team
+from utils.pipeline import DEFAULT_LEAGUE, STAGES
+from utils.synthetic_pool import make_player_pool
+
+STAGE = {stage.name: stage for stage in STAGES}
+
+
+def test_code_modules_follow_imports():
+    modules = STAGE["draft_targets"].code_modules()
+    # Referenced directly by run_draft_targets, imported by mip_draft_model, and imported lazily
+    assert {"utils.mip_draft_model", "utils.weekly_projections", "utils.player_pool"} <= set(modules)
+    assert "utils.recompute_adp" in STAGE["simulated_adp"].code_modules()
+    assert "utils.clean_data" in STAGE["clean_data"].code_modules()
+
+
+def test_fingerprint_tracks_dependency_sources(monkeypatch):
+    stage = STAGE["draft_targets"]
+    before = stage.fingerprint(DEFAULT_LEAGUE)
+    assert stage.fingerprint(DEFAULT_LEAGUE) == before
+
+    unrelated = STAGE["draft_playbook"].fingerprint(DEFAULT_LEAGUE)
+
+    # Edit player_pool.py, which run_draft_targets only reaches through other modules
+    file_hash = pipeline.file_hash
+    monkeypatch.setattr(pipeline, "file_hash",
+                        lambda path: "edited" if path.name == "player_pool.py" else file_hash(path))
+    assert stage.fingerprint(DEFAULT_LEAGUE) != before
+    assert STAGE["draft_playbook"].fingerprint(DEFAULT_LEAGUE) == unrelated
+
+
+def copy_raw(league, out_dir):
+    (out_dir / "base.csv").write_text((pipeline.DATA_DIR / "raw.csv").read_text())
+
+
+def scale_base(league, out_dir):
+    (out_dir / "scaled.csv").write_text(f"{(pipeline.DATA_DIR / 'base.csv').read_text()},{league['num_teams']}")
+
+
+def test_leagues_get_their_own_outputs_and_state(tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline, "DATA_DIR", tmp_path / "data")
+    monkeypatch.setattr(pipeline, "LEAGUE_DIR", tmp_path / "leagues")
+    monkeypatch.setattr(pipeline, "STATE_PATH", tmp_path / "pipeline_state.json")
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "raw.csv").write_text("raw")
+    stages = [pipeline.Stage("base", copy_raw, inputs=["raw.csv"], outputs=["base.csv"]),
+              pipeline.Stage("scaled", scale_base, inputs=["base.csv"], outputs=["scaled.csv"], params=["num_teams"])]
+
+    default = pipeline.Pipeline(stages)
+    assert default.out_dir == tmp_path / "data" and default.state_path == tmp_path / "pipeline_state.json"
+    default.run(["scaled"], max_workers=1)
+    assert (tmp_path / "data" / "scaled.csv").read_text() == "raw,12"
+
+    league = pipeline.Pipeline(stages, league={"num_teams": 10})
+    assert league.out_dir == tmp_path / "leagues" / pipeline.league_key({"num_teams": 10}, stages)
+    # The shared stage already ran for the default league; its state lives in the global file
+    assert league.status(["scaled"]) == {"base": "current", "scaled": "stale"}
+    assert league.run(["scaled"], max_workers=1)["base"] == "skipped"
+    assert (league.out_dir / "scaled.csv").read_text() == "raw,10"
+    assert set(json.loads((league.out_dir / "pipeline_state.json").read_text())) == {"scaled"}
+    assert set(json.loads((tmp_path / "pipeline_state.json").read_text())) == {"base", "scaled"}
+
+    # The default league's outputs and state are untouched
+    assert (tmp_path / "data" / "scaled.csv").read_text() == "raw,12"
+    assert set(default.status(["scaled"]).values()) == set(league.status(["scaled"]).values()) == {"current"}
+
+
+def test_league_dir_ignores_settings_no_stage_declares():
+    assert pipeline.league_dir({"max_workers": 3}) == pipeline.DATA_DIR
+    assert pipeline.league_key({"seed": 1}) != pipeline.league_key({})
+    assert pipeline.league_key({"seed": 1, "max_workers": 3}) == pipeline.league_key({"seed": 1})
+    # Only num_teams is declared by these stages, so seed does not move their outputs
+    stages = [pipeline.Stage("scaled", scale_base, inputs=["base.csv"], outputs=["scaled.csv"], params=["num_teams"])]
+    assert pipeline.league_dir({"seed": 1}, stages) == pipeline.DATA_DIR
+    assert "availability" in STAGE["draft_targets"].params
+
+
+def test_playbook_covers_every_pick_of_the_league(tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline, "load_table", lambda *args, **kwargs: make_player_pool(400, seed=0))
+    for num_teams, rounds, draft_type in [(16, 18, "snake"), (14, 15, "third_round_reversal"), (10, 12, "linear")]:
+        league = {**DEFAULT_LEAGUE, "num_teams": num_teams, "rounds": rounds, "draft_type": draft_type}
+        assert pipeline.playbook_size(league) == (num_teams * rounds, 2 * num_teams)
+        pipeline.run_vor_playbook(league, tmp_path)
+        vor_df = pd.read_csv(tmp_path / "vor_playbook.csv")
+        player_picks = picks_by_team(generate_pick_order(num_teams, rounds, draft_type))
+        plans = recommend_draft_plan(PlaybookTable(vor_df), player_picks, league["position_limits"], rounds=rounds,
+                                     fallback_gap=num_teams)
+        assert all(pos != "NA" for plan in plans.values() for _, pos in plan)
+    # Explicit settings still win
+    assert pipeline.playbook_size({**DEFAULT_LEAGUE, "max_pick": 100, "max_gap": 30}) == (100, 30)
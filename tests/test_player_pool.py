@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils.availability_model import adp_std_estimate
+from utils.data_access import DATA_DIR, load_table
+from utils.player_pool import PlayerPool
+from utils.target_resolver import drafted_player
+
+
+@pytest.mark.parametrize("file_name, name_col, position_col", [
+    ("2025_cleaned_data.csv", "Name", "Position"),
+    ("2024_retrospective_data.csv", "name", "position"),
+    ("2024_adp.csv", "Name", "Position"),
+])
+def test_from_frame_keeps_every_value(file_name, name_col, position_col):
+    df = pd.read_csv(DATA_DIR / file_name)
+    pool = PlayerPool.from_frame(df)
+    assert len(pool) == len(df)
+    assert pool.names.tolist() == df[name_col].where(df[name_col].notna(), None).tolist()
+    assert pool.positions.tolist() == df[position_col].where(df[position_col].notna(), None).tolist()
+    assert pool.position_order() == list(df[position_col].dropna().unique())
+    for col, values in [("ADP", pool.adp), ("proj_points", pool.proj)]:
+        expected = df[col].to_numpy(dtype=np.float64) if col in df else np.full(len(df), np.nan)
+        np.testing.assert_array_equal(values, expected)
+    if "ADP" in df:
+        np.testing.assert_array_equal(pool.adp_std, adp_std_estimate(df))
+
+    frame = pool.to_frame()
+    assert frame["name"].astype(object).where(frame["name"].notna(), None).tolist() == pool.names.tolist()
+    assert frame["position"].astype(object).where(frame["position"].notna(), None).tolist() == \
+           pool.positions.tolist()
+    assert PlayerPool.from_frame(frame).names.tolist() == pool.names.tolist()
+
+
+def test_storage_is_compact_and_shared():
+    df = load_table("2025_cleaned_data.csv").reset_index(drop=True)
+    df["ADP"] = df["ADP"].astype(np.float64)
+    pool = PlayerPool.from_frame(df)
+    assert not hasattr(pool, "__dict__")
+    assert (pool.name_codes.dtype, pool.position_codes.dtype, pool.team_codes.dtype) == (np.int32, np.int8, np.int8)
+    assert pool.adp.dtype == pool.proj.dtype == pool.adp_std.dtype == np.float64
+    # float64 and categorical columns are used as they are
+    assert np.shares_memory(pool.adp, df["ADP"].to_numpy())
+    assert np.shares_memory(pool.position_codes, df["position"].array.codes)
+    assert np.shares_memory(pool.to_frame()["ADP"].to_numpy(), pool.adp)
+
+    rows = np.array([5, 0, 17])
+    subset = pool.take(rows)
+    assert subset.name_table is pool.name_table and subset.position_table is pool.position_table
+    assert subset.names.tolist() == df["name"].iloc[rows].tolist()
+    drafted = np.zeros(len(pool), dtype=bool)
+    drafted[::3] = True
+    assert pool.available(drafted).names.tolist() == df["name"][~drafted].tolist()
+    moved = pool.with_adp(np.arange(len(pool)))
+    assert moved.proj is pool.proj and moved.adp_std is pool.adp_std and moved.adp[4] == 4.0
+
+
+def test_rows_and_lookups_match_pandas_masks():
+    df = pd.read_csv(DATA_DIR / "2025_cleaned_data.csv")
+    pool = PlayerPool.from_frame(df)
+    available = np.random.default_rng(0).random(len(df)) < 0.6
+    for position in ["QB", "RB", "K", None]:
+        expected = (df["Position"] == position) if position is not None else pd.Series(True, index=df.index)
+        assert pool.rows(position, available).tolist() == np.flatnonzero(expected & available).tolist()
+    assert pool.position_code("K") == -1 and pool.name(3) == df["Name"].iloc[3]
+
+    # Consumers give the same answer from the frame and from the pool
+    for position, player, round in [("WR", 1, 1), ("RB", 7, 3), ("TE", 12, 6), ("QB", 4, 8)]:
+        assert drafted_player(pool, position, player, round) == drafted_player(df, position, player, round)
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+from utils.data_access import DATA_DIR
+from utils.player_registry import (SIGNATURE_WORDS, PlayerRegistry, _popcount, name_signature, name_similarity,
+                                   normalize_name)
+
+
+def test_popcount_counts_every_bit():
+    rng = np.random.default_rng(0)
+    signatures = rng.integers(0, 2 ** 63, (50, SIGNATURE_WORDS), dtype=np.uint64) << np.uint64(1)
+    expected = [sum(bin(int(word)).count("1") for word in row) for row in signatures]
+    assert _popcount(signatures).tolist() == expected
+    assert _popcount(np.full((1, SIGNATURE_WORDS), np.iinfo(np.uint64).max, dtype=np.uint64)).tolist() == [512]
+
+
+def test_name_similarity_is_trigram_jaccard():
+    names = ["aaron jones", "aaron jones", "cameron ward"]
+    others = ["aaron jones", "aaron jonas", "cam ward"]
+    score = name_similarity(np.stack([name_signature(n) for n in names]), np.stack([name_signature(n) for n in others]))
+    assert score[0] == 1.0 and 0.5 < score[1] < 1.0 and score[2] < 0.5
+    assert name_similarity(np.zeros((1, SIGNATURE_WORDS), np.uint64), np.zeros((1, SIGNATURE_WORDS), np.uint64)) == 0
+
+
+def test_registry_joins_players_the_raw_names_miss():
+    # The baseline merged on raw names; these three only join through the registry (257 -> 260 rows)
+    assert normalize_name("Hollywood Brown") == normalize_name("Marquise Brown") == "marquise brown"
+    assert normalize_name("Aaron Jones Sr.") == "aaron jones" and normalize_name("D. J. Moore") == "dj moore"
+
+    projections = pd.read_csv(DATA_DIR / "espn_2025_projections.csv")
+    adp = pd.read_csv(DATA_DIR / "FantasyFootball_2025_PPR_ADP_Rankings.csv")
+    registry = PlayerRegistry()
+    projections["player_id"] = registry.resolve(projections, "espn", "name", "position", "team")
+    adp["player_id"] = registry.resolve(adp, "adp", "Name", "Position", "Team")
+    joined = projections.merge(adp, on="player_id")
+
+    assert joined["player_id"].is_unique
+    pairs = set(zip(joined["name"], joined["Name"]))
+    assert {("Hollywood Brown", "Marquise Brown"), ("Aaron Jones Sr.", "Aaron Jones"),
+            ("Cameron Ward", "Cam Ward")} <= pairs
+    assert len(joined) - len(projections.merge(adp, left_on="name", right_on="Name")) >= 3
@@ -0,0 +1,129 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import pytest
+from utils.projection_fetcher import (EspnProjectionsSource, FetchError, Fetcher, FfcAdpSource, ResponseCache,
+                                      fetch_sources)
+
+SEASON = 2025
+
+
+def espn_player(name, position_id, team_id, points):
+    stats = [{"statSourceId": 1, "statSplitTypeId": 0, "seasonId": SEASON, "appliedTotal": points},
+             {"statSourceId": 0, "statSplitTypeId": 0, "seasonId": SEASON - 1, "appliedTotal": 999.0}]
+    return {"player": {"fullName": name, "defaultPositionId": position_id, "proTeamId": team_id, "stats": stats}}
+
+
+# Canned API responses, sorted by projected points as the real endpoints are
+ESPN_PLAYERS = [
+    espn_player("Ja'Marr Chase", 3, 4, 353.04),
+    espn_player("Bijan Robinson", 2, 1, 334.8),
+    espn_player("Mike Williams", 3, 20, 150.0),
+    espn_player("Texans D/ST", 16, 34, 133.0),
+    espn_player("Mike Williams", 3, 23, 120.0),  # a different player of the same name
+    espn_player("Brandon Aubrey", 5, 6, 150.2),
+    espn_player("Practice Squad", 2, 0, 0.0),
+]
+FFC_PLAYERS = [
+    {"name": "Ja'Marr Chase", "position": "WR", "team": "CIN", "adp": 1.6, "stdev": 0.8, "high": 1, "low": 4,
+     "times_drafted": 557, "bye": 10},
+    {"name": "Houston Defense", "position": "DEF", "team": "HOU", "adp": 120.5, "stdev": 9.1, "high": 99,
+     "low": 140, "times_drafted": 200, "bye": 6},
+    {"name": "Bijan Robinson", "position": "RB", "team": "ATL", "adp": 1.2, "stdev": 0.5, "high": 1, "low": 3,
+     "times_drafted": 560, "bye": 5},
+]
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serves the canned ESPN pages (by the X-Fantasy-Filter offset and limit) and the FFC ADP list."""
+
+    def do_GET(self):
+        server = self.server
+        server.hits.append((self.path, self.headers.get("X-Fantasy-Filter")))
+        if server.fail_next:
+            server.fail_next -= 1
+            self.send_response(503)
+            self.end_headers()
+            return
+        path = urlsplit(self.path).path
+        if path.startswith("/espn/"):
+            page = json.loads(self.headers["X-Fantasy-Filter"])["players"]
+            body = {"players": ESPN_PLAYERS[page["offset"]:page["offset"] + page["limit"]]}
+        elif path.startswith("/ffc/"):
+            body = {"status": "Success", "players": FFC_PLAYERS}
+        else:
+            self.send_response(404)
+            self.end_headers()
+            return
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    server.hits, server.fail_next = [], 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def sources(server):
+    root = f"http://127.0.0.1:{server.server_address[1]}"
+    return [EspnProjectionsSource(season=SEASON, max_players=len(ESPN_PLAYERS), page_size=3, base_url=f"{root}/espn"),
+            FfcAdpSource(season=SEASON, base_url=f"{root}/ffc")]
+
+
+def test_sources_parse_through_the_fetcher(server, tmp_path):
+    server.fail_next = 1  # the first request gets a 503 and is retried
+    fetcher = Fetcher(max_concurrency=2, backoff=0.01, cache=ResponseCache(tmp_path))
+    tables = fetch_sources(sources(server), fetcher)
+    assert fetcher.n_requests == 3 + 1 + 1
+    assert len(list(tmp_path.glob("*.body"))) == 4 and not list(tmp_path.glob("*.tmp"))
+
+    espn = tables["espn_projections"]
+    assert espn.columns.tolist() == ["name", "position", "team", "proj_points"]
+    # Registry spellings, as every other normalized table; defenses are named by team
+    assert espn["name"].tolist() == ["Ja'Marr Chase", "Bijan Robinson", "Mike Williams", "HOU", "Mike Williams",
+                                     "Brandon Aubrey"]
+    assert espn["position"].tolist() == ["WR", "RB", "WR", "DEF", "WR", "PK"]
+    assert espn["team"].tolist() == ["CIN", "ATL", "NYJ", "HOU", "PIT", "DAL"]
+    assert espn["proj_points"].tolist() == [353.0, 334.8, 150.0, 133.0, 120.0, 150.2]
+
+    adp = tables["ffc_adp"]
+    assert adp["name"].tolist() == ["Bijan Robinson", "Ja'Marr Chase", "Houston"]
+    assert adp["ADP"].tolist() == [1.2, 1.6, 120.5]
+    assert {"adp_std", "adp_high", "adp_low", "times_drafted", "bye"} <= set(adp.columns)
+
+    # Replay parses the cached bodies without touching the server
+    hits = len(server.hits)
+    replayed = fetch_sources(sources(server), Fetcher(cache=ResponseCache(tmp_path), mode="replay"))
+    assert len(server.hits) == hits
+    assert replayed["espn_projections"].equals(espn) and replayed["ffc_adp"].equals(adp)
+
+
+def test_fetch_gives_up_after_retries(server, tmp_path):
+    server.fail_next = 10
+    fetcher = Fetcher(retries=2, backoff=0.01, cache=ResponseCache(tmp_path))
+    with pytest.raises(FetchError, match="HTTP 503"):
+        fetch_sources(sources(server)[1:], fetcher)
+    assert fetcher.n_requests == 3
+
+
+def test_backoff_does_not_hold_a_concurrency_slot(server, tmp_path):
+    server.fail_next = 1
+    fetcher = Fetcher(max_concurrency=1, backoff=0.5, cache=ResponseCache(tmp_path))
+    fetch_sources(sources(server)[:1], fetcher)
+    # The other pages go through while the failed one backs off, so its retry comes last
+    assert len(server.hits) == 4 and server.hits[-1] == server.hits[0]
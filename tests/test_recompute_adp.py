@@ -0,0 +1,32 @@
+import numpy as np
+from utils import recompute_adp
+from utils.recompute_adp import make_pick, player_df, run_iterative_simulation, simulate_draft
+
+
+def test_simulate_draft_reuses_its_simulator():
+    team_picks = simulate_draft(player_df, rng=0)
+    simulator = recompute_adp._simulator_cache[1]
+    assert simulate_draft(player_df, rng=0) == team_picks
+    assert recompute_adp._simulator_cache[1] is simulator
+    assert sorted(team_picks) == list(range(1, 13))
+    assert all(len(picks) == 8 for picks in team_picks.values())
+
+
+def test_make_pick_returns_a_row_of_the_pool():
+    pool = player_df.reset_index(drop=True)
+    pick = make_pick(pool, {}, next_pick=13, rng=0)
+    at_pos = pool[pool["position"] == pick["position"]]
+    assert pick["proj_points"] > at_pos["proj_points"].max() * 0.9
+    # With only QBs left to fill, a QB is taken
+    full = {"RB": 2, "WR": 2, "TE": 1, "FLEX": 1, "PK": 1}
+    assert make_pick(pool, {**full, "RB": 3}, next_pick=13, rng=0)["position"] == "QB"
+
+
+def test_run_iterative_simulation_returns_the_convergence_table_on_request():
+    result = run_iterative_simulation(player_df, max_iters=2, n_drafts=20, rng=0)
+    assert len(result) == 3
+    final_adp, _, _, convergence = run_iterative_simulation(player_df, max_iters=2, n_drafts=20, rng=0,
+                                                            return_convergence=True)
+    assert final_adp.equals(result[0])
+    assert convergence["iteration"].tolist() == [1, 2]
+    assert np.isfinite(convergence["excess_bound"]).all()
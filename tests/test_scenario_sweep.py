@@ -0,0 +1,15 @@
+import numpy as np
+from utils.scenario_sweep import SweepResult
+
+
+def test_modal_plan_is_the_most_frequent_whole_plan():
+    # The per-round modes are B, B (drafted by 2 scenarios); A, B was drafted by 3
+    rows = [[0, 1]] * 3 + [[1, 0]] * 2 + [[1, 1]] * 2
+    plans = np.array(rows, dtype=np.int8)[:, None, :]
+    result = SweepResult(plans, np.zeros((len(rows), 1)), ["A", "B"], [5])
+
+    plan = result.modal_plan()
+    assert plan["player"].tolist() == [5, 5]
+    assert plan["round"].tolist() == [1, 2]
+    assert plan["position"].tolist() == ["A", "B"]
+    assert np.allclose(plan["share"], 3 / 7)
@@ -0,0 +1,60 @@
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+import pytest
+from utils.availability_index import AvailabilityIndex
+from utils.data_access import DATA_DIR
+from utils.draft_pool_calcs import calculate_expected_vor
+from utils.synthetic_pool import make_player_pool
+from utils.vor_playbook import build_vor_playbook, compute_vor_grid
+
+
+def reference_expected_vor(df, pick_number, picks_until_next, offsets=(0, -6, 6)):
+    """The original pandas calculate_expected_vor / compute_single_vor (offsets made a parameter)."""
+    vor_by_position = defaultdict(list)
+    for offset in offsets:
+        this_pick = pick_number + offset
+        next_pick = this_pick + picks_until_next
+        if this_pick < 1:
+            continue
+        draftable_players = df[df['ADP'] >= this_pick].sort_values('ADP')
+        replacement_pool = df[df['ADP'] >= next_pick].sort_values('ADP')
+        for pos in df['position'].unique():
+            expected_proj = draftable_players[draftable_players['position'] == pos]['proj_points'].max()
+            replacement_proj = replacement_pool[replacement_pool['position'] == pos]['proj_points'].max()
+            if pd.isna(expected_proj):
+                expected_proj = 0
+            if pd.isna(replacement_proj):
+                replacement_proj = 0
+            vor_by_position[pos].append(expected_proj - replacement_proj)
+    return {pos: sum(vor_list) / len(vor_list) for pos, vor_list in vor_by_position.items()}
+
+
+def test_playbook_matches_the_reference_exactly():
+    data_df = pd.read_csv(DATA_DIR / "2025_cleaned_data.csv").rename(columns={"Position": "position"})
+    playbook = build_vor_playbook(data_df).set_index(["pick_number", "picks_until_next"])
+    index = AvailabilityIndex(data_df)
+    assert len(playbook) == 100 * 24
+
+    rng = np.random.default_rng(0)
+    for pick_number, gap in zip(rng.integers(1, 101, 40), rng.integers(1, 25, 40)):
+        expected = reference_expected_vor(data_df, pick_number, gap)
+        row = playbook.loc[(pick_number, gap)]
+        # Same float operations in the same order, so equal to the last bit
+        assert {pos: row[f"{pos.lower()}_vor"] for pos in ["RB", "WR", "QB", "TE", "PK"]} == \
+               {pos: expected[pos] for pos in ["RB", "WR", "QB", "TE", "PK"]}
+        assert calculate_expected_vor(data_df, pick_number, gap, index=index) == expected
+
+
+@pytest.mark.parametrize("offsets", [(0, -6, 6), (0,), (-10, -3, 0, 3, 10)])
+def test_larger_grids_match_the_reference(offsets):
+    df = make_player_pool(400, seed=1)
+    df.loc[df.sample(frac=0.05, random_state=1).index, "proj_points"] = np.nan
+    picks, gaps = np.arange(1, 301), np.arange(1, 41)
+    positions, grid = compute_vor_grid(df, picks, gaps, offsets)
+
+    rng = np.random.default_rng(1)
+    for i, j in zip(rng.integers(0, len(picks), 30), rng.integers(0, len(gaps), 30)):
+        expected = reference_expected_vor(df, picks[i], gaps[j], offsets)
+        assert grid[i, j].tolist() == [expected[pos] for pos in positions]
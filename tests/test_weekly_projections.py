@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from utils.availability_index import AvailabilityIndex
+from utils.data_access import load_table
+from utils.draft_pool_calcs import compute_proj_by_position
+from utils.draft_schedule import generate_pick_order, picks_by_team
+from utils.mip_draft_model import DraftOptimizer
+from utils.pipeline import DEFAULT_LEAGUE, PLAYER_DATA
+from utils.weekly_projections import LineupScorer, WeeklyProjections, expected_rows
+
+
+@pytest.fixture(scope="module")
+def setup(tmp_path_factory):
+    player_df = load_table(PLAYER_DATA, dtype=np.float64)
+    store = WeeklyProjections.build(player_df, tmp_path_factory.mktemp("weekly") / "weekly.npy")
+    scorer = LineupScorer(store, DEFAULT_LEAGUE["position_constraints"], DEFAULT_LEAGUE["flex_limit"])
+    return player_df, AvailabilityIndex(player_df), scorer
+
+
+@pytest.mark.parametrize("slot", [1, 6, 12])
+def test_lineup_plan_never_repeats_a_player(setup, slot):
+    player_df, index, scorer = setup
+    league = DEFAULT_LEAGUE
+    positions = league["positions"]
+    rounds = league["flex_limit"] + sum(con["limit"] for con in league["position_constraints"])
+    picks = picks_by_team(generate_pick_order(league["num_teams"], rounds, league["draft_type"]))[slot]
+
+    optimizer = DraftOptimizer(picks, {p: 0 for p in positions}, league["position_constraints"], positions,
+                               compute_proj_by_position(player_df, picks, positions, index=index),
+                               league["flex_limit"], scorer=scorer, player_rows=expected_rows(index, picks, positions))
+    optimizer.solve(solver_name="lineup")
+
+    rows = optimizer.solution_rows
+    assert len(rows) == len(picks)
+    assert (rows >= 0).all()
+    assert len(np.unique(rows)) == len(rows)
+    # Each planned player is expected to be there at his pick and plays the planned position
+    for pick, position, row in zip(picks, optimizer.solution, rows):
+        assert player_df["ADP"].iloc[row] >= pick
+        assert scorer.store.positions[row] == position
+    assert optimizer.objective_value == pytest.approx(scorer.score(rows[None, :])[0])
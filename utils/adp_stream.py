@@ -0,0 +1,250 @@
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from utils.data_access import COLUMN_ALIASES
+
+# Pick log column spellings -> names used here; anything else in the log is ignored
+PICK_LOG_ALIASES = {**COLUMN_ALIASES, "Pick": "pick", "Overall": "pick", "overall": "pick",
+                    "Draft": "draft_id", "Timestamp": "timestamp", "Date": "timestamp", "date": "timestamp"}
+PICK_LOG_COLUMNS = ["name", "position", "team", "pick", "timestamp", "bye"]
+
+# Output columns, as 2024_adp.csv
+ADP_COLUMNS = ["ADP", "Overall", "Name", "Position", "Team", "Times Drafted", "Std. Dev", "High", "Low", "Bye"]
+
+# Decay weights are 2 ** (age in half-lives); the state is rescaled before they get this large
+MAX_WEIGHT_EXPONENT = 64
+
+
+class StreamingAdp:
+    def __init__(self, half_life=None, num_teams=12):
+        """
+        Per-player ADP statistics updated chunk by chunk from mock-draft pick logs.
+
+        The state is a handful of arrays over the players seen so far (weight, mean, weighted sum of
+        squared deviations, count, earliest / latest pick), so memory depends on the number of
+        players, not on the number of picks. Each chunk is reduced per player with bincounts and
+        merged into the state with the weighted parallel-variance (Chan / Welford) update.
+
+        Parameters:
+        - half_life: float -> with a timestamp column, a pick's weight halves every `half_life` days
+          before the newest pick seen (None weighs every pick equally)
+        - num_teams: int -> league size used for the round.pick ADP column
+        """
+        self.half_life = half_life
+        self.num_teams = num_teams
+        self.keys = {}  # (name, position) -> row
+        self.names = []
+        self.positions = []
+        self.team = []
+        self.bye = []
+        self._capacity = 0
+        self.weight = np.zeros(0)
+        self.weight_sq = np.zeros(0)
+        self.mean = np.zeros(0)
+        self.m2 = np.zeros(0)
+        self.count = np.zeros(0, dtype=np.int64)
+        self.high = np.zeros(0, dtype=np.int64)
+        self.low = np.zeros(0, dtype=np.int64)
+        self.n_picks = 0
+        # Decay weights are relative to this time (days); moved forward as newer picks arrive
+        self._origin = None
+
+    def _grow(self, n):
+        if n <= self._capacity:
+            return
+        capacity = max(n, 2 * self._capacity, 256)
+        for attr, fill in [("weight", 0.0), ("weight_sq", 0.0), ("mean", 0.0), ("m2", 0.0), ("count", 0),
+                           ("high", np.iinfo(np.int64).max), ("low", 0)]:
+            old = getattr(self, attr)
+            new = np.full(capacity, fill, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, attr, new)
+        self._capacity = capacity
+
+    def _rows(self, names, positions):
+        """Global row per pick, registering players seen for the first time."""
+        # Factorizing the two columns and then their combined integer code is much faster than a MultiIndex
+        name_codes, name_uniques = pd.factorize(names)
+        pos_codes, pos_uniques = pd.factorize(positions)
+        local, pairs = pd.factorize(name_codes * len(pos_uniques) + pos_codes)
+        rows = np.empty(len(pairs), dtype=np.int64)
+        for i, pair in enumerate(pairs):
+            key = (name_uniques[pair // len(pos_uniques)], pos_uniques[pair % len(pos_uniques)])
+            row = self.keys.get(key)
+            if row is None:
+                row = self.keys[key] = len(self.names)
+                self.names.append(key[0])
+                self.positions.append(key[1])
+                self.team.append(None)
+                self.bye.append(None)
+            rows[i] = row
+        self._grow(len(self.names))
+        return rows, local
+
+    def _weights(self, timestamps):
+        if self.half_life is None or timestamps is None:
+            return None
+        days = pd.to_datetime(timestamps).to_numpy(dtype="datetime64[s]").astype(np.int64) / 86400.0
+        if self._origin is None:
+            self._origin = days.min()
+        exponent = (days - self._origin) / self.half_life
+        if exponent.max() > MAX_WEIGHT_EXPONENT:
+            # Scaling every weight by the same factor leaves means unchanged and scales m2 with it
+            shift = exponent.max()
+            scale = 2.0 ** -shift
+            n = len(self.names)
+            self.weight[:n] *= scale
+            self.weight_sq[:n] *= scale * scale
+            self.m2[:n] *= scale
+            self._origin += shift * self.half_life
+            exponent -= shift
+        return 2.0 ** exponent
+
+    def update(self, chunk: pd.DataFrame):
+        """
+        Add a chunk of picks.
+
+        Parameters:
+        - chunk: pd.DataFrame with columns name, position, pick (overall pick number) and optionally
+          team, bye and timestamp (any pd.to_datetime format; needed for half_life weighting).
+          Source spellings in PICK_LOG_ALIASES are accepted.
+        """
+        chunk = chunk.rename(columns=PICK_LOG_ALIASES)
+        chunk = chunk[chunk["pick"].notna()]
+        if chunk.empty:
+            return
+        rows, local = self._rows(chunk["name"].to_numpy(), chunk["position"].to_numpy())
+        n_local = len(rows)
+        picks = chunk["pick"].to_numpy(dtype=np.int64)
+        weights = self._weights(chunk["timestamp"] if "timestamp" in chunk else None)
+        if weights is None:
+            weights = np.ones(len(picks))
+
+        # Chunk statistics per player (two passes over the chunk, so no cancellation in the variance)
+        w_b = np.bincount(local, weights, n_local)
+        mean_b = np.bincount(local, weights * picks, n_local) / w_b
+        m2_b = np.bincount(local, weights * (picks - mean_b[local]) ** 2, n_local)
+
+        # Merge into the running state
+        w_a, mean_a = self.weight[rows], self.mean[rows]
+        total = w_a + w_b
+        delta = mean_b - mean_a
+        self.mean[rows] = mean_a + delta * w_b / total
+        self.m2[rows] += m2_b + delta ** 2 * w_a * w_b / total
+        self.weight[rows] = total
+        self.weight_sq[rows] += np.bincount(local, weights * weights, n_local)
+        self.count[rows] += np.bincount(local, minlength=n_local)
+        high = np.full(n_local, np.iinfo(np.int64).max)
+        low = np.zeros(n_local, dtype=np.int64)
+        np.minimum.at(high, local, picks)
+        np.maximum.at(low, local, picks)
+        self.high[rows] = np.minimum(self.high[rows], high)
+        self.low[rows] = np.maximum(self.low[rows], low)
+        self.n_picks += len(picks)
+
+        # Team and bye week: the last value seen for the player
+        for col, values in [("team", self.team), ("bye", self.bye)]:
+            if col in chunk:
+                last = pd.Series(chunk[col].to_numpy()).groupby(local).last()
+                for i, value in last.items():
+                    values[rows[i]] = value
+
+    def update_records(self, records, batch_size=100_000):
+        """Add picks from an iterable of dicts (e.g. parsed log lines), `batch_size` at a time."""
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) == batch_size:
+                self.update(pd.DataFrame(batch))
+                batch = []
+        if batch:
+            self.update(pd.DataFrame(batch))
+
+    def update_simulation(self, team_picks):
+        """Add one draft from DraftSimulator.simulate."""
+        picks = [pick for roster in team_picks.values() for pick in roster]
+        self.update(pd.DataFrame(picks, columns=["pick", "name", "position", "proj_points"]))
+
+    def read(self, path, chunksize=1_000_000):
+        """
+        Stream a pick log from disk: CSV, or JSON lines for .jsonl / .ndjson, `chunksize` picks at a time.
+        Only the PICK_LOG_COLUMNS (under any PICK_LOG_ALIASES spelling) are parsed.
+        """
+        path = Path(path)
+        if path.suffix in (".jsonl", ".ndjson"):
+            chunks = pd.read_json(path, lines=True, chunksize=chunksize)
+        else:
+            wanted = set(PICK_LOG_COLUMNS)
+            chunks = pd.read_csv(path, chunksize=chunksize,
+                                 usecols=lambda col: PICK_LOG_ALIASES.get(col, col) in wanted)
+        for chunk in chunks:
+            self.update(chunk)
+        return self
+
+    def to_frame(self, min_drafted=1) -> pd.DataFrame:
+        """
+        Current estimates in the 2024_adp.csv schema, sorted by ADP.
+
+        Overall is the (weighted) mean overall pick and ADP the same as round.pick for `num_teams`
+        teams; Std. Dev is the weighted sample standard deviation (0 for a single pick); High / Low
+        are the earliest / latest pick and Times Drafted the raw number of picks.
+
+        Parameters:
+        - min_drafted: int -> leave out players picked fewer times
+        """
+        n = len(self.names)
+        weight, weight_sq, mean = self.weight[:n], self.weight_sq[:n], self.mean[:n]
+        # Unbiased for frequency and reliability weights alike; equals ddof=1 with unit weights
+        effective = weight - np.divide(weight_sq, weight, out=np.zeros(n), where=weight > 0)
+        std = np.sqrt(np.divide(self.m2[:n], effective, out=np.zeros(n), where=effective > 1e-12 * weight))
+
+        overall = np.maximum(np.round(mean).astype(np.int64), 1)
+        rounds, slot = np.divmod(overall - 1, self.num_teams)
+        df = pd.DataFrame({
+            "ADP": np.round(rounds + 1 + (slot + 1) / 100, 2),
+            "Overall": np.round(mean, 1),
+            "Name": self.names,
+            "Position": self.positions,
+            "Team": self.team,
+            "Times Drafted": self.count[:n],
+            "Std. Dev": np.round(std, 1),
+            "High": self.high[:n],
+            "Low": self.low[:n],
+            "Bye": self.bye,
+        }, columns=ADP_COLUMNS)
+        df = df[df["Times Drafted"] >= min_drafted]
+        return df.sort_values("Overall", kind="stable", ignore_index=True)
+
+
+def stream_adp(paths, half_life=None, num_teams=12, chunksize=1_000_000, min_drafted=1) -> pd.DataFrame:
+    """
+    ADP table (2024_adp.csv schema) from one or more pick logs, read in chunks of `chunksize` picks.
+    See StreamingAdp for the statistics and the time-decay weighting.
+    """
+    estimator = StreamingAdp(half_life=half_life, num_teams=num_teams)
+    for path in paths:
+        estimator.read(path, chunksize=chunksize)
+    return estimator.to_frame(min_drafted=min_drafted)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m utils.adp_stream",
+                                     description="Aggregate mock-draft pick logs into an ADP table.")
+    parser.add_argument("logs", nargs="+", help="pick logs (CSV, or JSON lines for .jsonl / .ndjson)")
+    parser.add_argument("--output", required=True, help="CSV to write (2024_adp.csv schema)")
+    parser.add_argument("--half-life", type=float, help="days for a pick's weight to halve (needs a timestamp column)")
+    parser.add_argument("--teams", type=int, default=12, help="league size for the round.pick ADP column")
+    parser.add_argument("--chunksize", type=int, default=1_000_000, help="picks read at a time")
+    parser.add_argument("--min-drafted", type=int, default=1, help="leave out players picked fewer times")
+    args = parser.parse_args(argv)
+
+    df = stream_adp(args.logs, half_life=args.half_life, num_teams=args.teams, chunksize=args.chunksize,
+                    min_drafted=args.min_drafted)
+    df.to_csv(args.output, index=False)
+    print(f"{len(df)} players written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import bisect
+
+import numpy as np
+from utils.instrumentation import count, timed
+from utils.player_pool import PlayerPool, encode_labels, find_column, first_appearance
+
+
+class AvailabilityIndex:
+    @timed("AvailabilityIndex.build")
+    def __init__(self, players, position_col=None, adp_col="ADP", proj_col="proj_points"):
+        """
+        Index answering "best remaining player at position P with ADP >= k" without rescanning the pool.
+
+        Each position's players are sorted by ADP once and ranked by projection (best first, ties to
+        the player listed first in df). The running minimum of that rank from the back of the ADP
+        order gives the best player at or after every ADP position, so a query is one binary search
+        plus one array lookup. The k best at or after every ADP position are kept the same way, built
+        on the first top_available_rows query for the position. Players can be removed (drafted),
+        which only recomputes their position.
+
+        Parameters:
+        - players: PlayerPool or pd.DataFrame -> player table
+        - position_col: str -> name of the position column (DataFrame only; found by player_pool.find_column if omitted)
+        - adp_col: str -> name of the ADP column (DataFrame only)
+        - proj_col: str -> name of the projected points column (DataFrame only)
+        """
+        if isinstance(players, PlayerPool):
+            adp_all, proj_all = players.adp, players.proj
+            pos_codes, pos_table = players.position_codes, players.position_table
+        else:
+            adp_all = players[adp_col].to_numpy(dtype=float)
+            proj_all = players[proj_col].to_numpy(dtype=float)
+            pos_codes, pos_table = encode_labels(players[find_column(players, "position", position_col)], np.int8)
+
+        self.positions = first_appearance(pos_codes, pos_table)
+        self._adp = {}
+        self._rows = {}
+        self._rank = {}
+        self._ranked_proj = {}
+        self._ranked_rows = {}
+        self._suffix_rank = {}
+        self._suffix_top = {}
+        self._row_slot = {}
+
+        has_adp = ~np.isnan(adp_all)
+        for pos in self.positions:
+            # Rows without an ADP never satisfy ADP >= cutoff
+            code = np.flatnonzero(pos_table == pos)[0]
+            rows = np.flatnonzero((pos_codes == code) & has_adp)
+            rows = rows[np.argsort(adp_all[rows], kind="stable")]
+            # pandas' max() skips NaN, so a NaN projection is never the best player
+            proj = np.where(np.isnan(proj_all[rows]), -np.inf, proj_all[rows])
+
+            # Rank 0 is the best projection; ties go to the lower row, as with DataFrame.nlargest.
+            # Index n is a sentinel meaning "nobody left" (-inf points, row -1).
+            n = len(rows)
+            by_rank = np.lexsort((rows, -proj))
+            rank = np.empty(n, dtype=np.int64)
+            rank[by_rank] = np.arange(n)
+            rank[np.isneginf(proj)] = n
+
+            self._adp[pos] = adp_all[rows]
+            self._rows[pos] = rows
+            self._rank[pos] = rank
+            self._ranked_proj[pos] = np.append(proj[by_rank], -np.inf)
+            self._ranked_rows[pos] = np.append(rows[by_rank], -1)
+            self._refresh(pos)
+            for slot, row in enumerate(rows):
+                self._row_slot[row] = (pos, slot)
+
+    def _refresh(self, pos):
+        rank = self._rank[pos]
+        suffix_rank = np.full(len(rank) + 1, len(rank), dtype=np.int64)
+        if len(rank):
+            suffix_rank[:-1] = np.minimum.accumulate(rank[::-1])[::-1]
+        self._suffix_rank[pos] = suffix_rank
+        self._suffix_top.pop(pos, None)
+
+    def _top_ranks(self, pos, k):
+        """
+        (n + 1, >= k) ranks of the k best players left at or after every ADP position, best first,
+        padded with the sentinel n. Built in one pass from the back of the ADP order and cached until
+        the position changes.
+        """
+        table = self._suffix_top.get(pos)
+        if table is None or table.shape[1] < k:
+            rank = self._rank[pos]
+            n = len(rank)
+            best, suffixes = [], [[n] * k]
+            for r in rank[::-1].tolist():
+                if r < n and (len(best) < k or r < best[-1]):
+                    bisect.insort(best, r)
+                    del best[k:]
+                suffixes.append(best + [n] * (k - len(best)))
+            table = np.array(suffixes[::-1], dtype=np.int64).reshape(n + 1, k)
+            self._suffix_top[pos] = table
+        return table
+
+    def remove(self, rows):
+        """
+        Take players out of the pool (e.g. once drafted), by positional row in the source table.
+        Only the positions of the removed players are recomputed.
+        """
+        touched = set()
+        rows = np.atleast_1d(rows)
+        count("AvailabilityIndex.removed", len(rows))
+        for row in rows:
+            if row in self._row_slot:
+                pos, slot = self._row_slot[row]
+                self._rank[pos][slot] = len(self._rank[pos])
+                touched.add(pos)
+        for pos in touched:
+            self._refresh(pos)
+        return touched
+
+    def _best_rank(self, position, adp_cutoffs):
+        if position not in self._adp:
+            return None
+        return self._suffix_rank[position][np.searchsorted(self._adp[position], adp_cutoffs, side="left")]
+
+    def best_available(self, position, adp_cutoff) -> float:
+        """Best projection at `position` among players with ADP >= adp_cutoff, NaN if there are none."""
+        return float(self.best_available_batch(position, np.asarray([adp_cutoff]))[0])
+
+    def best_available_batch(self, position, adp_cutoffs) -> np.ndarray:
+        """
+        Vectorized best_available over an array of cutoffs.
+
+        Returns:
+        - np.ndarray of the same shape as adp_cutoffs, NaN where no player qualifies
+        """
+        adp_cutoffs = np.asarray(adp_cutoffs, dtype=float)
+        best_rank = self._best_rank(position, adp_cutoffs)
+        if best_rank is None:
+            return np.full(adp_cutoffs.shape, np.nan)
+        best = self._ranked_proj[position][best_rank]
+        return np.where(np.isneginf(best), np.nan, best)
+
+    def best_available_row(self, position, adp_cutoffs) -> np.ndarray:
+        """
+        Positional row (iloc) of the player behind best_available_batch, -1 where no player qualifies.
+        Ties go to the player listed first in the source table, as with DataFrame.nlargest.
+        """
+        adp_cutoffs = np.asarray(adp_cutoffs, dtype=float)
+        best_rank = self._best_rank(position, adp_cutoffs)
+        if best_rank is None:
+            return np.full(adp_cutoffs.shape, -1, dtype=np.int64)
+        return self._ranked_rows[position][best_rank]
+
+    def top_available_rows(self, position, adp_cutoffs, k) -> np.ndarray:
+        """
+        Rows of the k best players at `position` with ADP >= cutoff, for every cutoff.
+
+        One binary search and one table lookup per cutoff: O(len(adp_cutoffs) * k) per query, plus
+        O(n log k) for the position's first query after a change (_top_ranks).
+
+        Returns:
+        - np.ndarray[int] of shape (len(adp_cutoffs), k), best first, padded with -1; column 0 matches
+          best_available_row
+        """
+        adp_cutoffs = np.asarray(adp_cutoffs, dtype=float)
+        if position not in self._adp or not len(adp_cutoffs) or k <= 0:
+            return np.full((len(adp_cutoffs), max(k, 0)), -1, dtype=np.int64)
+        start = np.searchsorted(self._adp[position], adp_cutoffs, side="left")
+        return self._ranked_rows[position][self._top_ranks(position, k)[start, :k]]
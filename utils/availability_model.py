@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+from utils.player_pool import PlayerPool, encode_labels, find_column, first_appearance
+
+# Fallback ADP spread when a source has no Std Dev / High / Low: in the 2025 ADP file the
+# std dev runs at roughly 10% of ADP past the first couple of rounds
+DEFAULT_STD_FRACTION = 0.1
+MIN_ADP_STD = 0.5
+
+
+def _normal_cdf(z):
+    """Standard normal CDF via the Abramowitz & Stegun 7.1.26 erf approximation (|error| < 1.5e-7)."""
+    x = np.abs(z) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * x)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - poly * np.exp(-x * x)
+    return 0.5 * (1.0 + np.sign(z) * erf)
+
+
+def adp_std_estimate(df: pd.DataFrame, std_col="adp_std", high_col="adp_high", low_col="adp_low"):
+    """
+    Per-player ADP standard deviation.
+
+    Uses std_col where present, otherwise (Low - High) / 5 (about what the 2025 file shows for the
+    spread between best and worst pick), otherwise DEFAULT_STD_FRACTION * ADP. Floored at MIN_ADP_STD.
+    """
+    adp = df["ADP"].to_numpy(dtype=float)
+    std = np.full(len(df), np.nan)
+    if std_col in df.columns:
+        std = df[std_col].to_numpy(dtype=float)
+    if high_col in df.columns and low_col in df.columns:
+        spread = (df[low_col].to_numpy(dtype=float) - df[high_col].to_numpy(dtype=float)) / 5.0
+        std = np.where(np.isnan(std), spread, std)
+    std = np.where(np.isnan(std), DEFAULT_STD_FRACTION * adp, std)
+    return np.maximum(std, MIN_ADP_STD)
+
+
+class ProbabilisticAvailability:
+    def __init__(self, players, position_col=None, std_col="adp_std"):
+        """
+        Availability model treating each player's draft slot as Normal(ADP, ADP std dev).
+
+        P(player still available at pick k) = P(slot > k - 0.5). With players at a position sorted by
+        projection, the expected best available projection is sum_j proj_j * P(j available) *
+        prod_{better l} P(l gone), assuming players go independently (0 if everyone is gone).
+
+        Parameters:
+        - players: PlayerPool, or pd.DataFrame with columns [position_col, 'ADP', 'proj_points'] and
+          optionally std_col, 'adp_high', 'adp_low' (see adp_std_estimate)
+        - position_col: str -> name of the position column (DataFrame only; found by player_pool.find_column if omitted)
+        - std_col: str -> name of the ADP std dev column (DataFrame only)
+        """
+        if isinstance(players, PlayerPool):
+            adp_all, proj_all, std_all = players.adp, players.proj, players.adp_std
+            pos_codes, pos_table = players.position_codes, players.position_table
+        else:
+            adp_all = players["ADP"].to_numpy(dtype=float)
+            proj_all = players["proj_points"].to_numpy(dtype=float)
+            std_all = adp_std_estimate(players, std_col=std_col)
+            pos_codes, pos_table = encode_labels(players[find_column(players, "position", position_col)], np.int8)
+
+        self.positions = first_appearance(pos_codes, pos_table)
+        self._players = {}
+        complete = ~np.isnan(adp_all) & ~np.isnan(proj_all)
+        for pos in self.positions:
+            code = np.flatnonzero(pos_table == pos)[0]
+            rows = np.flatnonzero((pos_codes == code) & complete)
+            rows = rows[np.argsort(-proj_all[rows], kind="stable")]
+            self._players[pos] = (adp_all[rows], std_all[rows], proj_all[rows])
+
+    def availability(self, position, picks) -> np.ndarray:
+        """
+        P(available) for every (pick, player at position), players ordered best projection first.
+
+        Returns:
+        - np.ndarray of shape (len(picks), n_players_at_position)
+        """
+        adp, std, _ = self._players.get(position, (np.empty(0), np.empty(0), np.empty(0)))
+        picks = np.asarray(picks, dtype=float)
+        return 1.0 - _normal_cdf((picks[:, None] - 0.5 - adp[None, :]) / std[None, :])
+
+    def expected_best(self, position, picks) -> np.ndarray:
+        """Expected best available projection at `position` for every pick in `picks`."""
+        picks = np.asarray(picks, dtype=float)
+        if position not in self._players:
+            return np.zeros(len(picks))
+        proj = self._players[position][2]
+        available = self.availability(position, picks)
+        # P(every better-projected player is gone) before each player
+        all_better_gone = np.cumprod(np.hstack([np.ones((len(picks), 1)), 1.0 - available[:, :-1]]), axis=1)
+        return (available * all_better_gone) @ proj
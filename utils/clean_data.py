@@ -1,5 +1,6 @@
 from paths import PROJECT_ROOT
 import pandas as pd
+from utils.player_registry import PlayerRegistry, normalize_position
 
 adp_filename = "FantasyFootball_2025_PPR_ADP_Rankings.csv"
 projections_filename = "espn_2025_projections.csv"
@@ -12,18 +13,33 @@ projections_df = pd.read_csv(projections_filepath)
 
 # Fix Defense Naming
 adp_df.loc[adp_df['Position'].str.upper() == 'DEF', 'Name'] = adp_df['Team'].str.upper()
-projections_df.loc[projections_df['position'] == 'D/ST', 'name'] = projections_df['team'].str.upper()
+# (the committed CSV spells defenses "D/ST", utils.projection_fetcher writes "DEF")
+projections_df.loc[normalize_position(projections_df['position']) == 'DEF', 'name'] = projections_df['team'].str.upper()
 
-data_df = projections_df.merge(adp_df, how="inner", left_on="name", right_on="Name")
+# Join on registry IDs rather than raw names (suffixes, punctuation, team casing differ between sources)
+registry = PlayerRegistry.load()
+projections_df["player_id"] = registry.resolve(projections_df, "espn_2025_projections",
+                                               name_col="name", position_col="position", team_col="team")
+adp_df["player_id"] = registry.resolve(adp_df, "ffc_2025_adp", name_col="Name", position_col="Position", team_col="Team")
+registry.save()
+
+data_df = projections_df.merge(adp_df, how="inner", on="player_id")
 column_names = [
+    "player_id",
     "Name",
     "Position",
     "Team",
     "Overall",
-    "proj_points"
+    "proj_points",
+    "Std Dev",
+    "High",
+    "Low",
+    "Bye"
 ]
 data_df = data_df[column_names]
-data_df.rename(columns={"Overall": "ADP"}, inplace=True)
+# ADP spread is kept for utils.availability_model, bye weeks for utils.weekly_projections
+data_df.rename(columns={"Overall": "ADP", "Std Dev": "adp_std", "High": "adp_high", "Low": "adp_low", "Bye": "bye"},
+               inplace=True)
 
 # Output
 data_df.to_csv(PROJECT_ROOT / "assets" / "data" / "2025_cleaned_data.csv", index=False)
\ No newline at end of file
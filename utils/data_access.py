@@ -0,0 +1,167 @@
+import hashlib
+import os
+import re
+
+import numpy as np
+import pandas as pd
+from paths import PROJECT_ROOT
+from utils.instrumentation import count, timed
+
+DATA_DIR = PROJECT_ROOT / "assets" / "data"
+CACHE_DIR = PROJECT_ROOT / "assets" / "cache"
+
+# Bump when normalization changes so stale caches are not picked up
+SCHEMA_VERSION = 1
+
+# Source spellings -> normalized column names
+COLUMN_ALIASES = {
+    "Name": "name",
+    "Player": "name",
+    "Position": "position",
+    "Team": "team",
+    "Std Dev": "adp_std",
+    "Std. Dev": "adp_std",
+    "High": "adp_high",
+    "Low": "adp_low",
+    "Times Drafted": "times_drafted",
+    "Bye": "bye",
+}
+CATEGORICAL_COLUMNS = ["position", "team"]
+
+# In-process copies, keyed by (path, content hash, dtype), so each source is parsed once per run
+_loaded = {}
+
+
+def file_hash(path) -> str:
+    """sha256 of the file contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def normalize_table(df: pd.DataFrame, dtype=np.float32) -> pd.DataFrame:
+    """
+    Normalize a raw source table to the shared schema.
+
+    Columns are renamed with COLUMN_ALIASES (name, position, team, ADP, proj_points, adp_std, ...),
+    duplicated source columns (read by pandas as 'team.1') are dropped, position and team become
+    categoricals and float columns are cast to `dtype`. Integer and text columns are kept as they are.
+
+    Parameters:
+    - df: pd.DataFrame -> table as read from CSV
+    - dtype: numpy float dtype for numeric columns (float32 halves memory; use float64 when output
+      must match values computed from the raw CSV exactly)
+
+    Returns:
+    - pd.DataFrame
+    """
+    df = df.rename(columns=COLUMN_ALIASES)
+    mangled = [(col, re.fullmatch(r"(.+)\.\d+", col)) for col in df.columns]
+    df = df.drop(columns=[col for col, match in mangled if match and match.group(1) in df.columns])
+    df = df.loc[:, ~df.columns.duplicated()]
+
+    columns = {}
+    for col in df.columns:
+        values = df[col]
+        if col in CATEGORICAL_COLUMNS:
+            values = values.astype("category")
+        elif pd.api.types.is_float_dtype(values):
+            values = values.astype(dtype)
+        columns[col] = values
+    return pd.DataFrame(columns)
+
+
+def _to_arrays(df: pd.DataFrame) -> dict:
+    arrays = {"__columns__": np.asarray(df.columns, dtype=str), "__kinds__": []}
+    for i, col in enumerate(df.columns):
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            arrays[f"{i}_codes"] = values.cat.codes.to_numpy()
+            arrays[f"{i}_categories"] = np.asarray(values.cat.categories, dtype=str)
+            arrays["__kinds__"].append("category")
+        elif pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+            arrays[f"{i}_values"] = values.to_numpy()
+            arrays["__kinds__"].append("numeric")
+        else:
+            # Dictionary-encoded: names repeat across seasons and sources, and fixed-width unicode
+            # arrays of every row would dwarf the data
+            codes, uniques = pd.factorize(values)
+            arrays[f"{i}_codes"] = codes
+            arrays[f"{i}_uniques"] = np.asarray(uniques, dtype=str)
+            arrays["__kinds__"].append("text")
+    arrays["__kinds__"] = np.asarray(arrays["__kinds__"], dtype=str)
+    return arrays
+
+
+def _from_arrays(arrays) -> pd.DataFrame:
+    columns = {}
+    for i, (col, kind) in enumerate(zip(arrays["__columns__"], arrays["__kinds__"])):
+        if kind == "category":
+            columns[str(col)] = pd.Categorical.from_codes(arrays[f"{i}_codes"], arrays[f"{i}_categories"].tolist())
+        elif kind == "numeric":
+            columns[str(col)] = arrays[f"{i}_values"]
+        else:
+            # Object values (missing as NaN, code -1): the DataFrame infers the same string dtype
+            # read_csv gives the column on the installed pandas
+            uniques = np.append(arrays[f"{i}_uniques"].astype(object), np.nan)
+            columns[str(col)] = uniques[arrays[f"{i}_codes"]]
+    return pd.DataFrame(columns)
+
+
+@timed("load_table")
+def load_table(filename, dtype=np.float32, data_dir=None, cache_dir=None, use_cache=True) -> pd.DataFrame:
+    """
+    Load a CSV from assets/data normalized to the shared schema (see normalize_table).
+
+    The normalized table is stored as an uncompressed .npz in `cache_dir`, named after the source
+    file, its sha256 and the dtype, so the CSV is only parsed again when its contents change.
+    Within a process each source is read from disk once; callers get a copy.
+
+    Parameters:
+    - filename: str -> file name under data_dir (or a path)
+    - dtype: numpy float dtype for numeric columns
+    - data_dir: Path -> defaults to assets/data
+    - cache_dir: Path -> defaults to assets/cache
+    - use_cache: bool -> False always parses the CSV and leaves the cache alone
+
+    Returns:
+    - pd.DataFrame
+    """
+    path = (data_dir or DATA_DIR) / filename
+    dtype = np.dtype(dtype)
+    if not use_cache:
+        return normalize_table(pd.read_csv(path), dtype)
+
+    content_hash = file_hash(path)
+    key = (str(path.resolve()), content_hash, dtype.name)
+    if key not in _loaded:
+        cache_dir = cache_dir or CACHE_DIR
+        cache_path = cache_dir / f"{path.stem}-{content_hash[:16]}-{dtype.name}-v{SCHEMA_VERSION}.npz"
+        if cache_path.exists():
+            count("load_table.npz_hit")
+            with np.load(cache_path) as arrays:
+                df = _from_arrays(arrays)
+        else:
+            count("load_table.csv_parse")
+            df = normalize_table(pd.read_csv(path), dtype)
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            # Older caches of the same source are dead once its contents change
+            for stale in cache_dir.glob(f"{path.stem}-*-{dtype.name}-v*.npz"):
+                if stale != cache_path:
+                    stale.unlink(missing_ok=True)
+            # Write-then-rename, so processes loading the same source never see a partial file
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "wb") as f:
+                np.savez(f, **_to_arrays(df))
+            tmp_path.replace(cache_path)
+        _loaded[key] = df
+    return _loaded[key].copy(deep=False)
+
+
+def clear_cache(cache_dir=None):
+    """Drop the in-process tables and every cache file."""
+    _loaded.clear()
+    for cached in (cache_dir or CACHE_DIR).glob("*.npz"):
+        cached.unlink(missing_ok=True)
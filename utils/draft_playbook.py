@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+# Position -> VOR column in assets/data/vor_playbook.csv, in the order positions are compared
+PLAYBOOK_COLUMNS = {
+    "QB": "qb_vor",
+    "RB": "rb_vor",
+    "WR": "wr_vor",
+    "TE": "te_vor",
+    "PK": "pk_vor",
+}
+
+
+class PlaybookTable:
+    def __init__(self, vor_df: pd.DataFrame, columns=None):
+        """
+        Dense (pick_number, picks_until_next, position) array over a VOR playbook for O(1) lookups.
+
+        Parameters:
+        - vor_df: pd.DataFrame with pick_number, picks_until_next and one VOR column per position
+        - columns: Dict[str, str] -> position to VOR column (defaults to PLAYBOOK_COLUMNS);
+          a column missing from vor_df reads as 0, as row.get(column, 0) did
+        """
+        columns = columns or PLAYBOOK_COLUMNS
+        self.positions = list(columns)
+        picks = vor_df["pick_number"].to_numpy(dtype=np.int64)
+        gaps = vor_df["picks_until_next"].to_numpy(dtype=np.int64)
+
+        self.values = np.zeros((picks.max() + 1, gaps.max() + 1, len(self.positions)))
+        self.present = np.zeros(self.values.shape[:2], dtype=bool)
+        for k, pos in enumerate(self.positions):
+            if columns[pos] in vor_df.columns:
+                self.values[picks, gaps, k] = vor_df[columns[pos]].to_numpy(dtype=float)
+        self.present[picks, gaps] = True
+
+    def lookup(self, pick_number, picks_until_next):
+        """
+        VOR per position (in self.positions order) for one cell, or None if the playbook has no such row.
+        """
+        if not (0 <= pick_number < self.present.shape[0] and 0 <= picks_until_next < self.present.shape[1]):
+            return None
+        if not self.present[pick_number, picks_until_next]:
+            return None
+        return self.values[pick_number, picks_until_next]
+
+
+def recommend_draft_plan(playbook, player_picks, position_limits, rounds=None, fallback_gap=12):
+    """
+    Best position to target at each pick of every team, respecting roster limits.
+
+    Parameters:
+    - playbook: PlaybookTable (or a vor_playbook DataFrame, converted here)
+    - player_picks: Dict[int, List[int]] -> team to its overall picks (see draft_schedule.picks_by_team)
+    - position_limits: Dict[str, int] -> starter slots per position, including "FLEX" (RB/WR)
+    - rounds: int -> only plan the first `rounds` picks of each team (all of them if None)
+    - fallback_gap: int -> picks_until_next used for a team's last pick (usually the number of teams)
+
+    Returns:
+    - Dict[int, List[Tuple[int, str]]] -> team to (pick, position) per round; "NA" where the playbook has no row
+    """
+    if isinstance(playbook, pd.DataFrame):
+        playbook = PlaybookTable(playbook)
+
+    plans = {}
+    for player_id, picks in player_picks.items():
+        picks = picks[:rounds] if rounds is not None else picks
+        roster = {pos: 0 for pos in position_limits}
+        plan = []
+
+        for i, pick in enumerate(picks):
+            picks_until_next = picks[i + 1] - pick if i + 1 < len(picks) else fallback_gap
+            row = playbook.lookup(pick, picks_until_next)
+
+            if row is None:
+                plan.append((pick, "NA"))
+                continue
+
+            position_vors = dict(zip(playbook.positions, row.tolist()))
+
+            # Zero out VORs of filled positions (including FLEX logic)
+            for pos in position_vors:
+                if roster.get(pos, 0) < position_limits.get(pos, 0):
+                    continue
+                if pos in ["RB", "WR"] and roster["FLEX"] < position_limits["FLEX"]:
+                    continue
+                position_vors[pos] = -float("inf")
+
+            # Choose best available position
+            best_pos = max(position_vors, key=position_vors.get)
+            plan.append((pick, best_pos))
+
+            # Update roster
+            if best_pos in ["RB", "WR"]:
+                if roster[best_pos] < position_limits[best_pos]:
+                    roster[best_pos] += 1
+                elif roster["FLEX"] < position_limits["FLEX"]:
+                    roster["FLEX"] += 1
+            else:
+                roster[best_pos] += 1
+
+        plans[player_id] = plan
+
+    return plans
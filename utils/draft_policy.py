@@ -0,0 +1,261 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from utils.availability_index import AvailabilityIndex
+from utils.data_access import CACHE_DIR, load_table
+from utils.draft_pool_calcs import compute_proj_by_position
+from utils.draft_schedule import generate_pick_order, picks_by_team
+from utils.instrumentation import count, span
+from utils.mip_draft_model import DraftOptimizer
+from utils.pipeline import DEFAULT_LEAGUE, PLAYER_DATA, load_league
+
+POLICY_DIR = CACHE_DIR / "policies"
+# League settings a policy depends on
+POLICY_SETTINGS = ["num_teams", "draft_type", "positions", "position_constraints", "flex_limit"]
+# Bumped when solve_policy changes which plan it picks, so cached tables are rebuilt
+POLICY_VERSION = 2
+
+# Per-process state set up by _init_worker: the player table, its availability index and the league
+_worker = None
+
+
+def _rounds(league):
+    return league["flex_limit"] + sum(con["limit"] for con in league["position_constraints"])
+
+
+def _meta_path(path):
+    return Path(path).with_suffix(".json")
+
+
+def _optimizer(picks, proj_matrix, league):
+    positions = league["positions"]
+    return DraftOptimizer(picks=picks, current_roster={p: 0 for p in positions},
+                          position_constraints=league["position_constraints"], positions=positions,
+                          proj_matrix=proj_matrix, flex_limit=league["flex_limit"])
+
+
+def _init_worker(player_df, league, table_path):
+    global _worker
+    _worker = {"player_df": player_df, "index": AvailabilityIndex(player_df), "league": league,
+               "table_path": table_path}
+
+
+def _build_slot(j, picks):
+    """
+    Solve slot j's policy (DraftOptimizer.solve_policy) and write it straight into row j of the
+    mapped table, so only the slot's expected points travel back.
+    """
+    league = _worker["league"]
+    proj_matrix = compute_proj_by_position(_worker["player_df"], picks, league["positions"], index=_worker["index"])
+    policy, values = _optimizer(picks, proj_matrix, league).solve_policy()
+    table = np.load(_worker["table_path"], mmap_mode="r+")
+    table[j] = policy
+    table.flush()
+    return j, float(values[0]), int((policy >= 0).sum())
+
+
+class DraftPolicy:
+    def __init__(self, table, meta, path=None):
+        """
+        Precomputed best next position for every draft slot, round and roster state.
+
+        The table is int8 of shape (slots, rounds, states): entry [slot, round, state] indexes
+        meta["positions"], -1 where the state cannot occur or cannot be completed. A state is the
+        drafted count per constraint group in DraftOptimizer's numbering (state_layout), so a
+        recommendation for any roster, on plan or not, is one index computation and one read.
+        Stores opened from disk hold a read-only memory map and pickle by path, as
+        WeeklyProjections does.
+
+        Parameters:
+        - table: np.ndarray or np.memmap [int8] (slots, rounds, states)
+        - meta: Dict -> positions, groups, caps, strides, slots, picks, expected_points, league
+        - path: Path -> .npy file the table is mapped from (None for an in-memory policy)
+        """
+        self.table = table
+        self.meta = meta
+        self.path = path
+        self.positions = meta["positions"]
+        self._slot_row = {slot: j for j, slot in enumerate(meta["slots"])}
+        self._strides = meta["strides"]
+        self._caps = meta["caps"]
+        self._group_of = {p: g for g, group in enumerate(meta["groups"]) for p in group}
+
+    @classmethod
+    def build(cls, player_df: pd.DataFrame, league=None, path=None, max_workers=None) -> "DraftPolicy":
+        """
+        Solve every slot's policy, in parallel across slots, into the table at `path`.
+
+        Parameters:
+        - player_df: pd.DataFrame -> player table (as load_table(PLAYER_DATA)); projections per
+          (pick, position) come from compute_proj_by_position, as for the draft_targets plans
+        - league: Dict -> overrides of utils.pipeline.DEFAULT_LEAGUE
+        - path: Path -> .npy to write (plus a .json sidecar); default under assets/cache/policies
+        - max_workers: int -> worker processes (defaults to os.cpu_count(); 1 runs in this process)
+        """
+        player_df = player_df.reset_index(drop=True)
+        league = {**DEFAULT_LEAGUE, **(league or {})}
+        path = Path(path or POLICY_DIR / f"policy-{policy_key(player_df, league)}.npy")
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        rounds = _rounds(league)
+        player_picks = picks_by_team(generate_pick_order(league["num_teams"], rounds, league["draft_type"]))
+        _, _, _, caps, strides = _optimizer(player_picks[1], {}, league).state_layout()
+        n_states = int(np.prod(caps + 1))
+
+        # Write-then-rename (the table last), so readers never map a partial file
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp.npy")
+        table = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.int8,
+                                          shape=(len(player_picks), rounds, n_states))
+        table[:] = -1
+        table.flush()
+        del table
+
+        expected_points, reachable = {}, 0
+        tasks = list(enumerate(player_picks.values()))
+        initargs = (player_df, league, tmp_path)
+        with span("DraftPolicy.build", slots=len(tasks), states=n_states):
+            if (max_workers or os.cpu_count()) == 1 or len(tasks) <= 1:
+                _init_worker(*initargs)
+                results = [_build_slot(*task) for task in tasks]
+            else:
+                with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=initargs) as pool:
+                    results = [future.result() for future in as_completed([pool.submit(_build_slot, *t) for t in tasks])]
+        for j, points, n_reachable in results:
+            expected_points[j] = points
+            reachable += n_reachable
+        count("DraftPolicy.states", reachable)
+
+        meta = {
+            "positions": list(league["positions"]),
+            "groups": [con["positions_against_limit"] for con in league["position_constraints"]],
+            "caps": caps.tolist(),
+            "strides": strides.tolist(),
+            "slots": list(player_picks),
+            "picks": list(player_picks.values()),
+            "expected_points": [expected_points[j] for j in range(len(tasks))],
+            "reachable_states": reachable,
+            "league": {k: league[k] for k in POLICY_SETTINGS},
+        }
+        _meta_path(path).write_text(json.dumps(meta, indent=2))
+        tmp_path.replace(path)
+        return cls.open(path)
+
+    @classmethod
+    def open(cls, path) -> "DraftPolicy":
+        """Map a policy written by build() read-only."""
+        path = Path(path)
+        return cls(np.load(path, mmap_mode="r"), json.loads(_meta_path(path).read_text()), path)
+
+    @classmethod
+    def for_league(cls, player_df: pd.DataFrame, league=None, max_workers=None) -> "DraftPolicy":
+        """Policy for this player table and league, built on first use and cached in assets/cache/policies."""
+        league = {**DEFAULT_LEAGUE, **(league or {})}
+        path = POLICY_DIR / f"policy-{policy_key(player_df, league)}.npy"
+        if path.exists() and _meta_path(path).exists():
+            count("DraftPolicy.cache_hit")
+            return cls.open(path)
+        return cls.build(player_df, league, path, max_workers=max_workers)
+
+    def __reduce__(self):
+        if self.path is None:
+            return super().__reduce__()
+        return DraftPolicy.open, (self.path,)
+
+    @property
+    def nbytes(self) -> int:
+        return self.table.nbytes
+
+    def state(self, roster):
+        """
+        State number of a roster (Dict[str, int] -> players drafted by position), None if it breaks the
+        roster rules the policy was built for. Positions outside every constraint group do not count.
+        """
+        state = 0
+        counts = [0] * len(self._caps)
+        for p, n in roster.items():
+            g = self._group_of.get(p)
+            if g is not None:
+                counts[g] += n
+        for n, cap, stride in zip(counts, self._caps, self._strides):
+            if n > cap:
+                return None
+            state += n * stride
+        return state
+
+    def lookup(self, slot, round_index, roster):
+        """
+        Best position to draft now.
+
+        Parameters:
+        - slot: int -> draft slot (1-indexed team)
+        - round_index: int -> our picks made so far (0 for our first pick)
+        - roster: Dict[str, int] -> players drafted by position
+
+        Returns:
+        - str, or None if the roster cannot be completed under the roster rules or the draft is over
+        """
+        state = self.state(roster)
+        table = self.table
+        if state is None or not 0 <= round_index < table.shape[1]:
+            return None
+        k = table[self._slot_row[slot], round_index, state]
+        return self.positions[k] if k >= 0 else None
+
+    def plan(self, slot) -> list:
+        """Positions the policy drafts from an empty roster, round by round (the slot's optimal plan)."""
+        roster, plan = {}, []
+        for round_index in range(self.table.shape[1]):
+            position = self.lookup(slot, round_index, roster)
+            plan.append(position)
+            if position is not None:
+                roster[position] = roster.get(position, 0) + 1
+        return plan
+
+
+def policy_key(player_df, league) -> str:
+    """Hash of the player columns, league settings and POLICY_VERSION a policy depends on."""
+    data = pd.util.hash_pandas_object(player_df[[c for c in ["position", "Position", "ADP", "proj_points"]
+                                                 if c in player_df.columns]], index=False).to_numpy()
+    config = {"data": hashlib.sha256(data.tobytes()).hexdigest(), "league": {k: league[k] for k in POLICY_SETTINGS},
+              "version": POLICY_VERSION}
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m utils.draft_policy",
+                                     description="Build the per-slot optimal pick policy over every roster state.")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--league", help="YAML/JSON file overriding the default league settings")
+    parser.add_argument("--out", help="table path (default: assets/cache/policies/policy-<settings hash>.npy)")
+    args = parser.parse_args(argv)
+
+    player_df = load_table(PLAYER_DATA, dtype=np.float64)
+    league = load_league(args.league) if args.league else None
+    start = time.perf_counter()
+    policy = DraftPolicy.build(player_df, league, path=args.out, max_workers=args.workers)
+    elapsed = time.perf_counter() - start
+
+    slots, rounds, states = policy.table.shape
+    print(f"{slots} slots x {rounds} rounds x {states} states int8 = {policy.nbytes:,} bytes "
+          f"({policy.meta['reachable_states']:,} reachable), built in {elapsed:.2f}s -> {policy.path}")
+
+    # Lookup cost over random on-the-fly rosters
+    rng = np.random.default_rng(0)
+    rosters = [{p: int(rng.integers(0, 3)) for p in policy.positions} for _ in range(10_000)]
+    start = time.perf_counter()
+    for roster in rosters:
+        policy.lookup(policy.meta["slots"][0], sum(roster.values()) % rounds, roster)
+    print(f"lookup: {(time.perf_counter() - start) / len(rosters) * 1e6:.2f} us")
+    print(pd.DataFrame({slot: policy.plan(slot) for slot in policy.meta["slots"]},
+                       index=pd.RangeIndex(1, rounds + 1, name="round")))
+
+
+if __name__ == "__main__":
+    main()
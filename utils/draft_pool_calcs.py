@@ -2,17 +2,36 @@ import pandas as pd
 from collections import defaultdict
 from paths import PROJECT_ROOT
 import numpy as np
+from utils.availability_index import AvailabilityIndex
+from utils.availability_model import ProbabilisticAvailability
 
-def calculate_expected_vor(df: pd.DataFrame, pick_number: int, picks_until_next: int):
+def calculate_expected_vor(df: pd.DataFrame, pick_number: int, picks_until_next: int, index: AvailabilityIndex = None,
+                           method="offsets", model: ProbabilisticAvailability = None):
     """
     Calculate expected VOR (Value Over Replacement) for each position
     based on current pick number and gap until next pick.
 
-    Computes average of 3 estimates:
+    With method="offsets", computes average of 3 estimates:
     1. VOR at exact pick_number
     2. VOR at pick_number - 6 (early)
     3. VOR at pick_number + 6 (late)
+
+    With method="probabilistic", VOR is the expected best available projection at pick_number minus
+    the one at pick_number + picks_until_next under the ADP distribution model (availability_model).
+
+    Pass a prebuilt `index` (or `model`) when calling this repeatedly on the same df.
     """
+    if method == "probabilistic":
+        if model is None:
+            model = ProbabilisticAvailability(df)
+        picks = [pick_number, pick_number + picks_until_next]
+        return {pos: float(np.subtract(*model.expected_best(pos, picks))) for pos in model.positions}
+    if method != "offsets":
+        raise ValueError(f"Unknown method: {method}")
+
+    if index is None:
+        index = AvailabilityIndex(df)
+
     offsets = [0, -6, 6]
     vor_by_position = defaultdict(list)
 
@@ -21,7 +40,7 @@ def calculate_expected_vor(df: pd.DataFrame, pick_number: int, picks_until_next:
         next_pick = this_pick + picks_until_next
         if this_pick < 1:
             continue  # Skip invalid picks
-        single_vor = compute_single_vor(df, this_pick, next_pick)
+        single_vor = compute_single_vor(df, this_pick, next_pick, index=index)
         for pos, vor in single_vor.items():
             vor_by_position[pos].append(vor)
 
@@ -33,19 +52,20 @@ def calculate_expected_vor(df: pd.DataFrame, pick_number: int, picks_until_next:
     return avg_vor
 
 
-def compute_single_vor(df: pd.DataFrame, pick_number: int, next_pick: int):
+def compute_single_vor(df: pd.DataFrame, pick_number: int, next_pick: int, index: AvailabilityIndex = None):
     """
     Compute VOR of each position given a pick number and picks until next pick.
     VOR = Projected Points - Replacement Level Points (based on projected next available)
+
+    Pass a prebuilt `index` when calling this repeatedly on the same df.
     """
-    draftable_players = df[df['ADP'] >= pick_number].sort_values('ADP')
-    taken_players = df[df['ADP'] < pick_number]
-    replacement_pool = df[df['ADP'] >= next_pick].sort_values('ADP')
+    if index is None:
+        index = AvailabilityIndex(df)
 
     position_vor = {}
-    for pos in df['position'].unique():
-        expected_proj = draftable_players[draftable_players['position'] == pos]['proj_points'].max()
-        replacement_proj = replacement_pool[replacement_pool['position'] == pos]['proj_points'].max()
+    for pos in index.positions:
+        expected_proj = index.best_available(pos, pick_number)
+        replacement_proj = index.best_available(pos, next_pick)
 
         # Ensure expected_proj and replacement_proj are valid numbers
         if pd.isna(expected_proj):
@@ -55,48 +75,60 @@ def compute_single_vor(df: pd.DataFrame, pick_number: int, next_pick: int):
 
         position_vor[pos] = expected_proj - replacement_proj
 
-
-
     return position_vor
 
 
-def compute_proj_by_position(df: pd.DataFrame, picks: list, positions: list) -> dict:
+def compute_proj_by_position(df: pd.DataFrame, picks: list, positions: list, index: AvailabilityIndex = None,
+                             method="offsets", model: ProbabilisticAvailability = None) -> dict:
     """
     Constructs a projection matrix: (pick_number, position) → projected points.
 
     Parameters:
-    - df: pd.DataFrame with columns ['Player Name', 'Position', 'proj_points', 'ADP']
+    - df: pd.DataFrame with columns ['Player Name', 'Position', 'proj_points', 'ADP'] (any spelling in
+      player_pool.FIELD_COLUMNS), or a PlayerPool
     - picks: list[int] of overall pick numbers to simulate drafting at
     - positions: list[str] of positions to consider
+    - index: AvailabilityIndex built over df (built here if omitted)
+    - method: str -> "offsets" (average over ADP anchors 0, -6, +6) or "probabilistic" (expected best
+      available under the ADP distribution model, see availability_model)
+    - model: ProbabilisticAvailability built over df (method="probabilistic" only)
 
     Returns:
     - Dict[(int, str), float]: projection_matrix mapping (pick, position) to average projected points
     """
-    projection_matrix = {}
-
-    # Ensure ADP and proj_points are float
-    df = df.copy()
-    df["ADP"] = df["ADP"].astype(float)
-    df["proj_points"] = df["proj_points"].astype(float)
-
-    for pick in picks:
+    picks = list(picks)
+    if method == "probabilistic":
+        if model is None:
+            model = ProbabilisticAvailability(df)
+        projection_matrix = {}
         for pos in positions:
-            proj_samples = []
-
-            # Consider 3 anchor points: ADP, ADP+6, ADP-6 to simulate positional availability
-            for offset in [0, -6, 6]:
-                adp_cutoff = pick + offset
+            for pick, value in zip(picks, model.expected_best(pos, picks)):
+                projection_matrix[(pick, pos)] = float(value)
+        return projection_matrix
+    if method != "offsets":
+        raise ValueError(f"Unknown method: {method}")
 
-                # Filter by players available at this point and at the right position
-                available = df[(df["ADP"] >= adp_cutoff) & (df["Position"] == pos)]
+    if index is None:
+        index = AvailabilityIndex(df)
 
-                if not available.empty:
-                    top_proj = available["proj_points"].max()
-                    proj_samples.append(top_proj)
+    pick_array = np.asarray(picks, dtype=float)
+    projection_matrix = {}
 
-            # If we found any data points, take average; otherwise set to 0
-            avg_proj = np.mean(proj_samples) if proj_samples else 0.0
-            projection_matrix[(pick, pos)] = avg_proj
+    for pos in positions:
+        proj_sum = np.zeros(len(picks))
+        n_samples = np.zeros(len(picks))
+
+        # Consider 3 anchor points: ADP, ADP+6, ADP-6 to simulate positional availability
+        for offset in [0, -6, 6]:
+            top_proj = index.best_available_batch(pos, pick_array + offset)
+            found = ~np.isnan(top_proj)
+            proj_sum[found] += top_proj[found]
+            n_samples += found
+
+        # If we found any data points, take average; otherwise set to 0
+        avg_proj = np.divide(proj_sum, n_samples, out=np.zeros(len(picks)), where=n_samples > 0)
+        for pick, value in zip(picks, avg_proj):
+            projection_matrix[(pick, pos)] = float(value)
 
     return projection_matrix
 
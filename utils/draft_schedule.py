@@ -0,0 +1,45 @@
+from collections import defaultdict
+
+DRAFT_TYPES = ("snake", "linear", "third_round_reversal")
+
+
+def generate_pick_order(num_teams=12, rounds=8, draft_type="snake"):
+    """
+    Team on the clock for every overall pick.
+
+    Parameters:
+    - num_teams: int -> teams in the league (numbered 1..num_teams)
+    - rounds: int -> rounds in the draft
+    - draft_type: str -> "snake" (order flips every round), "linear" (same order every round) or
+      "third_round_reversal" (rounds 2 and 3 both run backwards, then the snake resumes)
+
+    Returns:
+    - List[int] of length num_teams * rounds; entry i is the team making overall pick i + 1
+    """
+    if draft_type not in DRAFT_TYPES:
+        raise ValueError(f"Unknown draft_type {draft_type!r}; expected one of {DRAFT_TYPES}")
+
+    forward = list(range(1, num_teams + 1))
+    order = []
+    for rnd in range(rounds):
+        if draft_type == "linear":
+            reverse = False
+        elif draft_type == "third_round_reversal" and rnd >= 2:
+            reverse = rnd % 2 == 0
+        else:
+            reverse = rnd % 2 == 1
+        order += forward[::-1] if reverse else forward
+    return order
+
+
+def picks_by_team(pick_order):
+    """
+    Overall pick numbers for each team.
+
+    Returns:
+    - Dict[int, List[int]] -> team to its overall picks in draft order
+    """
+    team_picks = defaultdict(list)
+    for pick, team in enumerate(pick_order, start=1):
+        team_picks[team].append(pick)
+    return dict(team_picks)
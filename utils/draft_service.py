@@ -0,0 +1,347 @@
+import argparse
+import asyncio
+import json
+import math
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit
+
+import numpy as np
+import pandas as pd
+from utils.data_access import load_table
+from utils.draft_playbook import PlaybookTable, recommend_draft_plan
+from utils.draft_schedule import generate_pick_order
+from utils.live_draft import LiveDraft, plan_work, solve_plan
+from utils.pipeline import DEFAULT_LEAGUE, PLAYER_DATA, load_league
+
+# Per-league settings a client may override when creating a league
+LEAGUE_SETTINGS = ["num_teams", "draft_type", "rounds", "positions", "position_constraints", "position_limits",
+                   "flex_limit", "solver"]
+# Event latencies kept for /stats
+LATENCY_WINDOW = 100_000
+MAX_BODY = 1 << 20
+# Solves up to this plan_work run on the event loop: a default 12-team roster (~2e4) takes ~2.5 ms
+# with "dp", 5e5 ~15 ms. Below that the worker round trip costs more than it frees the loop.
+INLINE_WORK = 500_000
+
+STATUS_TEXT = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class ServiceError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class _League:
+    __slots__ = ("draft", "settings", "playbook_plan", "lock", "subscribers", "version", "recommendation")
+
+    def __init__(self, draft, settings, playbook_plan):
+        self.draft = draft
+        self.settings = settings
+        self.playbook_plan = playbook_plan
+        self.lock = asyncio.Lock()
+        self.subscribers = set()
+        self.version = 0
+        self.recommendation = None
+
+
+def _to_json(value):
+    """JSON-safe copy of a recommendation: DataFrames as records, NumPy scalars as Python, NaN as null."""
+    if isinstance(value, pd.DataFrame):
+        return [_to_json(record) for record in value.to_dict("records")]
+    if isinstance(value, dict):
+        return {str(k): _to_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(v) for v in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+class DraftService:
+    def __init__(self, player_df: pd.DataFrame, playbook: PlaybookTable, league=None, workers=None,
+                 inline_work=INLINE_WORK):
+        """
+        In-memory draft rooms for many leagues at once, behind an asyncio HTTP server (serve()).
+
+        The player table and VOR playbook are loaded once and shared by every league; each league is
+        a LiveDraft (its own availability index, roster and projection matrix). A pick event updates
+        the league's board on the event loop (index removal and one position's projections, well
+        under a millisecond) and then solves for a new plan. Small solves (plan_work up to
+        `inline_work`, every default-sized "dp" league) run right there; larger ones and MIP solvers
+        go to a process pool, so slow solves never block other leagues. Events of one league are
+        applied in order under a per-league lock.
+
+        Parameters:
+        - player_df: pd.DataFrame -> player table (as load_table(PLAYER_DATA))
+        - playbook: PlaybookTable -> VOR playbook for the recommend_draft_plan plan sent on creation
+        - league: Dict -> default league settings (DEFAULT_LEAGUE keys); clients can override LEAGUE_SETTINGS
+        - workers: int -> solver processes for the large solves (None: os.cpu_count(); 0 solves
+          everything on the event loop)
+        - inline_work: float -> largest plan_work solved on the event loop (0 sends every solve to the pool)
+        """
+        self.player_df = player_df.reset_index(drop=True)
+        self.playbook = playbook
+        self.league = {**DEFAULT_LEAGUE, **(league or {})}
+        self.workers = workers
+        self.inline_work = inline_work
+        # Workers only start with the first solve sent to the pool
+        self.executor = ProcessPoolExecutor(max_workers=workers) if workers != 0 else None
+        self.leagues = {}
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.events = 0
+        self.pool_solves = 0
+
+    async def _solve(self, request):
+        if request is None:
+            return None
+        if self.executor is None or plan_work(request) <= self.inline_work:
+            return solve_plan(request)
+        self.pool_solves += 1
+        return await asyncio.get_running_loop().run_in_executor(self.executor, solve_plan, request)
+
+    async def _recommend(self, league):
+        """Solve for the league's current board and push the result to its subscribers."""
+        request = league.draft.plan_request()
+        try:
+            plan = await self._solve(request)
+        except RuntimeError as e:
+            league.recommendation = _to_json(league.draft.fail_recommendation(request, e))
+        else:
+            league.recommendation = _to_json(league.draft.finish_recommendation(request, plan))
+        league.version += 1
+        for queue in league.subscribers:
+            queue.put_nowait(self._state(league))
+        return league.recommendation
+
+    def _league(self, league_id) -> _League:
+        if league_id not in self.leagues:
+            raise ServiceError(404, f"Unknown league: {league_id}")
+        return self.leagues[league_id]
+
+    def _state(self, league) -> dict:
+        draft = league.draft
+        return {"current_pick": draft.current_pick, "version": league.version, "roster": draft.roster,
+                "recommendation": league.recommendation}
+
+    async def create_league(self, body) -> dict:
+        """
+        Start a league. body: draft_slot (required), optional league_id and any LEAGUE_SETTINGS.
+
+        Returns:
+        - Dict with league_id, playbook_plan (recommend_draft_plan for our slot) and the first recommendation
+        """
+        if "draft_slot" not in body:
+            raise ServiceError(400, "draft_slot is required")
+        league_id = str(body.get("league_id") or uuid.uuid4().hex)
+        if league_id in self.leagues:
+            raise ServiceError(409, f"League {league_id} already exists")
+        settings = {**self.league, **{k: body[k] for k in LEAGUE_SETTINGS if k in body}}
+        draft_slot = int(body["draft_slot"])
+        if not 1 <= draft_slot <= settings["num_teams"]:
+            raise ServiceError(400, f"draft_slot must be between 1 and {settings['num_teams']}")
+        if settings["solver"] == "lineup":
+            # The lineup backend needs a weekly store and expected rows per pick; live drafts use proj_matrix
+            raise ServiceError(400, 'solver "lineup" is not supported for live drafts')
+
+        rounds = settings["flex_limit"] + sum(con["limit"] for con in settings["position_constraints"])
+        pick_order = generate_pick_order(settings["num_teams"], rounds, settings["draft_type"])
+        draft = LiveDraft(self.player_df, draft_slot, settings["position_constraints"], settings["positions"],
+                          flex_limit=settings["flex_limit"], num_teams=settings["num_teams"], rounds=rounds,
+                          pick_order=pick_order, solver_name=settings["solver"], recommend=False)
+        playbook_plan = recommend_draft_plan(self.playbook, {draft_slot: draft.our_picks}, settings["position_limits"],
+                                             rounds=settings["rounds"], fallback_gap=settings["num_teams"])[draft_slot]
+        league = self.leagues[league_id] = _League(draft, settings, playbook_plan)
+        async with league.lock:
+            await self._recommend(league)
+        return {"league_id": league_id, "playbook_plan": _to_json(playbook_plan), **self._state(league)}
+
+    async def record_pick(self, league_id, body) -> dict:
+        """Apply a pick event (body: player, optional team) and return the league's new state."""
+        start = time.perf_counter()
+        league = self._league(league_id)
+        if "player" not in body:
+            raise ServiceError(400, "player is required")
+        async with league.lock:
+            try:
+                league.draft.apply_pick(body["player"], body.get("team"))
+            except KeyError as e:
+                raise ServiceError(404, str(e.args[0])) from e
+            except ValueError as e:
+                raise ServiceError(409, str(e)) from e
+            await self._recommend(league)
+            state = self._state(league)
+        self.latencies.append(time.perf_counter() - start)
+        self.events += 1
+        return state
+
+    def get_league(self, league_id) -> dict:
+        league = self._league(league_id)
+        return {"league_id": league_id, "history": [list(event) for event in league.draft.history],
+                "playbook_plan": _to_json(league.playbook_plan), **_to_json(self._state(league))}
+
+    def delete_league(self, league_id) -> dict:
+        league = self.leagues.pop(league_id, None)
+        if league is None:
+            raise ServiceError(404, f"Unknown league: {league_id}")
+        for queue in league.subscribers:
+            queue.put_nowait(None)
+        return {"league_id": league_id, "deleted": True}
+
+    def stats(self) -> dict:
+        """Pick-event latency percentiles (ms) over the last LATENCY_WINDOW events."""
+        stats = {"leagues": len(self.leagues), "events": self.events, "workers": self.workers,
+                 "pool_solves": self.pool_solves}
+        if self.latencies:
+            latencies = np.asarray(self.latencies) * 1e3
+            stats.update({f"p{q}_ms": float(np.percentile(latencies, q)) for q in (50, 90, 99)})
+            stats["max_ms"] = float(latencies.max())
+        return stats
+
+    # HTTP ------------------------------------------------------------------------------------
+
+    async def _route(self, method, path, body):
+        parts = [part for part in path.split("/") if part]
+        if parts == ["health"] and method == "GET":
+            return 200, {"status": "ok", "leagues": len(self.leagues)}
+        if parts == ["stats"] and method == "GET":
+            return 200, self.stats()
+        if parts == ["leagues"] and method == "POST":
+            return 201, await self.create_league(body)
+        if len(parts) == 2 and parts[0] == "leagues":
+            if method == "GET":
+                return 200, self.get_league(parts[1])
+            if method == "DELETE":
+                return 200, self.delete_league(parts[1])
+        if len(parts) == 3 and parts[0] == "leagues" and parts[2] == "picks" and method == "POST":
+            return 200, await self.record_pick(parts[1], body)
+        raise ServiceError(405 if parts and parts[0] in ("health", "stats", "leagues") else 404,
+                           f"No route for {method} {path}")
+
+    async def _stream(self, league_id, writer):
+        """Server-sent events: the league's state now and after every pick, until it is deleted."""
+        league = self._league(league_id)
+        queue = asyncio.Queue()
+        league.subscribers.add(queue)
+        try:
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+                         b"Connection: close\r\n\r\n")
+            state = self._state(league)
+            while state is not None:
+                writer.write(f"data: {json.dumps(_to_json(state))}\n\n".encode())
+                await writer.drain()
+                state = await queue.get()
+        finally:
+            league.subscribers.discard(queue)
+
+    async def handle(self, reader, writer):
+        """One client connection: HTTP/1.1 requests with keep-alive, JSON bodies both ways."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                path = urlsplit(target).path
+
+                if method == "GET" and path.endswith("/stream"):
+                    try:
+                        await self._stream(path.split("/")[-2], writer)
+                    except ServiceError as e:
+                        self._respond(writer, e.status, {"error": str(e)}, keep_alive=False)
+                    break
+
+                try:
+                    if length > MAX_BODY:
+                        raise ServiceError(413, "Request body too large")
+                    raw = await reader.readexactly(length) if length else b""
+                    try:
+                        body = json.loads(raw) if raw else {}
+                    except json.JSONDecodeError as e:
+                        raise ServiceError(400, f"Invalid JSON: {e}") from e
+                    status, payload = await self._route(method, path, body)
+                except ServiceError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except Exception as e:  # keep serving other requests and leagues
+                    status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+                keep_alive = headers.get("connection", "").lower() != "close"
+                self._respond(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _respond(writer, status, payload, keep_alive=True):
+        body = json.dumps(_to_json(payload)).encode()
+        writer.write(f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                     .encode() + body)
+
+    async def serve(self, host="127.0.0.1", port=8765, ready=None):
+        """Run the HTTP server until cancelled; `ready` (an asyncio.Event) is set once it listens."""
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_BODY)
+        if ready is not None:
+            ready.set()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.close()
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+
+def load_service(league=None, workers=None, inline_work=INLINE_WORK) -> DraftService:
+    """DraftService over the pipeline's player table and VOR playbook."""
+    player_df = load_table(PLAYER_DATA, dtype=np.float64)
+    playbook = PlaybookTable(load_table("vor_playbook.csv", dtype=np.float64))
+    return DraftService(player_df, playbook, league=league, workers=workers, inline_work=inline_work)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m utils.draft_service",
+                                     description="Serve draft-room recommendations for many leagues over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, help="solver processes for large solves (default: CPU count; "
+                                                    "0 solves everything in-process)")
+    parser.add_argument("--inline-work", type=float, default=INLINE_WORK,
+                        help="largest solve (live_draft.plan_work) run in-process; 0 sends every solve to the pool")
+    parser.add_argument("--league", help="YAML/JSON file overriding the default league settings")
+    args = parser.parse_args(argv)
+
+    service = load_service(load_league(args.league) if args.league else None, workers=args.workers,
+                           inline_work=args.inline_work)
+    print(f"Serving {len(service.player_df)} players on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
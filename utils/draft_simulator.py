@@ -0,0 +1,434 @@
+import numpy as np
+import pandas as pd
+
+from utils.draft_schedule import generate_pick_order
+from utils.instrumentation import count, span, timed
+from utils.player_pool import PlayerPool
+
+FLEX_POSITIONS = ["RB", "WR", "TE"]
+
+
+def generate_snake_order(num_teams=12, rounds=8):
+    return generate_pick_order(num_teams, rounds, "snake")
+
+
+class DraftSimulator:
+    def __init__(self, players, position_limits: dict, name_col=None, position_col=None):
+        """
+        Array-backed draft simulator. Every team picks the open position with the highest VOR (best
+        remaining projection minus the best one expected to last until its next pick), then a random
+        player within 90% of that position's best projection (make_pick).
+
+        The player pool is stored once as integer-indexed NumPy arrays (a PlayerPool). A draft only
+        carries a drafted mask and per-position cursors, so no DataFrame is copied or filtered per pick.
+
+        Parameters:
+        - players: PlayerPool, or pd.DataFrame with columns [name_col, position_col, 'ADP', 'proj_points']
+        - position_limits: Dict[str, int] -> starter slots per position, including "FLEX"
+        - name_col: str -> name of the player name column (DataFrame only; found by player_pool.find_column if omitted)
+        - position_col: str -> name of the position column (likewise)
+        """
+        pool = PlayerPool.coerce(players, name_col=name_col, position_col=position_col)
+        self.position_limits = position_limits
+        self.names = pool.names
+        self.adp = pool.adp
+        self.proj = pool.proj
+
+        # Drafting a player removes every row with that name, as the DataFrame filter did
+        self.name_codes = pool.name_codes.astype(np.int64)
+        self.pos_codes = pool.position_codes.astype(np.int64)
+        self.positions = list(pool.position_table)
+        self.n_players = len(pool)
+
+        # Per position: rows in file order (drives the order positions are considered in)
+        # and rows sorted by projection, best first (drives max / replacement / candidate lookups).
+        # The per-pick loops only do scalar lookups, which are faster on plain lists than on arrays.
+        self.rows_by_file = []
+        self.rows_by_proj = []
+        for code in range(len(self.positions)):
+            rows = np.flatnonzero(self.pos_codes == code)
+            self.rows_by_file.append(rows.tolist())
+            rows = rows[~np.isnan(self.proj[rows])]
+            self.rows_by_proj.append(rows[np.argsort(-self.proj[rows], kind="stable")].tolist())
+        self._adp_list = self.adp.tolist()
+        self._proj_list = self.proj.tolist()
+        self._position_list = [self.positions[code] for code in self.pos_codes.tolist()]
+        rows_by_name = {}
+        for row, code in enumerate(self.name_codes.tolist()):
+            rows_by_name.setdefault(code, []).append(row)
+        self._same_name = [rows_by_name[code] for code in self.name_codes.tolist()]
+        # One availability column per name in the pool's name table, the last one for missing names (code -1)
+        self.n_names = len(pool.name_table) + 1
+
+        flex_limits = [position_limits.get(pos, 0) for pos in FLEX_POSITIONS + ["FLEX"]]
+        self.flex_limit = sum(flex_limits)
+        # Per position code: (name, starter limit, counts against FLEX), for make_pick's open-slot check
+        self._slots = [(pos, position_limits.get(pos, 99), pos in FLEX_POSITIONS) for pos in self.positions]
+        self._lineup_rows = None
+
+    def set_adp(self, adp):
+        """
+        Simulate with another ADP per player row (e.g. simulated ADP fed back) without rebuilding the
+        simulator: nothing else it precomputes depends on ADP.
+        """
+        self.adp = np.asarray(adp, dtype=np.float64)
+        self._adp_list = self.adp.tolist()
+
+    def _store_rows(self, store):
+        """Row of every player in a WeeklyProjections store, matched by name (cached per store)."""
+        if self._lineup_rows is None or self._lineup_rows[0] is not store:
+            self._lineup_rows = (store, store.rows_for(self.names))
+        return self._lineup_rows[1]
+
+    def _is_open(self, pos, roster):
+        if pos not in roster or roster[pos] < self.position_limits.get(pos, 99):
+            return True
+        if pos in FLEX_POSITIONS:
+            return sum(roster.get(p, 0) for p in FLEX_POSITIONS) < self.flex_limit
+        return False
+
+    def new_draft(self):
+        """Fresh per-draft state: nobody drafted, all cursors at the start."""
+        return _DraftState(self.n_players, len(self.positions))
+
+    def draft_player(self, state, row):
+        """Mark `row` (and any other row with the same name) as drafted."""
+        for same in self._same_name[row]:
+            state.drafted[same] = True
+
+    @timed("DraftSimulator.make_pick")
+    def make_pick(self, state, roster, next_pick, rng=None, draw=None):
+        """
+        Choose one player for a team.
+
+        Parameters:
+        - state: _DraftState -> drafted flags and per-position cursors of this draft
+        - roster: Dict[str, int] -> players drafted so far by position
+        - next_pick: int -> overall number of the team's next pick (not decreasing within a draft,
+          or the replacement cursors start over)
+        - rng: np.random.Generator -> source of `draw` when it is not given
+        - draw: float in [0, 1) -> picks candidate floor(draw * n_candidates), as simulate_batch does
+
+        Returns:
+        - int row of the chosen player, or None if no candidate qualifies
+        """
+        drafted = state.drafted
+        proj = self._proj_list
+        adp = self._adp_list
+
+        # Replacement cursors only move forward while next_pick does (the picks of one draft)
+        if next_pick < state.replacement_pick:
+            state.replacement_cursors = list(state.proj_cursors)
+        state.replacement_pick = next_pick
+
+        flex_open = sum(roster.get(p, 0) for p in FLEX_POSITIONS) < self.flex_limit
+
+        # Positions are considered in the order they first appear in the remaining pool,
+        # which matters for how max() breaks ties and handles NaN values
+        first_rows = []
+        for code, rows in enumerate(self.rows_by_file):
+            pos, limit, is_flex = self._slots[code]
+            # Open as in _is_open: a slot left at the position, or a FLEX slot for RB/WR/TE
+            if pos in roster and roster[pos] >= limit and not (is_flex and flex_open):
+                continue
+            cursor = state.file_cursors[code]
+            while cursor < len(rows) and drafted[rows[cursor]]:
+                cursor += 1
+            state.file_cursors[code] = cursor
+            if cursor < len(rows):
+                first_rows.append((rows[cursor], code))
+        first_rows.sort()
+
+        best_code, best_vor = None, None
+        for _, code in first_rows:
+            rows = self.rows_by_proj[code]
+            cursor = state.proj_cursors[code]
+            while cursor < len(rows) and drafted[rows[cursor]]:
+                cursor += 1
+            state.proj_cursors[code] = cursor
+
+            # Best remaining projection, and best among players expected to last until next_pick. Rows
+            # passed over stay drafted or below next_pick for the rest of the draft (NaN ADP never qualifies).
+            k = max(state.replacement_cursors[code], cursor)
+            while k < len(rows) and (drafted[rows[k]] or not adp[rows[k]] >= next_pick):
+                k += 1
+            state.replacement_cursors[code] = k
+            expected_proj = proj[rows[cursor]] if cursor < len(rows) else np.nan
+            replacement_proj = proj[rows[k]] if k < len(rows) else np.nan
+            vor = expected_proj - replacement_proj
+
+            if best_code is None or vor > best_vor:
+                best_code, best_vor = code, vor
+
+        if best_code is None:
+            raise ValueError("No open position left to draft")
+
+        # Sample uniformly among players within 90% of the best projection at that position
+        rows = self.rows_by_proj[best_code]
+        cursor = state.proj_cursors[best_code]
+        if cursor == len(rows):
+            return None
+        best_points = proj[rows[cursor]]
+        candidates = []
+        for k in range(cursor, len(rows)):
+            row = rows[k]
+            if not proj[row] > best_points * 0.9:
+                break
+            if not drafted[row]:
+                candidates.append(row)
+
+        if not candidates:
+            return None
+        if draw is None:
+            draw = rng.random()
+        return candidates[int(draw * len(candidates))]
+
+    @timed("DraftSimulator.simulate")
+    def simulate(self, num_teams=12, rounds=8, rng=None):
+        """
+        Run one snake draft.
+
+        Parameters:
+        - num_teams: int
+        - rounds: int
+        - rng: np.random.Generator or seed passed to np.random.default_rng
+
+        Returns:
+        - Dict[int, List[Tuple[int, str, str, float]]] -> team to (pick_num, name, position, proj_points)
+        """
+        rng = np.random.default_rng(rng)
+        snake_order = generate_snake_order(num_teams, rounds)
+        team_rosters = {team: {} for team in range(1, num_teams + 1)}
+        team_picks = {team: [] for team in range(1, num_teams + 1)}
+        state = self.new_draft()
+        # One uniform draw per pick slot, taken up front (Generator calls cost more than the pick logic)
+        draws = rng.random(len(snake_order)).tolist()
+
+        for i, team in enumerate(snake_order):
+            pick_num = i + 1
+            row = self.make_pick(state, team_rosters[team], pick_num + num_teams, draw=draws[i])
+
+            if row is not None:
+                pos = self._position_list[row]
+                team_picks[team].append((pick_num, self.names[row], pos, self._proj_list[row]))
+                team_rosters[team][pos] = team_rosters[team].get(pos, 0) + 1
+                self.draft_player(state, row)
+
+        return team_picks
+
+    @timed("DraftSimulator.simulate_batch")
+    def simulate_batch(self, n_drafts, num_teams=12, rounds=8, rng=None):
+        """
+        Run `n_drafts` independent snake drafts in lock-step.
+
+        Availability is a (drafts x players) matrix and every pick slot is resolved for all drafts
+        with array operations, using the same VOR / 90%-band rule as make_pick. Draft d picks what
+        the d-th of n_drafts successive simulate calls on the same rng would.
+
+        Parameters:
+        - n_drafts: int
+        - num_teams: int
+        - rounds: int
+        - rng: np.random.Generator or seed passed to np.random.default_rng
+
+        Returns:
+        - np.ndarray[int] of shape (n_drafts, num_teams * rounds) -> row picked at each overall pick, -1 if none
+        """
+        rng = np.random.default_rng(rng)
+        snake_order = generate_snake_order(num_teams, rounds)
+        n_positions = len(self.positions)
+        drafts = np.arange(n_drafts)
+
+        # Availability is tracked per name so drafting a player removes every row sharing that name
+        available = np.ones((n_drafts, self.n_names), dtype=bool)
+        rosters = np.zeros((n_drafts, num_teams + 1, n_positions), dtype=np.int64)
+        pick_rows = np.full((n_drafts, len(snake_order)), -1, dtype=np.int64)
+
+        file_names = [self.name_codes[rows] for rows in self.rows_by_file]
+        file_rows = [np.asarray(rows, dtype=np.int64) for rows in self.rows_by_file]
+        proj_rows = [np.asarray(rows, dtype=np.int64) for rows in self.rows_by_proj]
+        proj_names = [self.name_codes[rows] for rows in proj_rows]
+        proj_points = [self.proj[rows] for rows in proj_rows]
+        proj_adp = [self.adp[rows] for rows in proj_rows]
+
+        limits = np.array([self.position_limits.get(pos, 99) for pos in self.positions])
+        is_flex = np.array([pos in FLEX_POSITIONS for pos in self.positions])
+        count("DraftSimulator.batch_picks", n_drafts * len(snake_order))
+        # Draft by draft, the same draws simulate takes: a batch equals n_drafts simulate calls on one rng
+        all_draws = rng.random((n_drafts, len(snake_order)))
+
+        for i, team in enumerate(snake_order):
+            # One span per pick slot across all drafts (make_pick has one per pick)
+            with span("DraftSimulator.batch_pick"):
+                next_pick = i + 1 + num_teams
+                roster = rosters[:, team, :]
+
+                first_row = np.full((n_drafts, n_positions), np.iinfo(np.int64).max)
+                vor = np.full((n_drafts, n_positions), np.nan)
+                for code in range(n_positions):
+                    # Order positions by their first remaining row, as pool['position'].unique() did
+                    remaining = available[:, file_names[code]]
+                    has_rows = remaining.any(axis=1)
+                    first_row[has_rows, code] = file_rows[code][remaining[has_rows].argmax(axis=1)]
+
+                    remaining = available[:, proj_names[code]]
+                    expected = _first_value(remaining, proj_points[code])
+                    replacement = _first_value(remaining & (proj_adp[code] >= next_pick), proj_points[code])
+                    vor[:, code] = expected - replacement
+
+                flex_count = roster[:, is_flex].sum(axis=1)
+                is_open = (roster == 0) | (roster < limits) | (is_flex & (flex_count < self.flex_limit)[:, None])
+                eligible = is_open & (first_row < np.iinfo(np.int64).max)
+
+                # Sequential max() over positions in pool order: replace only on strictly greater VOR
+                order = np.argsort(first_row, axis=1, kind="stable")
+                best_code = np.full(n_drafts, -1)
+                best_vor = np.full(n_drafts, np.nan)
+                for k in range(n_positions):
+                    code = order[:, k]
+                    this_vor = vor[drafts, code]
+                    take = eligible[drafts, code] & ((best_code == -1) | (this_vor > best_vor))
+                    best_code = np.where(take, code, best_code)
+                    best_vor = np.where(take, this_vor, best_vor)
+
+                if (best_code == -1).any():
+                    raise ValueError("No open position left to draft")
+
+                # Sample uniformly among players within 90% of the best remaining projection
+                draws = all_draws[:, i]
+                for code in range(n_positions):
+                    sub = np.flatnonzero(best_code == code)
+                    if not len(sub) or not len(proj_rows[code]):
+                        continue
+                    remaining = available[np.ix_(sub, proj_names[code])]
+                    has_rows = remaining.any(axis=1)
+                    best_points = proj_points[code][remaining.argmax(axis=1)]
+                    candidates = remaining & (proj_points[code] > best_points[:, None] * 0.9) & has_rows[:, None]
+                    n_candidates = candidates.sum(axis=1)
+
+                    chosen = np.floor(draws[sub] * n_candidates)
+                    picked = n_candidates > 0
+                    slot = (candidates.cumsum(axis=1) > chosen[:, None]).argmax(axis=1)
+                    rows = proj_rows[code][slot]
+
+                    sub, rows = sub[picked], rows[picked]
+                    pick_rows[sub, i] = rows
+                    rosters[sub, team, code] += 1
+                    available[sub, self.name_codes[rows]] = False
+
+        return pick_rows
+
+    def pick_sums(self, pick_rows):
+        """
+        Mergeable per-player pick statistics for a batch from simulate_batch.
+
+        Everything is an integer, so sums from separate batches merge exactly in any order
+        (see merge_pick_sums).
+
+        Returns:
+        - Dict[str, np.ndarray[int64]] -> count, pick_sum, pick_sq_sum, high (earliest pick), low (latest pick)
+        """
+        pick_numbers = np.broadcast_to(np.arange(1, pick_rows.shape[1] + 1, dtype=np.int64), pick_rows.shape)
+        drafted = pick_rows >= 0
+        rows = pick_rows[drafted]
+        picks = pick_numbers[drafted]
+
+        high = np.full(self.n_players, np.iinfo(np.int64).max)
+        low = np.zeros(self.n_players, dtype=np.int64)
+        np.minimum.at(high, rows, picks)
+        np.maximum.at(low, rows, picks)
+
+        return {
+            "count": np.bincount(rows, minlength=self.n_players).astype(np.int64),
+            "pick_sum": _int_bincount(rows, picks, self.n_players),
+            "pick_sq_sum": _int_bincount(rows, picks * picks, self.n_players),
+            "high": high,
+            "low": low,
+        }
+
+    def statistics_from_sums(self, sums):
+        """
+        Turn pick_sums (possibly merged over many batches) into per-player draft statistics.
+
+        Returns:
+        - pd.DataFrame with columns name, position, sim_adp, times_drafted, adp_std, high, low
+          for every player drafted at least once, sorted by sim_adp
+        """
+        seen = np.flatnonzero(sums["count"])
+        count = sums["count"][seen]
+        mean = sums["pick_sum"][seen] / count
+        # Sample standard deviation, NaN for players drafted only once (as pandas' std)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            variance = (sums["pick_sq_sum"][seen] - sums["pick_sum"][seen] * mean) / (count - 1)
+        adp_std = np.where(count > 1, np.sqrt(np.clip(variance, 0, None)), np.nan)
+
+        stats = pd.DataFrame({
+            "name": self.names[seen],
+            "position": [self.positions[c] for c in self.pos_codes[seen]],
+            "sim_adp": mean,
+            "times_drafted": count,
+            "adp_std": adp_std,
+            "high": sums["high"][seen],
+            "low": sums["low"][seen],
+        })
+        return stats.sort_values("sim_adp", kind="stable").reset_index(drop=True)
+
+    def pick_statistics(self, pick_rows):
+        """Per-player draft statistics (see statistics_from_sums) over a batch from simulate_batch."""
+        return self.statistics_from_sums(self.pick_sums(pick_rows))
+
+    def team_points(self, pick_rows, num_teams=12, scorer=None):
+        """
+        Total projected points per (draft, team) for a batch from simulate_batch.
+
+        With a scorer (weekly_projections.LineupScorer) a team is worth its weekly best-lineup points
+        instead of the sum of its players' season projections.
+        """
+        rounds = pick_rows.shape[1] // num_teams
+        teams = np.asarray(generate_snake_order(num_teams, rounds)) - 1
+        if scorer is not None:
+            # Rosters as (draft, team, round) store rows
+            store_rows = self._store_rows(scorer.store)
+            rosters = pick_rows[:, np.argsort(teams, kind="stable")]
+            rosters = np.where(rosters >= 0, store_rows[np.maximum(rosters, 0)], -1)
+            return scorer.score(rosters.reshape(-1, rounds)).reshape(len(pick_rows), num_teams)
+        points = np.where(pick_rows >= 0, np.nan_to_num(self.proj)[np.maximum(pick_rows, 0)], 0.0)
+        totals = np.zeros((pick_rows.shape[0], num_teams))
+        for i, team in enumerate(teams):
+            totals[:, team] += points[:, i]
+        return totals
+
+
+def merge_pick_sums(a, b):
+    """Combine two pick_sums results over the same player table."""
+    return {
+        "count": a["count"] + b["count"],
+        "pick_sum": a["pick_sum"] + b["pick_sum"],
+        "pick_sq_sum": a["pick_sq_sum"] + b["pick_sq_sum"],
+        "high": np.minimum(a["high"], b["high"]),
+        "low": np.maximum(a["low"], b["low"]),
+    }
+
+
+def _int_bincount(rows, weights, n):
+    total = np.zeros(n, dtype=np.int64)
+    np.add.at(total, rows, weights)
+    return total
+
+
+def _first_value(mask, values):
+    """values[first True column] per row of mask, NaN for rows without any True."""
+    has_any = mask.any(axis=1)
+    return np.where(has_any, values[mask.argmax(axis=1)] if len(values) else np.nan, np.nan)
+
+
+class _DraftState:
+    __slots__ = ("drafted", "file_cursors", "proj_cursors", "replacement_cursors", "replacement_pick")
+
+    def __init__(self, n_players, n_positions):
+        self.drafted = bytearray(n_players)
+        self.file_cursors = [0] * n_positions
+        self.proj_cursors = [0] * n_positions
+        # Per position: first row (in projection order) that may still be a replacement at replacement_pick
+        self.replacement_cursors = [0] * n_positions
+        self.replacement_pick = 0
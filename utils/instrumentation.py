@@ -0,0 +1,238 @@
+import atexit
+import functools
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from contextlib import nullcontext
+
+import pandas as pd
+
+# DRAFT_TRACE=1 prints the summary at exit; DRAFT_TRACE=<path> also writes the events there
+# (Chrome trace JSON, or JSON lines when the path ends in .jsonl)
+TRACE_ENV = "DRAFT_TRACE"
+MAX_EVENTS = 1_000_000
+
+_recorder = None
+_null_span = nullcontext()
+
+
+class Recorder:
+    def __init__(self, path=None, max_events=MAX_EVENTS):
+        """
+        Collected spans, counters and recorded values of one process.
+
+        Every span is aggregated into per-name stats; the first `max_events` spans and recorded
+        values are also kept as trace events (Chrome trace format: ph "X" spans, ph "C" values).
+
+        Parameters:
+        - path: str or Path -> trace file written by write() (None keeps the summary only)
+        - max_events: int -> trace events kept in memory, later ones only count towards the stats
+        """
+        self.path = path
+        self.max_events = max_events
+        self.events = []
+        self.stats = {}  # name -> [calls, total s, max s]
+        self.counters = {}
+        self.dropped = 0
+        self.start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def _ts(self, t):
+        return (t - self.start) * 1e6
+
+    def _event(self, event):
+        if len(self.events) < self.max_events:
+            self.events.append(event)
+        else:
+            self.dropped += 1
+
+    def add_span(self, name, start, end, args=None):
+        with self._lock:
+            stat = self.stats.setdefault(name, [0, 0.0, 0.0])
+            stat[0] += 1
+            stat[1] += end - start
+            stat[2] = max(stat[2], end - start)
+            self._event({"name": name, "ph": "X", "ts": self._ts(start), "dur": (end - start) * 1e6,
+                         "pid": os.getpid(), "tid": threading.get_ident(), "args": args or {}})
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def record(self, name, values):
+        with self._lock:
+            self._event({"name": name, "ph": "C", "ts": self._ts(time.perf_counter()), "pid": os.getpid(),
+                         "tid": threading.get_ident(), "args": values})
+
+    def snapshot(self, reset=False) -> dict:
+        """Picklable copy of everything collected, e.g. to hand back from a worker process."""
+        with self._lock:
+            snap = {"events": list(self.events), "stats": {k: list(v) for k, v in self.stats.items()},
+                    "counters": dict(self.counters), "dropped": self.dropped, "start": self.start}
+            if reset:
+                self.events, self.stats, self.counters, self.dropped = [], {}, {}, 0
+        return snap
+
+    def merge(self, snap):
+        """Add a snapshot from another process; its events are shifted onto this recorder's clock."""
+        # perf_counter is the same monotonic clock across processes on one machine
+        shift = (snap["start"] - self.start) * 1e6
+        with self._lock:
+            for name, (calls, total, longest) in snap["stats"].items():
+                stat = self.stats.setdefault(name, [0, 0.0, 0.0])
+                stat[0] += calls
+                stat[1] += total
+                stat[2] = max(stat[2], longest)
+            for name, n in snap["counters"].items():
+                self.counters[name] = self.counters.get(name, 0) + n
+            self.dropped += snap["dropped"]
+            for event in snap["events"]:
+                self._event({**event, "ts": event["ts"] + shift})
+
+    def summary(self) -> pd.DataFrame:
+        """Per span name: calls, total / mean / max time, sorted by total time."""
+        rows = [{"name": name, "calls": calls, "total_s": total, "mean_ms": total / calls * 1e3,
+                 "max_ms": longest * 1e3} for name, (calls, total, longest) in self.stats.items()]
+        df = pd.DataFrame(rows, columns=["name", "calls", "total_s", "mean_ms", "max_ms"])
+        return df.sort_values("total_s", ascending=False, ignore_index=True)
+
+    def write(self, path=None):
+        path = path or self.path
+        if path is None:
+            return
+        events = self.events
+        if self.counters:
+            events = events + [{"name": "counters", "ph": "C", "ts": self._ts(time.perf_counter()),
+                                "pid": os.getpid(), "tid": threading.get_ident(), "args": self.counters}]
+        with open(path, "w") as f:
+            if str(path).endswith(".jsonl"):
+                for event in events:
+                    f.write(json.dumps(event) + "\n")
+            else:
+                json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+class _Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        # The recorder may have been switched off inside the span
+        if _recorder is not None:
+            _recorder.add_span(self.name, self.start, time.perf_counter(), self.args)
+
+
+def enabled() -> bool:
+    return _recorder is not None
+
+
+def enable(path=None, max_events=MAX_EVENTS) -> Recorder:
+    """Start recording in this process (replacing any current recorder)."""
+    global _recorder
+    _recorder = Recorder(path, max_events)
+    return _recorder
+
+
+def disable():
+    """Stop recording; returns the recorder that was active (or None)."""
+    global _recorder
+    recorder, _recorder = _recorder, None
+    return recorder
+
+
+def span(name, **args):
+    """
+    Context manager timing a block. When recording is off this returns a shared no-op context,
+    so a disabled span costs one global lookup.
+    """
+    if _recorder is None:
+        return _null_span
+    return _Span(name, args)
+
+
+def timed(name=None):
+    """Decorator: run every call of the function inside span(name), default the function's qualname."""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _recorder is None:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if _recorder is not None:
+                    _recorder.add_span(span_name, start, time.perf_counter())
+        return wrapper
+    return decorator
+
+
+def count(name, n=1):
+    """Add `n` to a named counter (reported in the summary and at the end of the trace)."""
+    if _recorder is not None:
+        _recorder.count(name, n)
+
+
+def record(name, **values):
+    """Record numeric values at this point in time, e.g. per-iteration convergence (a trace counter)."""
+    if _recorder is not None:
+        _recorder.record(name, values)
+
+
+def snapshot(reset=False):
+    """Recorder.snapshot() of the current recording, None when recording is off."""
+    return _recorder.snapshot(reset) if _recorder is not None else None
+
+
+def merge(snapshot):
+    """Fold a Recorder.snapshot() from another process into the current recording (if any)."""
+    if _recorder is not None:
+        _recorder.merge(snapshot)
+
+
+def format_summary(recorder: Recorder) -> str:
+    lines = [f"[trace] {time.perf_counter() - recorder.start:.2f}s wall"]
+    summary = recorder.summary()
+    if len(summary):
+        lines.append(summary.to_string(index=False, float_format=lambda x: f"{x:.3f}"))
+    for name, n in sorted(recorder.counters.items()):
+        lines.append(f"{name:40s}{n:>12,}")
+    if recorder.dropped:
+        lines.append(f"[trace] {recorder.dropped:,} events beyond max_events kept in the stats only")
+    return "\n".join(lines)
+
+
+def finish(file=None):
+    """Write the trace file (if any) and print the summary table; recording stops."""
+    recorder = disable()
+    if recorder is None:
+        return None
+    recorder.write()
+    print(format_summary(recorder), file=file or sys.stderr)
+    if recorder.path is not None:
+        print(f"[trace] events written to {recorder.path}", file=file or sys.stderr)
+    return recorder
+
+
+def _enable_from_env():
+    value = os.environ.get(TRACE_ENV, "")
+    # Worker processes (spawned ones import this afresh) hand their spans to the parent, which owns
+    # the trace file; recording there on their own would overwrite it at exit
+    if value and value != "0" and multiprocessing.parent_process() is None:
+        enable(None if value == "1" else value)
+        atexit.register(finish)
+
+
+_enable_from_env()
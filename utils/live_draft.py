@@ -0,0 +1,255 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.availability_index import AvailabilityIndex
+from utils.draft_pool_calcs import compute_proj_by_position
+from utils.draft_simulator import generate_snake_order
+from utils.mip_draft_model import DraftOptimizer
+from utils.player_pool import find_column
+
+
+class LiveDraft:
+    def __init__(self, player_df: pd.DataFrame, draft_slot, position_constraints, positions, flex_limit=1,
+                 num_teams=12, rounds=None, pick_order=None, name_col=None, position_col=None,
+                 solver_name="dp", recommend=True):
+        """
+        Draft-assistant session that follows a live draft pick by pick.
+
+        Every pick event removes the player from the availability index, refreshes the projection
+        matrix entries of that player's position only, and re-solves the remaining rounds from our
+        current roster. Players we take beyond what the roster rules allow (a second QB with one QB
+        slot, say) go to the bench: they use up the pick but no roster slot.
+
+        Parameters:
+        - player_df: pd.DataFrame with columns [name_col, position_col, 'ADP', 'proj_points']
+        - draft_slot: int -> our team number (1-indexed)
+        - position_constraints: List[Dict] -> as for DraftOptimizer
+        - positions: List[str] -> positions considered in the draft
+        - flex_limit: int -> number of FLEX slots
+        - num_teams: int -> teams in the league
+        - rounds: int -> rounds we plan for (defaults to one per starter slot, as calc_draft_playbook_mip)
+        - pick_order: List[int] -> team on the clock for each overall pick (defaults to a snake draft)
+        - name_col: str -> name of the player name column (found by player_pool.find_column if omitted)
+        - position_col: str -> name of the position column (likewise)
+        - solver_name: str -> DraftOptimizer backend ("dp" keeps each event well under a millisecond of solve time)
+        - recommend: bool -> solve for the first recommendation right away (False leaves it to the
+          caller, via plan_request / finish_recommendation)
+        """
+        if rounds is None:
+            rounds = flex_limit + sum(con["limit"] for con in position_constraints)
+        self.player_df = player_df.reset_index(drop=True)
+        self.draft_slot = draft_slot
+        self.position_constraints = position_constraints
+        self.positions = positions
+        self.flex_limit = flex_limit
+        self.pick_order = pick_order or generate_snake_order(num_teams, rounds)
+        self.name_col = find_column(self.player_df, "name", name_col)
+        self.position_col = find_column(self.player_df, "position", position_col)
+        self.solver_name = solver_name
+
+        self.index = AvailabilityIndex(self.player_df, position_col=self.position_col)
+        self.available = np.ones(len(self.player_df), dtype=bool)
+        self._rows_by_name = self.player_df.groupby(self.name_col, sort=False).indices
+        self._proj_points = self.player_df["proj_points"].to_numpy(dtype=float)
+        self._position_of = self.player_df[self.position_col].to_numpy()
+
+        self.current_pick = 1
+        self.roster = {p: 0 for p in positions}
+        self.bench = []
+        self.our_picks = [i + 1 for i, team in enumerate(self.pick_order) if team == draft_slot]
+        self.proj_matrix = compute_proj_by_position(self.player_df, self.our_picks, positions, index=self.index)
+        self.history = []
+        self.last_event_seconds = None
+        self._recommendation = None
+        if recommend:
+            self.refresh()
+
+    @property
+    def remaining_picks(self):
+        return [pick for pick in self.our_picks if pick >= self.current_pick]
+
+    def record_pick(self, player_name, team=None):
+        """
+        Apply a pick event and return the updated recommendation for our next pick.
+
+        Parameters:
+        - player_name: str -> player taken
+        - team: int -> team that made the pick (defaults to the team on the clock)
+
+        Returns:
+        - Dict -> see recommendation()
+        """
+        start = time.perf_counter()
+        self.apply_pick(player_name, team)
+        self.refresh()
+        self.last_event_seconds = time.perf_counter() - start
+        return self._recommendation
+
+    def apply_pick(self, player_name, team=None):
+        """
+        Update the board, our roster and the projection matrix for a pick, without re-solving
+        (record_pick does both; a service can run the solve elsewhere, see plan_request).
+        """
+        if player_name not in self._rows_by_name:
+            raise KeyError(f"Unknown player: {player_name}")
+        if team is None:
+            team = self.pick_order[self.current_pick - 1] if self.current_pick <= len(self.pick_order) else None
+
+        rows = self._rows_by_name[player_name]
+        rows = rows[self.available[rows]]
+        if not len(rows):
+            raise ValueError(f"{player_name} has already been drafted")
+        self.available[rows] = False
+        touched = self.index.remove(rows)
+
+        position = self._position_of[rows[0]]
+        if team == self.draft_slot and position in self.roster:
+            if self._fits(position):
+                self.roster[position] += 1
+            else:
+                self.bench.append(player_name)
+        self.history.append((self.current_pick, team, player_name, position))
+        self.current_pick += 1
+
+        # Only the removed player's position can change in the projection matrix
+        remaining = self.remaining_picks
+        if touched and remaining:
+            refreshed = compute_proj_by_position(self.player_df, remaining, [p for p in touched if p in self.positions],
+                                                 index=self.index)
+            self.proj_matrix.update(refreshed)
+
+    def _fits(self, position):
+        """Whether one more player at `position` still fits the roster rules (group limits plus FLEX)."""
+        flex_used = 0
+        for con in self.position_constraints:
+            drafted = sum(self.roster.get(p, 0) for p in con["positions_against_limit"])
+            drafted += position in con["positions_against_limit"]
+            if drafted > con["limit"]:
+                if not con["flex"]:
+                    return False
+                flex_used += drafted - con["limit"]
+        return flex_used <= self.flex_limit
+
+    def _best_now(self, position):
+        """Best player still on the board at `position`, ignoring ADP (it is there to be taken)."""
+        row = self.index.best_available_row(position, [-np.inf])[0]
+        if row < 0:
+            return None, 0.0
+        return self.player_df.at[row, self.name_col], float(self._proj_points[row])
+
+    def plan_request(self):
+        """
+        Everything the optimizer needs for the current board, as plain picklable data (see solve_plan),
+        or None once all our rounds are used.
+        """
+        remaining = self.remaining_picks
+        if not remaining:
+            return None
+
+        # If we are on the clock, value our pick by who is actually left rather than by ADP
+        proj_matrix = self.proj_matrix
+        on_the_clock = remaining[0] == self.current_pick
+        if on_the_clock:
+            proj_matrix = dict(proj_matrix)
+            for p in self.positions:
+                proj_matrix[(remaining[0], p)] = self._best_now(p)[1]
+
+        return {
+            "picks": remaining,
+            "current_roster": dict(self.roster),
+            "position_constraints": self.position_constraints,
+            "positions": self.positions,
+            "proj_matrix": proj_matrix,
+            "flex_limit": self.flex_limit,
+            "solver_name": self.solver_name,
+            "on_the_clock": on_the_clock,
+        }
+
+    def finish_recommendation(self, request, plan):
+        """Turn the solve_plan result for `request` into the current recommendation."""
+        if request is None:
+            self._recommendation = None
+            return None
+        position = plan["position"].iloc[0]
+        player, proj_points = self._best_now(position)
+        self._recommendation = {
+            "pick_number": request["picks"][0],
+            "on_the_clock": request["on_the_clock"],
+            "position": position,
+            "player": player,
+            "proj_points": proj_points,
+            "plan": plan,
+        }
+        return self._recommendation
+
+    def fail_recommendation(self, request, error):
+        """Recommendation for a board the optimizer found no plan for (`error` is the solver's message)."""
+        self._recommendation = {
+            "pick_number": request["picks"][0],
+            "on_the_clock": request["on_the_clock"],
+            "position": None,
+            "player": None,
+            "proj_points": 0.0,
+            "plan": None,
+            "error": str(error),
+        }
+        return self._recommendation
+
+    def refresh(self):
+        """Re-solve in this process for the current board; returns the new recommendation."""
+        request = self.plan_request()
+        if request is None:
+            return self.finish_recommendation(None, None)
+        try:
+            plan = solve_plan(request)
+        except RuntimeError as e:
+            return self.fail_recommendation(request, e)
+        return self.finish_recommendation(request, plan)
+
+    def recommendation(self):
+        """
+        Current recommendation for our next pick.
+
+        Returns:
+        - Dict with pick_number, on_the_clock, position, player, proj_points and the full remaining
+          plan (DraftOptimizer.get_solu), or None once all our rounds are used; if no plan completes
+          the roster, position, player and plan are None and "error" says why
+        """
+        return self._recommendation
+
+
+def solve_plan(request):
+    """
+    Solve a LiveDraft.plan_request with DraftOptimizer and return the plan (DraftOptimizer.get_solu).
+    Module-level so it can run in a worker process.
+    """
+    optimizer = DraftOptimizer(picks=request["picks"],
+                               current_roster=request["current_roster"],
+                               position_constraints=request["position_constraints"],
+                               positions=request["positions"],
+                               proj_matrix=request["proj_matrix"],
+                               flex_limit=request["flex_limit"])
+    if request["solver_name"] != "dp":
+        optimizer.build()
+    optimizer.solve(solver_name=request["solver_name"])
+    return optimizer.get_solu()
+
+
+def plan_work(request):
+    """
+    Size of a LiveDraft.plan_request for the "dp" solver: picks x DP states x positions, the number
+    of transitions the dynamic program evaluates (its time grows linearly with it). inf for other
+    solvers, which build and run a MIP.
+    """
+    if request["solver_name"] != "dp":
+        return float("inf")
+    optimizer = DraftOptimizer(picks=request["picks"],
+                               current_roster=request["current_roster"],
+                               position_constraints=request["position_constraints"],
+                               positions=request["positions"],
+                               proj_matrix={},
+                               flex_limit=request["flex_limit"])
+    caps = optimizer.state_layout()[3]
+    return len(request["picks"]) * int(np.prod(caps + 1)) * len(request["positions"])
@@ -1,9 +1,20 @@
+from collections import defaultdict
+
+import numpy as np
 import pandas as pd
-from pyomo.environ import *
+from utils.availability_index import AvailabilityIndex
+from utils.instrumentation import count, span, timed
+from utils.player_pool import PlayerPool
+
+try:
+    from pyomo.environ import *
+except ImportError:  # Pyomo is only needed for the MIP backends, not for solver_name="dp"
+    ConcreteModel = None
 
 
 class DraftOptimizer:
-    def __init__(self, picks, current_roster, position_constraints, positions, proj_matrix, flex_limit=1):
+    def __init__(self, picks, current_roster, position_constraints, positions, proj_matrix, flex_limit=1,
+                 scorer=None, player_rows=None, roster_rows=None):
         """
         Initialize the optimizer with draft data.
 
@@ -14,6 +25,10 @@ class DraftOptimizer:
         - proj_matrix: Dict[(int, str), float] -> Mapping from (pick_number, position) to projected points
         - positions: List[str] -> Positions considered in the draft (excluding FLEX)
         - flex_limit: int -> Number of FLEX slots available
+        - scorer: weekly_projections.LineupScorer -> value function for solver_name="lineup"
+        - player_rows: Dict[(int, str), List[int]] -> store rows of the players expected at each
+          (pick_number, position), best first (weekly_projections.expected_rows; solver_name="lineup" only)
+        - roster_rows: List[int] -> store rows of the players already drafted (solver_name="lineup" only)
         """
         self.picks = picks
         self.current_roster = current_roster or {}
@@ -21,9 +36,34 @@ class DraftOptimizer:
         self.positions = positions
         self.proj_matrix = proj_matrix
         self.flex_limit = flex_limit
+        self.scorer = scorer
+        self.player_rows = player_rows
+        self.roster_rows = list(roster_rows or [])
         self.model = None
+        self.solution = None
+        self.solution_rows = None
+        self.objective_value = None
+        self._solver = None
+        self._solver_name = None
+        self._objective_stale = False
+        self._roster_stale = False
+        self._mip_solved = False
+        self._dp_transitions = None
+
+    def _roster_positions(self):
+        positions = list(self.positions)
+        for con in self.position_constraints:
+            positions += [p for p in con["positions_against_limit"] if p not in positions]
+        return positions
 
+    @timed("DraftOptimizer.build")
     def build(self):
+        """
+        Build the Pyomo model once. Projections and the current roster are mutable Params,
+        so update() can move the model to a new draft slot or roster without rebuilding it.
+        """
+        if ConcreteModel is None:
+            raise ImportError("Pyomo is required to build the MIP model; use solve(solver_name='dp') without it.")
         model = ConcreteModel(name="Fantasy_Draft_Optimizer")
 
         rounds = list(range(len(self.picks)))
@@ -31,20 +71,27 @@ class DraftOptimizer:
         model.rounds = Set(initialize=rounds)
         model.constraint_indices = RangeSet(0, len(self.position_constraints) - 1)
 
+        model.roster_positions = Set(initialize=self._roster_positions())
+
+        model.proj = Param(model.rounds, model.positions, mutable=True,
+                           initialize=lambda m, i, p: self.proj_matrix.get((self.picks[i], p), 0.0))
+        model.current = Param(model.roster_positions, mutable=True,
+                              initialize=lambda m, p: self.current_roster.get(p, 0))
+
         model.x = Var(model.rounds, model.positions, domain=Binary)
         model.flex = Var(model.constraint_indices, domain=NonNegativeIntegers)
 
         # Objective: maximize total projected points
         def total_projected_points(m):
             return sum(
-                m.x[i, p] * self.proj_matrix.get((self.picks[i], p), 0.0)
+                m.x[i, p] * m.proj[i, p]
                 for i in m.rounds for p in m.positions
             )
         model.total_points = Objective(rule=total_projected_points, sense=maximize)
 
         # One position per pick
         def one_position_per_pick(m, i):
-            return sum(m.x[i, p] for p in m.positions) == 1 # ensure only 1 selection is made I AM MAKING CHANGES
+            return sum(m.x[i, p] for p in m.positions) == 1
         model.pick_one_position = Constraint(model.rounds, rule=one_position_per_pick)
 
         # Constraint for each group (e.g. QB, WR, WR+RB+TE etc.)
@@ -53,7 +100,7 @@ class DraftOptimizer:
             pos_list = constraint["positions_against_limit"]
             limit = constraint["limit"]
             drafted = sum(m.x[i, p] for i in m.rounds for p in pos_list)
-            current = sum(self.current_roster.get(p, 0) for p in pos_list)
+            current = sum(m.current[p] for p in pos_list)
             return drafted + current <= limit + m.flex[j]
         model.constraint_groups = Constraint(model.constraint_indices, rule=constraint_by_group)
 
@@ -70,31 +117,664 @@ class DraftOptimizer:
         model.flex_total_limit = Constraint(rule=flex_cap)
 
         self.model = model
+        self._solver = None
+
+    def update(self, picks=None, proj_matrix=None, current_roster=None, player_rows=None, roster_rows=None):
+        """
+        Point the optimizer at a new draft slot and/or roster without rebuilding the model.
+
+        Parameters:
+        - picks: List[int] -> new overall pick numbers (same number of rounds as at build time)
+        - proj_matrix: Dict[(int, str), float] -> new projection matrix
+        - current_roster: Dict[str, int] -> new counts of already-drafted players by position
+        - player_rows / roster_rows: as in __init__ (solver_name="lineup" only)
+        """
+        if picks is not None:
+            if self.model is not None and len(picks) != len(self.picks):
+                raise ValueError("update() cannot change the number of rounds; build a new optimizer.")
+            self.picks = picks
+        if proj_matrix is not None:
+            self.proj_matrix = proj_matrix
+        if current_roster is not None:
+            self.current_roster = current_roster
+        if player_rows is not None:
+            self.player_rows = player_rows
+        if roster_rows is not None:
+            self.roster_rows = list(roster_rows)
+
+        if self.model is None:
+            return
+        if picks is not None or proj_matrix is not None:
+            for i, pick in enumerate(self.picks):
+                for p in self.positions:
+                    self.model.proj[i, p] = self.proj_matrix.get((pick, p), 0.0)
+            self._objective_stale = True
+        if current_roster is not None:
+            for p in self.model.roster_positions:
+                self.model.current[p] = self.current_roster.get(p, 0)
+            self._roster_stale = True
+
+    @timed("DraftOptimizer.solve")
+    def solve(self, solver_name="gurobi", tee=False, warmstart=True, **solver_args):
+        """
+        Solve the draft problem.
 
-    def solve(self, solver_name="gurobi", **solver_args):
+        solver_name="dp" uses the built-in exact dynamic program (no build() or Pyomo needed);
+        solver_name="lineup" values plans with the weekly lineup scorer instead of proj_matrix (see
+        _solve_lineup; solver_args: beam_width); any other name is passed to Pyomo's SolverFactory
+        and requires build() first.
+
+        The solver instance is kept between calls. Persistent interfaces (e.g. "gurobi_persistent")
+        load the model once and only receive the objective / group constraints that update()
+        changed. Other solvers get the previous solution as a warm start when they support it.
+        """
+        self.solution = None
+        self.solution_rows = None
+        if solver_name == "dp":
+            self._solve_dp()
+            return
+        if solver_name == "lineup":
+            self._solve_lineup(**solver_args)
+            return
         if self.model is None:
             raise RuntimeError("Model not built. Call `.build()` first.")
-        solver = SolverFactory(solver_name)
-        self.results = solver.solve(self.model, tee=True, **solver_args)
 
-    def get_solu(self):
+        if self._solver is None or self._solver_name != solver_name:
+            self._solver = SolverFactory(solver_name)
+            self._solver_name = solver_name
+            if hasattr(self._solver, "set_instance"):
+                self._solver.set_instance(self.model)
+            self._objective_stale = self._roster_stale = False
+
+        if hasattr(self._solver, "set_instance"):
+            if self._objective_stale:
+                self._solver.set_objective(self.model.total_points)
+            if self._roster_stale:
+                for j in self.model.constraint_indices:
+                    self._solver.remove_constraint(self.model.constraint_groups[j])
+                    self._solver.add_constraint(self.model.constraint_groups[j])
+            with span("DraftOptimizer.solver", solver=solver_name):
+                self.results = self._solver.solve(tee=tee, **solver_args)
+        else:
+            has_solution = next(iter(self.model.x.values())).value is not None
+            if warmstart and has_solution and self._solver.warm_start_capable():
+                solver_args["warmstart"] = True
+            with span("DraftOptimizer.solver", solver=solver_name):
+                self.results = self._solver.solve(self.model, tee=tee, **solver_args)
+
+        self._objective_stale = self._roster_stale = False
+        self._mip_solved = check_optimal_termination(self.results)
+        self.objective_value = value(self.model.total_points) if self._mip_solved else None
+
+    def state_layout(self):
+        """
+        How DP states are numbered: a state is the drafted count per constraint group, each capped at
+        the most that group can ever hold (its limit minus the current roster, plus flex_limit for
+        flex groups), in mixed radix: state = sum(count * stride).
+
+        Returns:
+        - Tuple of np.ndarray per constraint group: (limits, flexible, current, caps, strides)
+        """
+        limits = np.array([con["limit"] for con in self.position_constraints], dtype=np.int64)
+        flexible = np.array([con.get("flex", False) for con in self.position_constraints], dtype=bool)
+        current = np.array([
+            sum(self.current_roster.get(p, 0) for p in con["positions_against_limit"])
+            for con in self.position_constraints
+        ], dtype=np.int64)
+
+        caps = np.clip(limits - current + np.where(flexible, self.flex_limit, 0), 0, len(self.picks))
+        strides = np.concatenate(([1], np.cumprod(caps + 1)[:-1])).astype(np.int64)
+        return limits, flexible, current, caps, strides
+
+    def _state_space(self):
+        """
+        Enumerate the DP states: drafted count per constraint group, each capped at the most that
+        group can ever hold (its limit minus the current roster, plus flex_limit for flex groups).
+
+        Returns:
+        - Tuple of (counts, feasible, next_state):
+          counts: (n_states, n_groups) array of drafted counts per group, state 0 = nothing drafted
+          feasible: (n_states,) bool -> counts fit the roster rules, mirroring the MIP constraints
+          next_state: (n_positions, n_states) int -> state after drafting each position, -1 if infeasible
+        """
+        limits, flexible, current, caps, strides = self.state_layout()
+        radices = caps + 1
+        n_states = int(np.prod(radices))
+        counts = (np.arange(n_states)[:, None] // strides) % radices
+
+        excess = counts + current - limits
+        feasible = ~(~flexible & (excess > 0)).any(axis=1)
+        feasible &= np.where(flexible, np.clip(excess, 0, None), 0).sum(axis=1) <= self.flex_limit
+
+        next_state = np.empty((len(self.positions), n_states), dtype=np.int64)
+        for k, p in enumerate(self.positions):
+            member = np.array([p in con["positions_against_limit"] for con in self.position_constraints], dtype=bool)
+            fits = (counts[:, member] < caps[member]).all(axis=1)
+            target = np.arange(n_states) + strides[member].sum()
+            target = np.where(fits, target, 0)
+            next_state[k] = np.where(fits & feasible[target], target, -1)
+
+        return counts, feasible, next_state
+
+    def _transitions(self):
+        """
+        DP transitions, cached: they only depend on the roster rules, the roster and the number of
+        picks, so repeated solves (new slots or projections) reuse them. The rules are part of the
+        cache key, so changing position_constraints / positions / flex_limit in place is picked up.
+
+        Returns:
+        - Tuple of (next_state, from_position, from_state, to_state, previous_state): next_state as from
+          _state_space, every feasible (position, state) -> state transition, and the reverse map
+        """
+        rules = tuple((tuple(con["positions_against_limit"]), con["limit"], con.get("flex", False))
+                      for con in self.position_constraints)
+        key = (rules, tuple(self.positions), self.flex_limit, tuple(sorted(self.current_roster.items())),
+               len(self.picks))
+        if self._dp_transitions is None or self._dp_transitions[0] != key:
+            _, feasible, next_state = self._state_space()
+            if not feasible[0]:
+                raise RuntimeError("Draft problem is infeasible for the current roster.")
+            n_positions, n_states = next_state.shape
+            from_position, from_state = np.nonzero(next_state >= 0)
+            to_state = next_state[from_position, from_state]
+            previous_state = np.full((n_positions, n_states), -1, dtype=np.int64)
+            previous_state[from_position, to_state] = from_state
+            self._dp_transitions = (key, next_state, from_position, from_state, to_state, previous_state)
+        return self._dp_transitions[1:]
+
+    def _solve_dp(self):
+        """
+        Exact dynamic program over (round, drafted count per constraint group) states.
+
+        Feasibility only gets harder as counts grow, so a state that breaks the roster rules
+        is never extended. Ties keep the earlier position in self.positions.
+        """
+        _, from_position, from_state, to_state, previous_state = self._transitions()
+        n_positions, n_states = previous_state.shape
+
+        proj_by_round = np.array([[self.proj_matrix.get((pick, p), 0.0) for p in self.positions] for pick in self.picks])
+        points = np.full(n_states, -np.inf)
+        points[0] = 0.0
+        choices = []
+
+        for proj in proj_by_round:
+            candidate = np.full((n_positions, n_states), -np.inf)
+            candidate[from_position, to_state] = points[from_state] + proj[from_position]
+            # argmax returns the first maximum, i.e. the earliest position on ties
+            choice = np.argmax(candidate, axis=0)
+            points = candidate[choice, np.arange(n_states)]
+            if not np.isfinite(points).any():
+                raise RuntimeError("Draft problem is infeasible: not enough roster room for all picks.")
+            choices.append(choice)
+
+        state = int(np.argmax(points))
+        self.objective_value = float(points[state])
+
+        solution = []
+        for choice in reversed(choices):
+            k = int(choice[state])
+            solution.append(self.positions[k])
+            state = int(previous_state[k, state])
+        self.solution = solution[::-1]
+
+    @timed("DraftOptimizer.solve_policy")
+    def solve_policy(self):
+        """
+        Best position for every round and every reachable roster state, by backward induction over
+        the _solve_dp states: value[i][s] = max over feasible positions p of proj(pick i, p) +
+        value[i + 1][next state]. Along the plan _solve_dp picks from state 0 the policy follows that
+        plan, so ties resolve as there (the plan is also left in self.solution); in other states
+        ties keep the earlier position in self.positions.
+
+        Returns:
+        - Tuple of (policy, values): policy np.ndarray[int8] (rounds, n_states) -> index into
+          self.positions, -1 for states that cannot occur at that round or cannot be completed;
+          values np.ndarray (n_states,) -> best points from each state at round 0
+        """
+        next_state = self._transitions()[0]
+        n_positions, n_states = next_state.shape
+        proj_by_round = np.array([[self.proj_matrix.get((pick, p), 0.0) for p in self.positions] for pick in self.picks])
+        proj_by_round = proj_by_round.reshape(len(self.picks), n_positions)
+
+        # States we can be in at the start of each round
+        reachable = np.zeros((len(self.picks), n_states), dtype=bool)
+        reachable[0, 0] = True
+        for i in range(1, len(self.picks)):
+            targets = next_state[:, reachable[i - 1]]
+            reachable[i, targets[targets >= 0]] = True
+
+        policy = np.full((len(self.picks), n_states), -1, dtype=np.int8)
+        values = np.zeros(n_states)
+        feasible = next_state >= 0
+        for i in reversed(range(len(self.picks))):
+            candidate = np.where(feasible, proj_by_round[i][:, None] + values[np.where(feasible, next_state, 0)], -np.inf)
+            # argmax returns the first maximum, i.e. the earliest position on ties
+            choice = np.argmax(candidate, axis=0)
+            values = candidate[choice, np.arange(n_states)]
+            policy[i] = np.where(reachable[i] & np.isfinite(values), choice, -1)
+        if not np.isfinite(values[0]):
+            raise RuntimeError("Draft problem is infeasible: not enough roster room for all picks.")
+
+        # The forward DP breaks ties from the last round back; its plan is optimal from every state on it
+        self._solve_dp()
+        state = 0
+        for i, position in enumerate(self.solution):
+            k = self.positions.index(position)
+            policy[i, state] = k
+            state = next_state[k, state]
+        return policy, values
+
+    @timed("DraftOptimizer.solve_lineup")
+    def _solve_lineup(self, beam_width=512):
+        """
+        Beam search over draft plans valued by weekly best lineups (self.scorer).
+
+        A plan's roster is the already-drafted players plus, for each of its (pick, position) slots,
+        the best player expected there (self.player_rows, best first) who is not on the roster yet:
+        back-to-back picks at one position get the best and second-best player, never the same one
+        twice. Lineup value is not a sum over picks, so the exact DP does not apply: round by round
+        every kept plan is extended with every position the DP transitions allow, all extensions are
+        scored in one vectorized call, and the `beam_width` best (distinct by state and roster) are
+        kept. Ties keep the earlier plan and position. The planned store rows end up in solution_rows.
+        """
+        if self.scorer is None or self.player_rows is None:
+            raise ValueError('solver_name="lineup" needs a scorer and player_rows.')
+        next_state = self._transitions()[0]
+        options = [[np.atleast_1d(np.asarray(self.player_rows.get((pick, p), -1), dtype=np.int64))
+                    for p in self.positions] for pick in self.picks]
+        depth = max((len(rows) for by_pos in options for rows in by_pos), default=1)
+        # (rounds, positions, depth) candidate rows, best first, padded with -1
+        candidates = np.full((len(self.picks), len(self.positions), depth), -1, dtype=np.int64)
+        for i, by_pos in enumerate(options):
+            for k, rows in enumerate(by_pos):
+                candidates[i, k, :len(rows)] = rows
+        drafted = np.asarray(self.roster_rows, dtype=np.int64)
+
+        states = np.zeros(1, dtype=np.int64)
+        plans = np.zeros((1, 0), dtype=np.int64)
+        rosters = np.zeros((1, 0), dtype=np.int64)
+        values = self.scorer.score(drafted[None, :]) if len(drafted) else np.zeros(1)
+        for i in range(len(self.picks)):
+            # Extensions in (plan, position) order, so stable sorting keeps the earlier one on ties
+            plan_idx, pos_idx = np.nonzero(next_state[:, states].T >= 0)
+            if not len(plan_idx):
+                raise RuntimeError("Draft problem is infeasible: not enough roster room for all picks.")
+            # Best candidate not already on the plan's roster (or drafted), -1 if none is left
+            option = candidates[i, pos_idx]
+            taken = (option[:, :, None] == np.concatenate([rosters[plan_idx],
+                                                            np.broadcast_to(drafted, (len(plan_idx), len(drafted)))],
+                                                           axis=1)[:, None, :]).any(axis=2)
+            free = (option >= 0) & ~taken
+            new_rows = np.where(free.any(axis=1), option[np.arange(len(option)), free.argmax(axis=1)], -1)
+
+            plans = np.column_stack([plans[plan_idx], pos_idx])
+            states = next_state[pos_idx, states[plan_idx]]
+            rosters = np.column_stack([rosters[plan_idx], new_rows])
+            _, distinct = np.unique(np.column_stack([states, np.sort(rosters, axis=1)]), axis=0, return_index=True)
+            distinct.sort()
+            plans, states, rosters = plans[distinct], states[distinct], rosters[distinct]
+            values = self.scorer.score(np.column_stack([np.broadcast_to(drafted, (len(rosters), len(drafted))), rosters]))
+            keep = np.argsort(-values, kind="stable")[:beam_width]
+            plans, states, rosters, values = plans[keep], states[keep], rosters[keep], values[keep]
+
+        self.solution_rows = rosters[0]
+        self.objective_value = float(values[0])
+        self.solution = [self.positions[k] for k in plans[0]]
+
+    def chosen_positions(self):
+        """Position drafted at each pick in the last solution."""
+        if self.solution is not None:
+            return self.solution
         if self.model is None:
             raise RuntimeError("No model available.")
+        if not self._mip_solved:
+            raise RuntimeError("No optimal solution available; check `results` from the last solve.")
 
-        picks = self.picks
-        rounds = list(range(len(picks)))
         chosen = []
-
-        for i in rounds:
+        for i in range(len(self.picks)):
             for p in self.model.positions:
                 if value(self.model.x[i, p]) > 0.5:
-                    chosen.append({
-                        "round_index": i,
-                        "pick_number": picks[i],
-                        "position": p,
-                        "proj_points": self.proj_matrix.get((picks[i], p), 0.0)
-                    })
+                    chosen.append(p)
+        return chosen
+
+    def get_solu(self):
+        picks = self.picks
+        chosen = []
+
+        for i, p in enumerate(self.chosen_positions()):
+            chosen.append({
+                "round_index": i,
+                "pick_number": picks[i],
+                "position": p,
+                "proj_points": self.proj_matrix.get((picks[i], p), 0.0)
+            })
 
         df = pd.DataFrame(chosen)
         df["cumulative_points"] = df["proj_points"].cumsum()
         return df
+
+
+def dominated_players(players: PlayerPool, keep) -> np.ndarray:
+    """
+    Players no draft plan needs: at least keep[position] others at the same position last at least
+    as long (ADP >= theirs) and project at least as many points.
+
+    A plan holds at most keep[position] players of a position, so one of those dominating players
+    is always free to replace a dominated one at the same pick without losing points. Players
+    without an ADP or a projection are never drafted (as in AvailabilityIndex) and count as dominated.
+
+    Parameters:
+    - players: PlayerPool
+    - keep: Dict[str, int] -> most players of each position a plan can take; players of positions
+      not in keep are all dominated
+
+    Returns:
+    - np.ndarray[bool] -> True for dominated players
+    """
+    dominated = np.ones(len(players), dtype=bool)
+    usable = ~(np.isnan(players.adp) | np.isnan(players.proj))
+    for pos, k in keep.items():
+        rows = players.rows(pos, usable)
+        # Latest ADP first, then best projection, then table order: a player's dominators all come before it
+        rows = rows[np.lexsort((rows, -players.proj[rows], -players.adp[rows]))]
+        proj = players.proj[rows]
+        n_dominators = np.tril(proj[None, :] >= proj[:, None], -1).sum(axis=1)
+        dominated[rows] = n_dominators >= k
+    return dominated
+
+
+class PlayerDraftOptimizer(DraftOptimizer):
+    def __init__(self, players, picks, current_roster, position_constraints, positions, flex_limit=1):
+        """
+        Draft optimizer over actual players instead of positions: one player per pick, every player
+        at most once, and a player only at picks they should still be there for (ADP >= pick, as
+        AvailabilityIndex), under the same roster rules as DraftOptimizer. Unlike resolving each
+        (pick, position) separately, a plan never targets the same player twice.
+
+        The model stays small as the pool grows. Dominated players are pruned up front
+        (dominated_players), and each pick only gets variables for the best still-available players
+        of each position, as many as a plan can hold of that position: any other player there could
+        be swapped for an unused better one.
+
+        solver_name="dp" (or "flow") solves the model exactly as a min-cost flow (see _solve_flow);
+        any other name builds the same sparse model in Pyomo (build() first). get_solu keeps the
+        position-level columns and adds the player.
+
+        Parameters:
+        - players: PlayerPool or pd.DataFrame -> players still on the board
+        - picks, current_roster, position_constraints, positions, flex_limit: as for DraftOptimizer
+        """
+        super().__init__(picks=picks, current_roster=current_roster, position_constraints=position_constraints,
+                         positions=positions, proj_matrix={}, flex_limit=flex_limit)
+        self.players = PlayerPool.coerce(players)
+        self.chosen_rows = None
+        self._prepare()
+
+    def _position_caps(self):
+        """Most players of each position a plan can take: its groups' open slots plus FLEX, at most one per pick."""
+        caps = {}
+        for p in self.positions:
+            cap = len(self.picks)
+            for con in self.position_constraints:
+                if p in con["positions_against_limit"]:
+                    current = sum(self.current_roster.get(q, 0) for q in con["positions_against_limit"])
+                    room = con["limit"] - current + (self.flex_limit if con.get("flex", False) else 0)
+                    cap = min(cap, max(room, 0))
+            caps[p] = cap
+        return caps
+
+    @timed("PlayerDraftOptimizer.prepare")
+    def _prepare(self):
+        """Candidate (round, player) pairs, plus the best candidate's points per (pick, position) as proj_matrix."""
+        caps = self._position_caps()
+        kept = np.flatnonzero(~dominated_players(self.players, caps))
+        index = AvailabilityIndex(self.players.take(kept))
+        picks = np.asarray(self.picks, dtype=float)
+
+        rounds, rows = [], []
+        self.proj_matrix = {}
+        for p in self.positions:
+            if not caps[p]:
+                continue
+            top = index.top_available_rows(p, picks, caps[p])
+            round_idx, rank = np.nonzero(top >= 0)
+            rounds.append(round_idx)
+            rows.append(kept[top[round_idx, rank]])
+            for i in np.flatnonzero(top[:, 0] >= 0):
+                self.proj_matrix[(self.picks[i], p)] = float(self.players.proj[kept[top[i, 0]]])
+
+        rounds = np.concatenate(rounds) if rounds else np.zeros(0, dtype=np.int64)
+        rows = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+        order = np.lexsort((rows, rounds))
+        self._cand_round, self._cand_row = rounds[order], rows[order]
+        count("PlayerDraftOptimizer.kept_players", len(kept))
+        count("PlayerDraftOptimizer.candidates", len(order))
+
+    def _check_candidates(self):
+        empty = np.setdiff1d(np.arange(len(self.picks)), self._cand_round)
+        if len(empty):
+            raise RuntimeError(f"Draft problem is infeasible: no player is left for pick {self.picks[empty[0]]}.")
+
+    def update(self, picks=None, proj_matrix=None, current_roster=None, player_rows=None, roster_rows=None, *,
+               players=None):
+        """
+        Point the optimizer at new picks, roster and/or board. The candidates are recomputed, and a
+        built model is rebuilt (its variables depend on them).
+
+        Parameters:
+        - picks, current_roster: as for DraftOptimizer.update
+        - proj_matrix, player_rows, roster_rows: DraftOptimizer.update's, not accepted here (the
+          projections come from the players, and solver_name="lineup" is position-level only)
+        - players: PlayerPool or pd.DataFrame -> new board
+        """
+        if proj_matrix is not None or player_rows is not None or roster_rows is not None:
+            raise ValueError("PlayerDraftOptimizer.update takes the board as players=, not proj_matrix / lineup rows.")
+        if picks is not None:
+            self.picks = picks
+        if current_roster is not None:
+            self.current_roster = current_roster
+        if players is not None:
+            self.players = PlayerPool.coerce(players)
+        self._prepare()
+        if self.model is not None:
+            self.build()
+
+    @timed("PlayerDraftOptimizer.build")
+    def build(self):
+        """Build the sparse Pyomo model: a binary x[round, player] per candidate pair only."""
+        if ConcreteModel is None:
+            raise ImportError("Pyomo is required to build the MIP model; use solve(solver_name='dp') without it.")
+        self._check_candidates()
+        model = ConcreteModel(name="Fantasy_Draft_Player_Optimizer")
+
+        pairs = list(zip(self._cand_round.tolist(), self._cand_row.tolist()))
+        rows_by_round = defaultdict(list)
+        rounds_by_row = defaultdict(list)
+        for i, r in pairs:
+            rows_by_round[i].append(r)
+            rounds_by_row[r].append(i)
+        position_of = self.players.positions
+        proj = self.players.proj
+
+        model.rounds = Set(initialize=range(len(self.picks)))
+        model.pairs = Set(initialize=pairs, dimen=2)
+        model.shared_players = Set(initialize=[r for r, rounds in rounds_by_row.items() if len(rounds) > 1])
+        model.constraint_indices = RangeSet(0, len(self.position_constraints) - 1)
+
+        model.x = Var(model.pairs, domain=Binary)
+        model.flex = Var(model.constraint_indices, domain=NonNegativeIntegers)
+
+        model.total_points = Objective(expr=sum(float(proj[r]) * model.x[i, r] for i, r in pairs), sense=maximize)
+
+        # One player per pick, every player at most once
+        model.pick_one_player = Constraint(model.rounds, rule=lambda m, i: sum(m.x[i, r] for r in rows_by_round[i]) == 1)
+        model.player_once = Constraint(model.shared_players,
+                                       rule=lambda m, r: sum(m.x[i, r] for i in rounds_by_row[r]) <= 1)
+
+        # Same group and FLEX rules as DraftOptimizer.build
+        def constraint_by_group(m, j):
+            pos_list = self.position_constraints[j]["positions_against_limit"]
+            drafted = sum(m.x[i, r] for i, r in pairs if position_of[r] in pos_list)
+            current = sum(self.current_roster.get(p, 0) for p in pos_list)
+            return drafted + current <= self.position_constraints[j]["limit"] + m.flex[j]
+        model.constraint_groups = Constraint(model.constraint_indices, rule=constraint_by_group)
+
+        def flex_zero_rule(m, j):
+            if not self.position_constraints[j].get("flex", False):
+                return m.flex[j] == 0
+            return Constraint.Skip
+        model.disable_flex = Constraint(model.constraint_indices, rule=flex_zero_rule)
+        model.flex_total_limit = Constraint(expr=sum(model.flex[j] for j in model.constraint_indices) <= self.flex_limit)
+
+        self.model = model
+        self._solver = None
+
+    @timed("PlayerDraftOptimizer.solve")
+    def solve(self, solver_name="gurobi", tee=False, warmstart=True, **solver_args):
+        """
+        Solve the player-level problem: solver_name="dp" / "flow" with the built-in min-cost flow,
+        any other name with Pyomo (see DraftOptimizer.solve). The plan is in chosen_rows / get_solu.
+        """
+        self.solution = None
+        self.chosen_rows = None
+        if solver_name == "lineup":
+            raise ValueError('solver_name="lineup" is position-level only; use DraftOptimizer.')
+        if solver_name in ("dp", "flow"):
+            self._check_candidates()
+            rows = self._solve_flow()
+        else:
+            super().solve(solver_name=solver_name, tee=tee, warmstart=warmstart, **solver_args)
+            if not self._mip_solved:
+                return
+            rows = np.zeros(len(self.picks), dtype=np.int64)
+            for (i, r), x in self.model.x.items():
+                if value(x) > 0.5:
+                    rows[i] = r
+
+        # Within a position any order of its players over its picks is feasible and worth the same;
+        # take the one who goes first (lowest ADP) first
+        positions = self.players.position_codes[rows]
+        for code in np.unique(positions):
+            at = np.flatnonzero(positions == code)
+            rows[at] = rows[at][np.lexsort((rows[at], self.players.adp[rows[at]]))]
+
+        self.chosen_rows = rows
+        self.solution = [self.players.position_table[c] for c in self.players.position_codes[rows]]
+        self.objective_value = float(self.players.proj[rows].sum())
+
+    def _solve_flow(self):
+        """
+        Exact solve as a min-cost flow: source -> pick (1 unit each) -> candidate player (at most
+        once) -> the player's constraint group (its open slots) -> sink, with flex groups spilling
+        into a FLEX node that holds the open FLEX slots. The constraint matrix is totally unimodular,
+        so the integral flow is the MIP optimum. One shortest augmenting path per pick, found with a
+        vectorized Bellman-Ford over the residual graph.
+
+        Needs disjoint constraint groups (as in every league config here); use a Pyomo solver otherwise.
+
+        Returns:
+        - np.ndarray[int] -> player row per round
+        """
+        group_of = {}
+        for j, con in enumerate(self.position_constraints):
+            for p in con["positions_against_limit"]:
+                if p in group_of:
+                    raise ValueError(f"{p} is in several constraint groups; use a Pyomo solver for overlapping groups.")
+                group_of[p] = j
+
+        flex_room = self.flex_limit
+        group_room = []
+        for con in self.position_constraints:
+            room = con["limit"] - sum(self.current_roster.get(p, 0) for p in con["positions_against_limit"])
+            if room < 0:
+                if not con.get("flex", False):
+                    raise RuntimeError("Draft problem is infeasible for the current roster.")
+                flex_room += room
+            group_room.append(max(room, 0))
+        if flex_room < 0:
+            raise RuntimeError("Draft problem is infeasible for the current roster.")
+
+        n_picks = len(self.picks)
+        players, player_node = np.unique(self._cand_row, return_inverse=True)
+        player_node = player_node.ravel() + 1 + n_picks
+        group_node = 1 + n_picks + len(players)
+        flex_node = group_node + len(group_room)
+        sink = flex_node + 1
+        n_nodes = sink + 1
+
+        edges = []  # (tail, head, capacity, cost); each is followed by its residual twin
+
+        def add(tail, head, capacity, cost=0.0):
+            edges.append((tail, head, capacity, cost))
+            edges.append((head, tail, 0, -cost))
+
+        for i in range(n_picks):
+            add(0, 1 + i, 1)
+        for i, node in zip(self._cand_round, player_node):
+            add(1 + i, node, 1)
+        pick_edges = len(edges)
+        positions = self.players.positions
+        for k, row in enumerate(players):
+            j = group_of.get(positions[row])
+            add(1 + n_picks + k, sink if j is None else group_node + j, 1, -float(self.players.proj[row]))
+        for j, con in enumerate(self.position_constraints):
+            add(group_node + j, sink, group_room[j])
+            if con.get("flex", False):
+                add(group_node + j, flex_node, n_picks)
+        add(flex_node, sink, flex_room)
+
+        tail, head, capacity, cost = (np.array(col) for col in zip(*edges))
+        tail, head, cost = tail.astype(np.int64), head.astype(np.int64), cost.astype(float)
+        capacity = capacity.astype(np.int64)
+        # Edges grouped by head for the per-node minimum; every node has an incoming (residual) edge
+        by_head = np.argsort(head, kind="stable")
+        starts = np.searchsorted(head[by_head], np.arange(n_nodes))
+
+        for _ in range(n_picks):
+            dist = np.full(n_nodes, np.inf)
+            dist[0] = 0.0
+            pred = np.full(n_nodes, -1, dtype=np.int64)
+            for _ in range(n_nodes):
+                reach = np.where(capacity > 0, dist[tail] + cost, np.inf)
+                best = np.minimum.reduceat(reach[by_head], starts)
+                improved = best < dist - 1e-9
+                if not improved.any():
+                    break
+                dist = np.where(improved, best, dist)
+                via = np.flatnonzero(improved[head] & (reach == best[head]))
+                pred[head[via]] = via
+            if not np.isfinite(dist[sink]):
+                raise RuntimeError("Draft problem is infeasible: not enough roster room for all picks.")
+            node = sink
+            while node != 0:
+                e = pred[node]
+                capacity[e] -= 1
+                capacity[e ^ 1] += 1
+                node = tail[e]
+
+        used = np.flatnonzero(capacity[2 * n_picks:pick_edges:2] == 0)
+        rows = np.zeros(n_picks, dtype=np.int64)
+        rows[self._cand_round[used]] = self._cand_row[used]
+        return rows
+
+    def chosen_positions(self):
+        """Position drafted at each pick in the last solution."""
+        if self.solution is None:
+            raise RuntimeError("No optimal solution available; check `results` from the last solve.")
+        return self.solution
+
+    def get_solu(self):
+        """DraftOptimizer.get_solu's plan plus the targeted player; proj_points are that player's."""
+        rows = self.chosen_rows
+        if rows is None:
+            raise RuntimeError("No optimal solution available; check `results` from the last solve.")
+        df = pd.DataFrame({
+            "round_index": range(len(self.picks)),
+            "pick_number": self.picks,
+            "position": self.chosen_positions(),
+            "player_name": [self.players.name(r) for r in rows],
+            "ADP": self.players.adp[rows],
+            "proj_points": self.players.proj[rows],
+        })
+        df["cumulative_points"] = df["proj_points"].cumsum()
+        return df
@@ -0,0 +1,156 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from utils import instrumentation
+from utils.draft_simulator import DraftSimulator, merge_pick_sums
+from utils.player_pool import PlayerPool
+
+# Per-process state set up by _init_worker, so the player pool is shipped once per worker
+_worker_pool = None
+_worker_position_limits = None
+_worker_scorer = None
+_worker_simulator = None
+_worker_adp = None
+
+
+def _init_worker(pool, position_limits, scorer=None):
+    global _worker_pool, _worker_position_limits, _worker_scorer, _worker_simulator, _worker_adp
+    _worker_pool = pool
+    _worker_position_limits = position_limits
+    _worker_scorer = scorer
+    _worker_simulator = None
+    _worker_adp = None
+
+
+def _run_chunk(adp, n_drafts, seed_seq, num_teams, rounds):
+    """Simulate one chunk of drafts and return only the mergeable integer sums and team totals."""
+    global _worker_simulator, _worker_adp
+    # One simulator per worker; it only takes the new ADP when the caller moved on (next iteration)
+    if _worker_simulator is None:
+        _worker_simulator = DraftSimulator(_worker_pool, _worker_position_limits)
+    if not np.array_equal(adp, _worker_adp, equal_nan=True):
+        _worker_simulator.set_adp(adp)
+        _worker_adp = adp
+
+    pick_rows = _worker_simulator.simulate_batch(n_drafts, num_teams, rounds, rng=np.random.default_rng(seed_seq))
+    return _worker_simulator.pick_sums(pick_rows), _worker_simulator.team_points(pick_rows, num_teams, _worker_scorer)
+
+
+def _init_process(pool, position_limits, scorer=None):
+    # Forked workers inherit the parent's recorder; theirs starts in _run_chunk_traced instead
+    instrumentation.disable()
+    _init_worker(pool, position_limits, scorer)
+
+
+def _run_chunk_traced(trace, *task):
+    """_run_chunk in a worker process, plus the spans it recorded (None unless `trace`) for the parent."""
+    if trace and not instrumentation.enabled():
+        instrumentation.enable()
+    elif not trace:
+        instrumentation.disable()
+    result = _run_chunk(*task)
+    return result, instrumentation.snapshot(reset=True) if trace else None
+
+
+class ParallelDraftRunner:
+    def __init__(self, player_df: pd.DataFrame, position_limits: dict, max_workers=None, chunk_size=250, scorer=None):
+        """
+        Spread batched draft simulations over a process pool.
+
+        Drafts are split into fixed-size chunks and chunk k always gets the k-th child of the run's
+        SeedSequence, so for a given seed the results are bit-identical whatever `max_workers` is.
+        Workers send back integer pick sums (merged exactly) and team totals, not DataFrames.
+
+        Parameters:
+        - player_df: pd.DataFrame with columns ['name', 'position', 'ADP', 'proj_points']
+        - position_limits: Dict[str, int] -> starter slots per position, including "FLEX"
+        - max_workers: int -> worker processes (defaults to os.cpu_count(); 1 runs in this process)
+        - chunk_size: int -> drafts per task; part of the seeding scheme, so keep it fixed to reproduce runs
+        - scorer: weekly_projections.LineupScorer -> value teams by weekly lineups (see
+          DraftSimulator.team_points); a store mapped from disk reaches the workers as its path
+        """
+        self.player_df = player_df.reset_index(drop=True)
+        self.pool = PlayerPool.from_frame(self.player_df)
+        self.position_limits = position_limits
+        self.max_workers = max_workers or os.cpu_count()
+        self.chunk_size = chunk_size
+        self.scorer = scorer
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _map(self, tasks):
+        if self.max_workers == 1:
+            _init_worker(self.pool, self.position_limits, self.scorer)
+            return [_run_chunk(*task) for task in tasks]
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_process,
+                initargs=(self.pool, self.position_limits, self.scorer),
+            )
+        # map() yields results in task order, which keeps the team totals order deterministic
+        trace = [instrumentation.enabled()] * len(tasks)
+        results = []
+        for result, snapshot in self._executor.map(_run_chunk_traced, trace, *zip(*tasks)):
+            if snapshot is not None:
+                instrumentation.merge(snapshot)
+            results.append(result)
+        return results
+
+    def run_sums(self, n_drafts, seed=None, adp=None, num_teams=12, rounds=8):
+        """
+        Simulate `n_drafts` drafts (arguments as run()).
+
+        Returns:
+        - Tuple[Dict[str, np.ndarray], np.ndarray] -> merged pick sums (DraftSimulator.pick_sums) over
+          the player rows and (n_drafts, num_teams) team point totals
+        """
+        if adp is None:
+            adp = self.pool.adp
+        seed_seq = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+
+        n_chunks = math.ceil(n_drafts / self.chunk_size)
+        sizes = [min(self.chunk_size, n_drafts - k * self.chunk_size) for k in range(n_chunks)]
+        tasks = [(adp, size, child, num_teams, rounds) for size, child in zip(sizes, seed_seq.spawn(n_chunks))]
+
+        results = self._map(tasks)
+        sums = results[0][0]
+        for chunk_sums, _ in results[1:]:
+            sums = merge_pick_sums(sums, chunk_sums)
+        return sums, np.concatenate([points for _, points in results])
+
+    def run(self, n_drafts, seed=None, adp=None, num_teams=12, rounds=8):
+        """
+        Simulate `n_drafts` drafts.
+
+        Parameters:
+        - n_drafts: int
+        - seed: int or np.random.SeedSequence -> root seed of the run
+        - adp: np.ndarray -> ADP per player row to simulate with (defaults to player_df['ADP'])
+        - num_teams: int
+        - rounds: int
+
+        Returns:
+        - Tuple[pd.DataFrame, np.ndarray] -> per-player statistics (DraftSimulator.statistics_from_sums)
+          and (n_drafts, num_teams) team point totals
+        """
+        if adp is None:
+            adp = self.pool.adp
+        sums, team_points = self.run_sums(n_drafts, seed, adp, num_teams, rounds)
+        simulator = DraftSimulator(self.pool.with_adp(adp), self.position_limits)
+        return simulator.statistics_from_sums(sums), team_points
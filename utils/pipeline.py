@@ -0,0 +1,525 @@
+import argparse
+import ast
+import hashlib
+import inspect
+import json
+import os
+import runpy
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from paths import PROJECT_ROOT
+from utils.availability_index import AvailabilityIndex
+from utils.availability_model import ProbabilisticAvailability
+from utils.data_access import CACHE_DIR, DATA_DIR, file_hash, load_table
+from utils.draft_playbook import PlaybookTable, recommend_draft_plan
+from utils.draft_pool_calcs import compute_proj_by_position
+from utils import instrumentation
+from utils.draft_schedule import generate_pick_order, picks_by_team
+from utils.mip_draft_model import DraftOptimizer, PlayerDraftOptimizer
+from utils.target_resolver import resolve_targets, target_frequency
+from utils.vor_playbook import build_vor_playbook
+from utils.weekly_projections import LineupScorer, WeeklyProjections, expected_rows
+
+STATE_PATH = CACHE_DIR / "pipeline_state.json"
+# Outputs and state of leagues other than the default, one directory per league_key (shared stages
+# keep their state in STATE_PATH whatever the league)
+LEAGUE_DIR = CACHE_DIR / "leagues"
+PLAYER_DATA = "2025_cleaned_data.csv"
+
+# League settings every stage reads from; a --league file overrides any of them
+DEFAULT_LEAGUE = {
+    "num_teams": 12,
+    "draft_type": "snake",  # "snake", "linear" or "third_round_reversal"
+    "rounds": 8,
+    "position_limits": {"QB": 1, "RB": 2, "WR": 2, "TE": 1, "FLEX": 1, "PK": 1},
+    "positions": ["QB", "RB", "WR", "TE", "DEF", "PK"],
+    "position_constraints": [
+        {"positions_against_limit": ["QB"], "limit": 1, "flex": False},
+        {"positions_against_limit": ["RB"], "limit": 2, "flex": True},
+        {"positions_against_limit": ["WR"], "limit": 2, "flex": True},
+        {"positions_against_limit": ["TE"], "limit": 1, "flex": True},
+        {"positions_against_limit": ["DEF"], "limit": 1, "flex": False},
+        {"positions_against_limit": ["PK"], "limit": 1, "flex": False},
+    ],
+    "flex_limit": 1,
+    "solver": "dp",  # "lineup" (weekly best lineups, utils.weekly_projections) or a Pyomo solver name
+    "player_level": False,  # plan actual players (mip_draft_model.PlayerDraftOptimizer), never one twice
+    "max_pick": None,  # last playbook pick; None covers the whole draft (num_teams * rounds)
+    "max_gap": None,  # longest playbook gap; None covers the longest wait between picks (2 * num_teams)
+    "availability": "offsets",  # or "probabilistic" (utils.availability_model)
+    "top_k": 3,
+    "n_drafts": 1000,
+    "max_iters": 50,
+    "tolerance": 0.25,  # simulated ADP stops once it moves less than this (picks) beyond sampling noise
+    "damping": 1.0,
+    "seed": 0,
+    "max_workers": None,
+}
+
+
+def run_clean_data(league, out_dir=DATA_DIR):
+    runpy.run_path(str(PROJECT_ROOT / "utils" / "clean_data.py"), run_name="__main__")
+
+
+def playbook_size(league):
+    """(max_pick, max_gap) of the VOR playbook: the league's settings, or the whole draft where they are None."""
+    max_pick = league["max_pick"] if league["max_pick"] is not None else league["num_teams"] * league["rounds"]
+    max_gap = league["max_gap"] if league["max_gap"] is not None else 2 * league["num_teams"]
+    return max_pick, max_gap
+
+
+def run_vor_playbook(league, out_dir=DATA_DIR):
+    data_df = load_table(PLAYER_DATA, dtype=np.float64)
+    max_pick, max_gap = playbook_size(league)
+    vor_df = build_vor_playbook(data_df, max_pick=max_pick, max_gap=max_gap, method=league["availability"])
+    vor_df.to_csv(out_dir / "vor_playbook.csv", index=False)
+
+
+def run_draft_playbook(league, out_dir=DATA_DIR):
+    playbook = PlaybookTable(load_table("vor_playbook.csv", dtype=np.float64, data_dir=out_dir))
+    player_picks = picks_by_team(generate_pick_order(league["num_teams"], league["rounds"], league["draft_type"]))
+    plans = recommend_draft_plan(playbook, player_picks, league["position_limits"], rounds=league["rounds"],
+                                 fallback_gap=league["num_teams"])
+    plan_df = pd.DataFrame({player: [pos for _, pos in picks] for player, picks in plans.items()})
+    plan_df.index.name = "round"
+    plan_df.to_csv(out_dir / "draft_playbook.csv")
+
+
+def run_draft_targets(league, out_dir=DATA_DIR):
+    player_df = load_table(PLAYER_DATA, dtype=np.float64)
+    index = AvailabilityIndex(player_df)
+    model = ProbabilisticAvailability(player_df) if league["availability"] == "probabilistic" else None
+    rounds = league["flex_limit"] + sum(con["limit"] for con in league["position_constraints"])
+    positions = league["positions"]
+    player_picks = picks_by_team(generate_pick_order(league["num_teams"], rounds, league["draft_type"]))
+
+    # solver "lineup" values plans by weekly best lineups; the store rows follow the player table's
+    scorer = None
+    if league["solver"] == "lineup":
+        if league["player_level"]:
+            raise ValueError('solver "lineup" is position-level only; set player_level to false.')
+        scorer = LineupScorer(WeeklyProjections.for_table(PLAYER_DATA), league["position_constraints"],
+                              league["flex_limit"])
+
+    all_results = {}
+    optimizer = None
+    for player_id, picks in player_picks.items():
+        if league["player_level"]:
+            if optimizer is None:
+                optimizer = PlayerDraftOptimizer(player_df, picks, {p: 0 for p in positions},
+                                                 league["position_constraints"], positions, league["flex_limit"])
+                if league["solver"] != "dp":
+                    optimizer.build()
+            else:
+                optimizer.update(picks=picks)
+        elif optimizer is None:
+            optimizer = DraftOptimizer(picks=picks, current_roster={p: 0 for p in positions},
+                                       position_constraints=league["position_constraints"], positions=positions,
+                                       proj_matrix=compute_proj_by_position(player_df, picks, positions, index=index,
+                                                                            method=league["availability"],
+                                                                            model=model),
+                                       flex_limit=league["flex_limit"], scorer=scorer,
+                                       player_rows=expected_rows(index, picks, positions) if scorer is not None else None)
+            if league["solver"] not in ("dp", "lineup"):
+                optimizer.build()
+        else:
+            optimizer.update(picks=picks, proj_matrix=compute_proj_by_position(player_df, picks, positions, index=index,
+                                                                               method=league["availability"],
+                                                                               model=model),
+                             player_rows=expected_rows(index, picks, positions) if scorer is not None else None)
+        optimizer.solve(solver_name=league["solver"])
+        draft_plan_df = optimizer.get_solu()
+        draft_plan_df["round"] = range(1, len(picks) + 1)
+        all_results[player_id] = draft_plan_df
+
+    combined_df = pd.concat({k: df.set_index("round") for k, df in all_results.items()}, names=["player", "round"])
+    combined_df.reset_index().to_csv(out_dir / "draft_position_targets.csv", index=False)
+
+
+def run_player_targets(league, out_dir=DATA_DIR):
+    player_df = load_table(PLAYER_DATA)
+    targets_df = load_table("draft_position_targets.csv", data_dir=out_dir)
+    resolved_df = resolve_targets(player_df, targets_df, num_teams=league["num_teams"],
+                                  draft_type=league["draft_type"], top_k=league["top_k"],
+                                  name_col="name", position_col="position")
+    if "player_name" in targets_df.columns:
+        # Player-level plans already name a distinct player per pick; keep those over the per-target best
+        resolved_df["player_name"] = targets_df["player_name"].to_numpy()
+        resolved_df["proj_points"] = targets_df["proj_points"].to_numpy()
+    resolved_df.assign(alternates=resolved_df["alternates"].str.join("|")).to_csv(
+        out_dir / "player_targets.csv", index=False)
+    target_frequency(resolved_df).to_csv(out_dir / "player_target_frequency.csv", index=False)
+
+
+def run_simulated_adp(league, out_dir=DATA_DIR):
+    # recompute_adp loads its player table on import, so only pull it in for this stage
+    from utils.recompute_adp import player_df, run_iterative_simulation
+
+    _, adp_history, _ = run_iterative_simulation(player_df, max_iters=league["max_iters"], tolerance=league["tolerance"],
+                                                 n_drafts=league["n_drafts"], rng=league["seed"],
+                                                 max_workers=league["max_workers"] or os.cpu_count(),
+                                                 damping=league["damping"])
+    combined_adps = adp_history[-min(10, len(adp_history)):]
+    avg_adp_df = pd.concat(combined_adps).groupby(["name", "position"]).mean().reset_index()
+    avg_adp_df = avg_adp_df.rename(columns={"sim_adp": "final_average_adp"}).sort_values("final_average_adp")
+    avg_adp_df.to_csv(out_dir / "simulated_adp.csv", index=False)
+
+
+class Stage:
+    def __init__(self, name, func, inputs, outputs, params=(), code=()):
+        """
+        One pipeline step.
+
+        Parameters:
+        - name: str
+        - func: Callable[[dict, Path], None] -> module-level function taking the league settings and
+          the directory to write its outputs to (where it also finds the outputs of other stages)
+        - inputs: List[str] -> files the stage reads
+        - outputs: List[str] -> files the stage writes
+        - params: List[str] -> league settings the outputs depend on (part of the fingerprint); a
+          stage without any is shared by every league and always writes to assets/data
+        - code: List[str] -> repo modules the stage runs that `func` does not reference by name
+          (scripts it executes); the ones it does are found from its code
+        """
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.params = list(params)
+        self.code = list(code)
+
+    def code_modules(self) -> list:
+        """Repo modules the stage's code depends on: those `func` uses or imports, `code`, and their imports."""
+        return module_closure(referenced_modules(self.func) | set(self.code))
+
+    @property
+    def shared(self) -> bool:
+        return not self.params
+
+    def fingerprint(self, league, paths=None) -> str:
+        """
+        Hash of the stage's code (with the repo modules it uses), its league settings and its inputs.
+
+        Parameters:
+        - league: Dict -> league settings
+        - paths: Dict[str, Path] -> where each input is (default assets/data/<input>)
+        """
+        paths = paths or {}
+        digest = hashlib.sha256()
+        digest.update(inspect.getsource(self.func).encode())
+        for module in self.code_modules():
+            digest.update(f"{module}:{file_hash(_module_path(module))}".encode())
+        digest.update(json.dumps({p: league[p] for p in self.params}, sort_keys=True).encode())
+        for name in self.inputs:
+            path = paths.get(name, DATA_DIR / name)
+            digest.update(f"{name}:{file_hash(path) if path.exists() else 'missing'}".encode())
+        return digest.hexdigest()
+
+
+def _module_path(name):
+    """Source file of a module in this repo (dotted name), None for anything else."""
+    path = PROJECT_ROOT.joinpath(*name.split("."))
+    for candidate in (path.with_suffix(".py"), path / "__init__.py"):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def referenced_modules(func) -> set:
+    """
+    Modules a function can reach by name: those of the globals its code (nested functions included)
+    refers to, and the dotted names it imports inside its body.
+    """
+    names, codes = set(), [func.__code__]
+    while codes:
+        code = codes.pop()
+        names.update(code.co_names)
+        codes.extend(const for const in code.co_consts if inspect.iscode(const))
+    modules = set(names)
+    for name in names:
+        obj = func.__globals__.get(name)
+        if inspect.ismodule(obj):
+            modules.add(obj.__name__)
+        elif getattr(obj, "__module__", None):
+            modules.add(obj.__module__)
+    return modules
+
+
+def module_closure(modules) -> list:
+    """Sorted repo modules among `modules` plus every repo module they import, directly or not."""
+    seen, todo = set(), list(modules)
+    while todo:
+        name = todo.pop()
+        if name in seen or _module_path(name) is None:
+            continue
+        seen.add(name)
+        for node in ast.walk(ast.parse(_module_path(name).read_text())):
+            if isinstance(node, ast.Import):
+                todo.extend(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                todo.append(node.module)
+                todo.extend(f"{node.module}.{alias.name}" for alias in node.names)
+    return sorted(seen)
+
+
+STAGES = [
+    Stage("clean_data", run_clean_data,
+          inputs=["espn_2025_projections.csv", "FantasyFootball_2025_PPR_ADP_Rankings.csv"],
+          outputs=[PLAYER_DATA, "player_crosswalk.csv"], code=["utils.clean_data"]),
+    Stage("vor_playbook", run_vor_playbook, inputs=[PLAYER_DATA], outputs=["vor_playbook.csv"],
+          params=["max_pick", "max_gap", "num_teams", "rounds", "availability"]),
+    Stage("draft_playbook", run_draft_playbook, inputs=["vor_playbook.csv"], outputs=["draft_playbook.csv"],
+          params=["num_teams", "rounds", "draft_type", "position_limits"]),
+    Stage("draft_targets", run_draft_targets, inputs=[PLAYER_DATA], outputs=["draft_position_targets.csv"],
+          params=["num_teams", "draft_type", "positions", "position_constraints", "flex_limit", "solver",
+                  "player_level", "availability"]),
+    Stage("player_targets", run_player_targets, inputs=[PLAYER_DATA, "draft_position_targets.csv"],
+          outputs=["player_targets.csv", "player_target_frequency.csv"],
+          params=["num_teams", "draft_type", "top_k"]),
+    Stage("simulated_adp", run_simulated_adp, inputs=["2024_retrospective_data.csv"], outputs=["simulated_adp.csv"],
+          params=["n_drafts", "max_iters", "tolerance", "damping", "seed"]),
+]
+
+# Named groups of stages for the command line
+TARGETS = {
+    "playbook": ["draft_playbook", "draft_targets", "player_targets"],
+    "adp": ["simulated_adp"],
+    "all": [stage.name for stage in STAGES],
+}
+
+
+class Pipeline:
+    def __init__(self, stages=STAGES, league=None, state_path=None, out_dir=None):
+        """
+        Stage DAG over the data files: a stage depends on whichever stages write its inputs.
+
+        A stage is current when its fingerprint (code and the repo modules it uses, league settings
+        it uses, input contents) matches the one recorded at its last run and its outputs still have
+        the recorded contents. Running a target re-runs only the stages upstream of it that are not
+        current, independent stages in parallel processes.
+
+        The default league reads and writes assets/data. Any other league gets its own directory
+        under assets/cache/leagues (league_dir) for the outputs and state of its league-dependent
+        stages; raw inputs and the outputs of shared stages stay in assets/data, with their state in
+        STATE_PATH, so every league sees the same shared runs.
+
+        Parameters:
+        - stages: List[Stage]
+        - league: Dict -> overrides of DEFAULT_LEAGUE
+        - state_path: Path -> JSON file with the fingerprints and output hashes of past runs of the
+          league-dependent stages (default pipeline_state.json in assets/cache, or in the league's directory)
+        - out_dir: Path -> where league-dependent stages write (default league_dir(league, stages))
+        """
+        self.stages = {stage.name: stage for stage in stages}
+        self.league = {**DEFAULT_LEAGUE, **(league or {})}
+        self.out_dir = out_dir or league_dir(self.league, stages)
+        if state_path is None:
+            state_path = STATE_PATH if self.out_dir == DATA_DIR else self.out_dir / "pipeline_state.json"
+        self.state_path = state_path
+        self._producers = {output: stage.name for stage in stages for output in stage.outputs}
+        self.deps = {stage.name: sorted({self._producers[i] for i in stage.inputs if i in self._producers}
+                                        - {stage.name})
+                     for stage in stages}
+
+    def stage_dir(self, name) -> Path:
+        """Directory stage `name` writes its outputs to."""
+        return DATA_DIR if self.stages[name].shared else self.out_dir
+
+    def path(self, filename) -> Path:
+        """Where a data file is for this league: its producing stage's directory, else assets/data."""
+        producer = self._producers.get(filename)
+        return self.stage_dir(producer) / filename if producer is not None else DATA_DIR / filename
+
+    def fingerprint(self, name) -> str:
+        stage = self.stages[name]
+        return stage.fingerprint(self.league, {i: self.path(i) for i in stage.inputs})
+
+    def _state_path(self, name) -> Path:
+        """State file stage `name` is recorded in: STATE_PATH for shared stages, else the league's."""
+        return STATE_PATH if self.stages[name].shared else self.state_path
+
+    def _load_state(self):
+        state = {}
+        for path in {self._state_path(name) for name in self.stages}:
+            records = json.loads(path.read_text()) if path.exists() else {}
+            state.update({name: record for name, record in records.items()
+                          if name in self.stages and self._state_path(name) == path})
+        return state
+
+    def _save_state(self, state):
+        # Each file keeps the records of stages it does not hold for this pipeline (other stage lists)
+        for path in {self._state_path(name) for name in state}:
+            records = json.loads(path.read_text()) if path.exists() else {}
+            records.update({name: record for name, record in state.items() if self._state_path(name) == path})
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(records, indent=2, sort_keys=True))
+
+    def upstream(self, targets):
+        """Requested stages plus everything they depend on, in dependency order."""
+        names = []
+        for target in targets:
+            names.extend(TARGETS.get(target, [target]))
+        order, seen = [], set()
+
+        def visit(name):
+            if name not in self.stages:
+                raise KeyError(f"Unknown stage or target: {name}")
+            if name not in seen:
+                seen.add(name)
+                for dep in self.deps[name]:
+                    visit(dep)
+                order.append(name)
+
+        for name in names:
+            visit(name)
+        return order
+
+    def is_current(self, name, state):
+        stage = self.stages[name]
+        record = state.get(name)
+        if record is None or record["fingerprint"] != self.fingerprint(name):
+            return False
+        return all(self.path(output).exists() and file_hash(self.path(output)) == record["outputs"].get(output)
+                   for output in stage.outputs)
+
+    def status(self, targets=("all",)):
+        """Dict stage name -> "current" or "stale", for the stages behind `targets` (upstream first)."""
+        state = self._load_state()
+        status = {}
+        for name in self.upstream(targets):
+            stale_dep = any(status[dep] == "stale" for dep in self.deps[name])
+            status[name] = "stale" if stale_dep or not self.is_current(name, state) else "current"
+        return status
+
+    def run(self, targets=("all",), max_workers=None, force=False):
+        """
+        Bring the stages behind `targets` up to date.
+
+        Parameters:
+        - targets: Iterable[str] -> stage names or TARGETS keys
+        - max_workers: int -> stages run at once (1 runs everything in this process)
+        - force: bool -> re-run every stage regardless of fingerprints
+
+        Returns:
+        - Dict stage name -> "skipped" or the seconds it took to run
+        """
+        state = self._load_state()
+        order = self.upstream(targets)
+        pending = set(order)
+        done = {}
+        running = {}
+        executor = ProcessPoolExecutor(max_workers=max_workers) if max_workers != 1 else None
+        if self.out_dir != DATA_DIR:
+            self.out_dir.mkdir(parents=True, exist_ok=True)
+            (self.out_dir / "league.json").write_text(json.dumps(self.league, indent=2, sort_keys=True))
+
+        def finish(name, seconds):
+            stage = self.stages[name]
+            state[name] = {"fingerprint": self.fingerprint(name),
+                           "outputs": {output: file_hash(self.path(output)) for output in stage.outputs}}
+            self._save_state(state)
+            done[name] = seconds
+            print(f"[pipeline] {name}: ran in {seconds:.1f}s")
+
+        try:
+            while pending or running:
+                # Stages whose dependencies are all finished; fingerprints are only final at that point
+                for name in [n for n in order if n in pending and all(d in done for d in self.deps[n])]:
+                    pending.discard(name)
+                    if not force and self.is_current(name, state):
+                        done[name] = "skipped"
+                        print(f"[pipeline] {name}: up to date")
+                    elif executor is None:
+                        start = time.perf_counter()
+                        with instrumentation.span(f"stage:{name}"):
+                            self.stages[name].func(self.league, self.stage_dir(name))
+                        finish(name, time.perf_counter() - start)
+                    else:
+                        running[executor.submit(_timed, name, self.stages[name].func, self.league,
+                                                self.stage_dir(name), instrumentation.enabled())] = name
+                if running:
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        seconds, trace = future.result()
+                        if trace is not None:
+                            instrumentation.merge(trace)
+                        finish(running.pop(future), seconds)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+        return done
+
+
+def _timed(name, func, league, out_dir, trace=False):
+    # Worker processes hand their spans back to the parent, which owns the trace file
+    if trace:
+        instrumentation.enable()
+    start = time.perf_counter()
+    with instrumentation.span(f"stage:{name}"):
+        func(league, out_dir)
+    seconds = time.perf_counter() - start
+    recorder = instrumentation.disable()
+    return seconds, recorder.snapshot() if recorder is not None else None
+
+
+def league_params(league, stages=STAGES) -> dict:
+    """The league settings (DEFAULT_LEAGUE plus overrides) that some stage declares in its params."""
+    league = {**DEFAULT_LEAGUE, **(league or {})}
+    return {param: league[param] for stage in stages for param in stage.params}
+
+
+def league_key(league, stages=STAGES) -> str:
+    """Hash of the league settings the stages depend on; others (max_workers, ...) never move outputs."""
+    return hashlib.sha256(json.dumps(league_params(league, stages), sort_keys=True).encode()).hexdigest()[:16]
+
+
+def league_dir(league, stages=STAGES) -> Path:
+    """assets/data when the stages' settings are the default league's, else assets/cache/leagues/<league_key>."""
+    if league_params(league, stages) == league_params(DEFAULT_LEAGUE, stages):
+        return DATA_DIR
+    return LEAGUE_DIR / league_key(league, stages)
+
+
+def load_league(path) -> dict:
+    """League settings from a YAML (PyYAML) or JSON file."""
+    text = open(path).read()
+    if str(path).endswith((".yaml", ".yml")):
+        import yaml
+        return yaml.safe_load(text) or {}
+    return json.loads(text)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m utils.pipeline",
+                                     description="Run the draft-prep stages that are out of date.")
+    parser.add_argument("command", choices=["run", "status"])
+    parser.add_argument("targets", nargs="*", default=["all"], help=f"stages or targets ({', '.join(TARGETS)})")
+    parser.add_argument("--league", help="YAML/JSON file overriding the default league settings")
+    parser.add_argument("--jobs", type=int, default=None, help="stages run at once (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="re-run stages even if they are up to date")
+    parser.add_argument("--trace", metavar="PATH", help="record spans to PATH (.json Chrome trace or .jsonl) "
+                                                        "and print a timing summary, as DRAFT_TRACE=PATH")
+    args = parser.parse_args(argv)
+    if args.trace:
+        instrumentation.enable(args.trace)
+
+    pipeline = Pipeline(league=load_league(args.league) if args.league else None)
+    if pipeline.out_dir != DATA_DIR:
+        print(f"[pipeline] league outputs: {pipeline.out_dir}")
+    if args.command == "status":
+        for name, status in pipeline.status(args.targets).items():
+            print(f"{name:16s}{status}")
+    else:
+        try:
+            pipeline.run(args.targets, max_workers=args.jobs, force=args.force)
+        finally:
+            if args.trace:
+                instrumentation.finish()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Column spellings used across the data files, per field (first match wins)
+FIELD_COLUMNS = {
+    "name": ["name", "Name", "Player", "Player Name", "PLAYER NAME", "player_name"],
+    "position": ["position", "Position", "POS"],
+    "team": ["team", "Team"],
+}
+
+
+def find_column(df: pd.DataFrame, field, column=None):
+    """Column holding `field` ("name", "position", "team") in df: `column` if given, else the first FIELD_COLUMNS match."""
+    if column is not None:
+        return column
+    return next((col for col in FIELD_COLUMNS[field] if col in df.columns), None)
+
+
+def encode_labels(values, dtype=np.int32):
+    """Integer codes (-1 for missing) and the label table of a column, zero-copy for categoricals."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Categorical.codes is a read-only view; Series.cat.codes copies on pandas >= 3
+        return values.array.codes.astype(dtype, copy=False), np.asarray(values.cat.categories, dtype=object)
+    # Factorizing the plain object array skips the extension-array machinery of string columns
+    codes, uniques = pd.factorize(values.to_numpy())
+    return codes.astype(dtype, copy=False), np.asarray(uniques, dtype=object)
+
+
+def _decode(codes, table):
+    labels = np.append(table, None)
+    return labels[np.where(codes >= 0, codes, len(table))]
+
+
+def first_appearance(codes, table) -> list:
+    """Labels of `table` in the order their codes first appear (as pd.unique on the decoded column, missing skipped)."""
+    present = codes[codes >= 0]
+    seen, first = np.unique(present, return_index=True)
+    return [table[c] for c in seen[np.argsort(first, kind="stable")]]
+
+
+class PlayerPool:
+    __slots__ = ("name_table", "name_codes", "position_table", "position_codes", "team_table", "team_codes",
+                 "adp", "proj", "adp_std")
+
+    def __init__(self, name_table, name_codes, position_table, position_codes, adp, proj, adp_std,
+                 team_table=None, team_codes=None):
+        """
+        Struct-of-arrays player table for the hot paths.
+
+        Names, positions and teams are small label tables plus integer codes per player (int32 /
+        int8), so equality tests and per-position selections are integer compares; ADP, projections
+        and ADP std dev are contiguous float64 arrays. Subsets (take, available) share the label
+        tables and only copy the per-player arrays.
+
+        Use PlayerPool.from_frame / to_frame at the edges.
+        """
+        self.name_table = name_table
+        self.name_codes = name_codes
+        self.position_table = position_table
+        self.position_codes = position_codes
+        self.team_table = team_table
+        self.team_codes = team_codes
+        self.adp = adp
+        self.proj = proj
+        self.adp_std = adp_std
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, name_col=None, position_col=None, team_col=None) -> "PlayerPool":
+        """
+        Build a pool from any of the player tables (Name / name, Position / position, ... see FIELD_COLUMNS).
+
+        Float64 ADP / proj_points columns and categorical position / team columns (as load_table
+        returns) are used without copying.
+
+        Parameters:
+        - df: pd.DataFrame with a name and a position column, 'ADP' and 'proj_points' (missing numeric
+          columns become NaN) and optionally team, adp_std, adp_high, adp_low
+        - name_col / position_col / team_col: str -> override the column detection
+        """
+        name_col = find_column(df, "name", name_col)
+        position_col = find_column(df, "position", position_col)
+        team_col = find_column(df, "team", team_col)
+        if name_col is None or position_col is None:
+            raise KeyError("Player table needs a name and a position column, see FIELD_COLUMNS")
+
+        name_codes, name_table = encode_labels(df[name_col], np.int32)
+        # Interned, so names compare by identity across pools built from the same strings
+        name_table = np.array([sys.intern(n) if isinstance(n, str) else n for n in name_table], dtype=object)
+        position_codes, position_table = encode_labels(df[position_col], np.int8)
+        team_codes, team_table = encode_labels(df[team_col], np.int8) if team_col is not None else (None, None)
+
+        # Imported here: availability_model builds on this module
+        from utils.availability_model import adp_std_estimate
+
+        n = len(df)
+        adp = df["ADP"].to_numpy(dtype=np.float64) if "ADP" in df.columns else np.full(n, np.nan)
+        proj = df["proj_points"].to_numpy(dtype=np.float64) if "proj_points" in df.columns else np.full(n, np.nan)
+        adp_std = adp_std_estimate(df) if "ADP" in df.columns else np.full(n, np.nan)
+        return cls(name_table, name_codes, position_table, position_codes, adp, proj, adp_std,
+                   team_table, team_codes)
+
+    @classmethod
+    def coerce(cls, players, name_col=None, position_col=None) -> "PlayerPool":
+        """`players` itself if it is already a PlayerPool, otherwise PlayerPool.from_frame(players)."""
+        if isinstance(players, cls):
+            return players
+        return cls.from_frame(players, name_col=name_col, position_col=position_col)
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame in the normalized schema (name, position, team, ADP, proj_points, adp_std), numeric columns not copied."""
+        columns = {
+            "name": pd.Categorical.from_codes(self.name_codes, self.name_table),
+            "position": pd.Categorical.from_codes(self.position_codes, self.position_table),
+        }
+        if self.team_codes is not None:
+            columns["team"] = pd.Categorical.from_codes(self.team_codes, self.team_table)
+        columns.update({"ADP": self.adp, "proj_points": self.proj, "adp_std": self.adp_std})
+        return pd.DataFrame(columns, copy=False)
+
+    def __len__(self):
+        return len(self.adp)
+
+    @property
+    def names(self) -> np.ndarray:
+        """Name per player (None where the source had none)."""
+        return _decode(self.name_codes, self.name_table)
+
+    def name(self, row):
+        """Name of the player at `row`."""
+        code = self.name_codes[row]
+        return self.name_table[code] if code >= 0 else None
+
+    @property
+    def positions(self) -> np.ndarray:
+        """Position per player (None where the source had none)."""
+        return _decode(self.position_codes, self.position_table)
+
+    def position_order(self) -> list:
+        """Positions in order of first appearance in the pool (as pd.unique on the position column)."""
+        return first_appearance(self.position_codes, self.position_table)
+
+    def position_code(self, position) -> int:
+        """Code of `position`, -1 if no player has it."""
+        matches = np.flatnonzero(self.position_table == position)
+        return int(matches[0]) if len(matches) else -1
+
+    def rows(self, position=None, available=None) -> np.ndarray:
+        """Row numbers of the players at `position` (all positions if None) that are `available` (a bool mask)."""
+        mask = np.ones(len(self), dtype=bool) if available is None else available.copy()
+        if position is not None:
+            mask &= self.position_codes == self.position_code(position)
+        return np.flatnonzero(mask)
+
+    def take(self, rows) -> "PlayerPool":
+        """Pool of the given rows (in that order), sharing the label tables."""
+        rows = np.asarray(rows)
+        return PlayerPool(self.name_table, self.name_codes[rows], self.position_table, self.position_codes[rows],
+                          self.adp[rows], self.proj[rows], self.adp_std[rows], self.team_table,
+                          self.team_codes[rows] if self.team_codes is not None else None)
+
+    def with_adp(self, adp) -> "PlayerPool":
+        """Same players with another ADP array (e.g. simulated ADP fed back); everything else, adp_std included, is shared."""
+        return PlayerPool(self.name_table, self.name_codes, self.position_table, self.position_codes,
+                          np.asarray(adp, dtype=np.float64), self.proj, self.adp_std, self.team_table, self.team_codes)
+
+    def available(self, drafted) -> "PlayerPool":
+        """Pool of the players not flagged in the `drafted` bool mask."""
+        return self.take(np.flatnonzero(~np.asarray(drafted, dtype=bool)))
@@ -0,0 +1,243 @@
+import re
+import unicodedata
+import zlib
+
+import numpy as np
+import pandas as pd
+from paths import PROJECT_ROOT
+
+CROSSWALK_PATH = PROJECT_ROOT / "assets" / "data" / "player_crosswalk.csv"
+CROSSWALK_COLUMNS = ["player_id", "source", "source_name", "position", "team", "name_key"]
+
+POSITIONS = {"QB", "RB", "WR", "TE", "PK", "DEF"}
+POSITION_ALIASES = {"K": "PK", "D/ST": "DEF", "DST": "DEF"}
+TEAMS = {"ARI", "ATL", "BAL", "BUF", "CAR", "CHI", "CIN", "CLE", "DAL", "DEN", "DET", "GB", "HOU", "IND", "JAX", "KC",
+         "LAC", "LAR", "LV", "MIA", "MIN", "NE", "NO", "NYG", "NYJ", "PHI", "PIT", "SEA", "SF", "TB", "TEN", "WAS"}
+TEAM_ALIASES = {"WSH": "WAS", "JAC": "JAX"}
+NAME_SUFFIXES = {"jr", "sr", "ii", "iii", "iv", "v"}
+# Nicknames that no string similarity bridges, as normalized names
+NAME_ALIASES = {"hollywood brown": "marquise brown"}
+
+# Names are compared as sets of character trigrams hashed into a fixed-width bit signature
+SIGNATURE_WORDS = 8
+# Set bits of every byte value, so popcounts work on any NumPy
+POPCOUNT = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+
+
+def normalize_name(name) -> str:
+    """Lower-case ASCII name without punctuation or generational suffixes ("Aaron Jones Sr." -> "aaron jones")."""
+    if not isinstance(name, str):
+        return ""
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode().lower()
+    name = re.sub(r"[.'`]", "", name)
+    tokens = [token for token in re.split(r"[^a-z0-9]+", name) if token]
+    while len(tokens) > 1 and tokens[-1] in NAME_SUFFIXES:
+        tokens.pop()
+    # Spaced initials ("D. J. Moore") read the same as joined ones ("DJ Moore")
+    name = re.sub(r"\b([a-z]) (?=[a-z]\b)", r"\1", " ".join(tokens))
+    return NAME_ALIASES.get(name, name)
+
+
+def normalize_position(values: pd.Series) -> pd.Series:
+    """Source positions to QB/RB/WR/TE/PK/DEF ("WR1" -> "WR", "K" -> "PK", "WR, CB" -> "WR"); NaN otherwise."""
+    position = values.astype(str).str.upper().str.split(",").str[0].str.strip().str.replace(r"\d+$", "", regex=True)
+    position = position.replace(POSITION_ALIASES)
+    return position.where(position.isin(POSITIONS))
+
+
+def normalize_team(values: pd.Series) -> pd.Series:
+    """Source team codes to upper-case league codes ("Cin" -> "CIN", "Wsh" -> "WAS"); NaN for free agents etc."""
+    team = values.astype(str).str.upper().str.strip().replace(TEAM_ALIASES)
+    return team.where(team.isin(TEAMS))
+
+
+def normalize_source(df: pd.DataFrame, name_col="name", position_col="position", team_col="team") -> pd.DataFrame:
+    """
+    Matching keys for every row of a source table.
+
+    Returns:
+    - pd.DataFrame with columns source_name, name_key, position, team (same index as df). Defenses are
+      keyed by team, since every source names them differently (city, nickname, "49ers D/ST").
+    """
+    nan = pd.Series(np.nan, index=df.index, dtype=object)
+    raw_position = df[position_col] if position_col in df.columns else nan
+    position = normalize_position(raw_position)
+    team = normalize_team(df[team_col]) if team_col in df.columns else nan
+    # Some exports shift the team into the position column (ESPN rows with an injury designation)
+    team = team.fillna(normalize_team(raw_position).where(position.isna()))
+
+    names = df[name_col]
+    name_keys = dict(zip(pd.unique(names), map(normalize_name, pd.unique(names))))
+    name_key = names.map(name_keys)
+    name_key = name_key.where(position != "DEF", team.str.lower())
+
+    return pd.DataFrame({"source_name": names.astype(str), "name_key": name_key.fillna(""),
+                         "position": position, "team": team}, index=df.index)
+
+
+def name_signature(name_key: str) -> np.ndarray:
+    """Trigram set of a normalized name as a (SIGNATURE_WORDS,) uint64 bit signature."""
+    signature = np.zeros(SIGNATURE_WORDS, dtype=np.uint64)
+    n_bits = 64 * SIGNATURE_WORDS
+    padded = f"  {name_key} "
+    for j in range(len(padded) - 2):
+        bit = zlib.crc32(padded[j:j + 3].encode()) % n_bits
+        signature[bit // 64] |= np.uint64(1) << np.uint64(bit % 64)
+    return signature
+
+
+def name_similarity(signatures_a: np.ndarray, signatures_b: np.ndarray) -> np.ndarray:
+    """Row-wise trigram Jaccard similarity of two (n, SIGNATURE_WORDS) signature arrays."""
+    shared = _popcount(signatures_a & signatures_b)
+    total = _popcount(signatures_a | signatures_b)
+    return np.divide(shared, total, out=np.zeros(len(shared)), where=total > 0)
+
+
+def _popcount(signatures: np.ndarray) -> np.ndarray:
+    """Set bits per row of a (n, SIGNATURE_WORDS) uint64 array."""
+    as_bytes = np.ascontiguousarray(signatures).view(np.uint8)
+    return POPCOUNT[as_bytes].sum(axis=1, dtype=np.int64)
+
+
+def _block_keys(keys: pd.DataFrame) -> pd.DataFrame:
+    """(row, block) pairs: exact name, and team + 3-letter prefix of the first or the last name token."""
+    tokens = keys["name_key"].str.split()
+    team = keys["team"].fillna("")
+    blocks = [
+        "n|" + keys["name_key"],
+        "f|" + team + "|" + tokens.str[0].fillna("").str[:3],
+        "l|" + team + "|" + tokens.str[-1].fillna("").str[:3],
+    ]
+    has_team = keys["team"].notna().to_numpy()
+    return pd.DataFrame({
+        "row": np.concatenate([np.arange(len(keys))] + [np.flatnonzero(has_team)] * 2),
+        "block": np.concatenate([blocks[0].to_numpy()] + [b.to_numpy()[has_team] for b in blocks[1:]]),
+    })
+
+
+class PlayerRegistry:
+    def __init__(self, crosswalk: pd.DataFrame = None, threshold=0.5):
+        """
+        Stable player IDs across projection and ADP sources.
+
+        The crosswalk holds one row per (source, source name, position) with its player_id. Rows already
+        in the crosswalk resolve by an indexed join. New rows are matched against every known player
+        name/team: candidates come from blocking keys (exact normalized name, or same team and same
+        3-letter prefix of the first or last name), must agree on position when both sides have one,
+        and are scored by trigram similarity. Matches are assigned greedily by score, one source row
+        per player; anything below `threshold` becomes a new player.
+
+        Parameters:
+        - crosswalk: pd.DataFrame with CROSSWALK_COLUMNS (empty registry if omitted)
+        - threshold: float -> minimum name similarity (0-1) for a fuzzy match
+        """
+        if crosswalk is None:
+            crosswalk = pd.DataFrame({col: pd.Series(dtype=object) for col in CROSSWALK_COLUMNS})
+        self.crosswalk = crosswalk[CROSSWALK_COLUMNS].reset_index(drop=True)
+        self.crosswalk["player_id"] = self.crosswalk["player_id"].astype(np.int64)
+        self.threshold = threshold
+        self._signatures = {}
+
+    @classmethod
+    def load(cls, path=CROSSWALK_PATH, threshold=0.5):
+        """Registry from a crosswalk CSV written by save() (empty if the file does not exist yet)."""
+        if not path.exists():
+            return cls(threshold=threshold)
+        crosswalk = pd.read_csv(path, dtype={"source": str, "source_name": str, "position": str, "team": str,
+                                             "name_key": str}, keep_default_na=False, na_values=[""])
+        return cls(crosswalk, threshold=threshold)
+
+    def save(self, path=CROSSWALK_PATH):
+        self.crosswalk.sort_values(["player_id", "source"], kind="stable").to_csv(path, index=False)
+
+    def _next_id(self):
+        return int(self.crosswalk["player_id"].max()) + 1 if len(self.crosswalk) else 1
+
+    def _name_signatures(self, name_keys) -> np.ndarray:
+        """Signatures for an array of normalized names, each distinct name hashed once per registry."""
+        unique_keys, inverse = np.unique(name_keys, return_inverse=True)
+        for key in unique_keys:
+            if key not in self._signatures:
+                self._signatures[key] = name_signature(key)
+        return np.stack([self._signatures[key] for key in unique_keys])[inverse.ravel()]
+
+    def _match(self, keys: pd.DataFrame, taken=()) -> np.ndarray:
+        """Fuzzy-match new source rows against the known players; -1 where nothing clears the threshold."""
+        known = self.crosswalk.drop_duplicates(["player_id", "name_key", "position", "team"]).reset_index(drop=True)
+        matched = np.full(len(keys), -1, dtype=np.int64)
+        if not len(known) or not len(keys):
+            return matched
+
+        pairs = _block_keys(keys).merge(_block_keys(known), on="block", suffixes=("_new", "_known"))
+        pairs = pairs.drop_duplicates(["row_new", "row_known"])
+        new_rows = pairs["row_new"].to_numpy()
+        known_rows = pairs["row_known"].to_numpy()
+
+        # Compare on shared integer codes so per-pair work is plain array indexing
+        def codes(column):
+            values, _ = pd.factorize(pd.concat([keys[column], known[column]], ignore_index=True), use_na_sentinel=True)
+            return values[:len(keys)][new_rows], values[len(keys):][known_rows]
+
+        new_position, known_position = codes("position")
+        compatible = (new_position < 0) | (known_position < 0) | (new_position == known_position)
+        new_team, known_team = codes("team")
+        same_team = (new_team >= 0) & (new_team == known_team)
+
+        new_names = keys["name_key"].to_numpy(dtype=str)
+        known_names = known["name_key"].to_numpy(dtype=str)
+        score = name_similarity(self._name_signatures(new_names)[new_rows], self._name_signatures(known_names)[known_rows])
+
+        # Short first names ("Cam Ward" / "Cameron Ward") only count on the same team and last name
+        last_name = pd.concat([keys["name_key"], known["name_key"]], ignore_index=True).str.split().str[-1]
+        last_codes, _ = pd.factorize(last_name)
+        check = np.flatnonzero(same_team & (last_codes[:len(keys)][new_rows] == last_codes[len(keys):][known_rows]))
+        new_first = np.char.partition(new_names[new_rows[check]], " ")[:, 0]
+        known_first = np.char.partition(known_names[known_rows[check]], " ")[:, 0]
+        short_first = np.char.startswith(new_first, known_first) | np.char.startswith(known_first, new_first)
+        score[check[short_first]] = np.maximum(score[check[short_first]], 0.9)
+
+        candidates = pd.DataFrame({"row": new_rows, "player_id": known["player_id"].to_numpy()[known_rows],
+                                   "score": score, "same_team": same_team})
+        candidates = candidates[compatible & (score >= self.threshold)]
+        candidates = candidates.sort_values(["score", "same_team"], ascending=False, kind="stable")
+
+        # Greedy one-to-one: a source lists each player once
+        taken = set(taken)
+        for row, player_id in zip(candidates["row"].to_numpy(), candidates["player_id"].to_numpy()):
+            if matched[row] < 0 and player_id not in taken:
+                matched[row] = player_id
+                taken.add(player_id)
+        return matched
+
+    def resolve(self, df: pd.DataFrame, source: str, name_col="name", position_col="position", team_col="team"):
+        """
+        Player ID for every row of a source table, registering new players and crosswalk rows as needed.
+
+        Parameters:
+        - df: pd.DataFrame -> source table
+        - source: str -> stable source label (e.g. "espn_2025_projections")
+        - name_col, position_col, team_col: str -> source column names (position/team may be missing)
+
+        Returns:
+        - np.ndarray[int] of player IDs aligned with df's rows
+        """
+        keys = normalize_source(df, name_col, position_col, team_col).reset_index(drop=True)
+        keys["source"] = source
+
+        lookup_cols = ["source", "source_name", "position"]
+        known = self.crosswalk[self.crosswalk["source"] == source].drop_duplicates(lookup_cols, keep="last")
+        player_ids = keys[lookup_cols].merge(known[lookup_cols + ["player_id"]], on=lookup_cols, how="left")["player_id"]
+        player_ids = player_ids.fillna(-1).to_numpy(dtype=np.int64)
+
+        new = np.flatnonzero(player_ids < 0)
+        if len(new):
+            new_keys = keys.iloc[new].reset_index(drop=True)
+            # IDs this source already claims cannot be matched again
+            matched = self._match(new_keys, taken=set(player_ids[player_ids >= 0]))
+            unmatched = matched < 0
+            matched[unmatched] = np.arange(self._next_id(), self._next_id() + unmatched.sum())
+            player_ids[new] = matched
+
+            new_keys["player_id"] = matched
+            self.crosswalk = pd.concat([self.crosswalk, new_keys[CROSSWALK_COLUMNS]], ignore_index=True)
+        return player_ids
@@ -0,0 +1,257 @@
+import asyncio
+import hashlib
+import json
+import os
+import urllib.error
+import urllib.request
+
+import pandas as pd
+from utils.data_access import CACHE_DIR
+from utils.player_registry import normalize_position, normalize_team
+
+HTTP_CACHE_DIR = CACHE_DIR / "http"
+
+# Status codes worth retrying; anything else (404, 400, ...) fails right away
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+ESPN_POSITIONS = {1: "QB", 2: "RB", 3: "WR", 4: "TE", 5: "K", 16: "D/ST"}
+ESPN_TEAMS = {
+    0: "FA", 1: "Atl", 2: "Buf", 3: "Chi", 4: "Cin", 5: "Cle", 6: "Dal", 7: "Den", 8: "Det", 9: "GB", 10: "Ten",
+    11: "Ind", 12: "KC", 13: "LV", 14: "LAR", 15: "Mia", 16: "Min", 17: "NE", 18: "NO", 19: "NYG", 20: "NYJ",
+    21: "Phi", 22: "Ari", 23: "Pit", 24: "LAC", 25: "SF", 26: "Sea", 27: "TB", 28: "Wsh", 29: "Car", 30: "Jax",
+    33: "Bal", 34: "Hou",
+}
+
+
+class FetchError(RuntimeError):
+    pass
+
+
+class ResponseCache:
+    def __init__(self, cache_dir=HTTP_CACHE_DIR):
+        """
+        Raw HTTP response bodies on disk, keyed by sha256 of the URL and request headers, so a
+        refresh can be replayed (or parsed again) without touching the network.
+        """
+        self.cache_dir = cache_dir
+
+    def _path(self, url, headers):
+        key = hashlib.sha256(json.dumps([url, sorted((headers or {}).items())]).encode()).hexdigest()
+        return self.cache_dir / f"{key}.body"
+
+    def get(self, url, headers=None):
+        path = self._path(url, headers)
+        return path.read_bytes() if path.exists() else None
+
+    def put(self, url, headers, body: bytes):
+        path = self._path(url, headers)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Per-process temp name, so concurrent refreshes never write into each other's file
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(body)
+        tmp.replace(path)
+
+
+class Fetcher:
+    def __init__(self, max_concurrency=8, retries=3, backoff=0.5, timeout=10.0, cache: ResponseCache = None,
+                 mode="cache"):
+        """
+        Concurrent HTTP GETs with bounded concurrency, retries and exponential backoff.
+
+        Requests run on worker threads (urllib) under an asyncio semaphore, so many pages are in
+        flight at once without a third-party HTTP client.
+
+        Parameters:
+        - max_concurrency: int -> requests in flight at once
+        - retries: int -> extra attempts after a connection error or a RETRY_STATUS response
+        - backoff: float -> seconds before the first retry, doubled on each further one
+        - timeout: float -> per-request timeout in seconds
+        - cache: ResponseCache -> raw response store (None disables caching)
+        - mode: str -> "cache" (use cached bodies, fetch the rest), "refresh" (always fetch, update
+          the cache) or "replay" (cache only, fail on a miss)
+        """
+        if mode not in ("cache", "refresh", "replay"):
+            raise ValueError(f"Unknown mode: {mode}")
+        self.max_concurrency = max_concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.cache = cache
+        self.mode = mode
+        self.n_requests = 0
+        self._semaphore = None
+        self._loop = None
+
+    def _get(self, url, headers):
+        request = urllib.request.Request(url, headers=headers or {})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return response.read()
+
+    async def fetch(self, url, headers=None) -> bytes:
+        """Body of a GET request to `url` (from the cache where the mode allows)."""
+        if self.cache is not None and self.mode != "refresh":
+            body = self.cache.get(url, headers)
+            if body is not None:
+                return body
+        if self.mode == "replay":
+            raise FetchError(f"Not in cache: {url}")
+
+        # One semaphore per event loop, so a Fetcher can be reused across asyncio.run calls
+        if self._loop is not asyncio.get_running_loop():
+            self._loop = asyncio.get_running_loop()
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        for attempt in range(self.retries + 1):
+            # Only the request holds a slot; a request backing off leaves it to others
+            async with self._semaphore:
+                try:
+                    self.n_requests += 1
+                    body = await asyncio.to_thread(self._get, url, headers)
+                    break
+                except urllib.error.HTTPError as e:
+                    if e.code not in RETRY_STATUS or attempt == self.retries:
+                        raise FetchError(f"GET {url} failed with HTTP {e.code}") from e
+                except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+                    if attempt == self.retries:
+                        raise FetchError(f"GET {url} failed: {e}") from e
+            await asyncio.sleep(self.backoff * 2 ** attempt)
+
+        if self.cache is not None:
+            self.cache.put(url, headers, body)
+        return body
+
+    async def fetch_all(self, requests) -> list:
+        """Bodies for a list of (url, headers) requests, in order."""
+        return await asyncio.gather(*(self.fetch(url, headers) for url, headers in requests))
+
+
+class ProjectionSource:
+    """
+    A source is a list of requests plus a parser from their raw bodies to the normalized schema
+    (lower-case name, position, team and the source's numeric columns, as utils.data_access).
+    Subclasses set `name` and implement requests() and parse().
+    """
+    name = None
+
+    def requests(self) -> list:
+        raise NotImplementedError
+
+    def parse(self, bodies: list) -> pd.DataFrame:
+        raise NotImplementedError
+
+
+class EspnProjectionsSource(ProjectionSource):
+    name = "espn_projections"
+
+    def __init__(self, season=2025, max_players=600, page_size=50, league_format=3,
+                 base_url="https://lm-api-reads.fantasy.espn.com/apis/v3/games/ffl"):
+        """
+        ESPN season projections from the fantasy API (the JSON behind the projections page), one request
+        per page of `page_size` players sorted by projected points.
+
+        Parameters:
+        - season: int
+        - max_players: int -> players to pull
+        - page_size: int -> players per request
+        - league_format: int -> ESPN scoring format id (3 = PPR, as the projections page)
+        - base_url: str -> API root (point at a local fixture server to run offline)
+        """
+        self.season = season
+        self.max_players = max_players
+        self.page_size = page_size
+        self.league_format = league_format
+        self.base_url = base_url.rstrip("/")
+
+    def requests(self):
+        url = (f"{self.base_url}/seasons/{self.season}/segments/0/leaguedefaults/{self.league_format}"
+               f"?view=kona_player_info")
+        requests = []
+        for offset in range(0, self.max_players, self.page_size):
+            player_filter = {"players": {
+                "limit": min(self.page_size, self.max_players - offset),
+                "offset": offset,
+                "sortAppliedStatTotal": {"sortAsc": False, "sortPriority": 1, "value": f"10{self.season}"},
+            }}
+            requests.append((url, {"X-Fantasy-Filter": json.dumps(player_filter), "Accept": "application/json"}))
+        return requests
+
+    def parse(self, bodies):
+        rows = []
+        for body in bodies:
+            for entry in json.loads(body).get("players", []):
+                player = entry.get("player", entry)
+                # statSourceId 1 is a projection, statSplitTypeId 0 the whole season
+                proj_points = next((stat.get("appliedTotal", 0.0) for stat in player.get("stats", [])
+                                    if stat.get("statSourceId") == 1 and stat.get("statSplitTypeId") == 0
+                                    and stat.get("seasonId") == self.season), 0.0)
+                rows.append({
+                    "name": player.get("fullName"),
+                    "position": ESPN_POSITIONS.get(player.get("defaultPositionId")),
+                    "team": ESPN_TEAMS.get(player.get("proTeamId")),
+                    "proj_points": round(float(proj_points), 1),
+                })
+        df = pd.DataFrame(rows, columns=["name", "position", "team", "proj_points"])
+        # ESPN spellings ("K", "D/ST", "Wsh") to the registry's; free agents get no team
+        df["position"] = normalize_position(df["position"])
+        df["team"] = normalize_team(df["team"])
+        # "Texans D/ST" -> "HOU": defenses are named by team code, as in the cleaned tables
+        defense = df["position"] == "DEF"
+        df.loc[defense, "name"] = df.loc[defense, "team"]
+        # Different players can share a name; the same player on two pages cannot change team
+        df = df.drop_duplicates(["name", "position", "team"])
+        return df[df["proj_points"] > 0].reset_index(drop=True)
+
+
+class FfcAdpSource(ProjectionSource):
+    name = "ffc_adp"
+
+    def __init__(self, season=2025, scoring="ppr", teams=12,
+                 base_url="https://fantasyfootballcalculator.com/api/v1/adp"):
+        """
+        Fantasy Football Calculator ADP (the source of FantasyFootball_2025_PPR_ADP_Rankings.csv).
+
+        Parameters:
+        - season: int
+        - scoring: str -> "ppr", "half-ppr", "standard", ...
+        - teams: int -> league size the ADP was collected for
+        - base_url: str -> API root (point at a local fixture server to run offline)
+        """
+        self.season = season
+        self.scoring = scoring
+        self.teams = teams
+        self.base_url = base_url.rstrip("/")
+
+    def requests(self):
+        return [(f"{self.base_url}/{self.scoring}?teams={self.teams}&year={self.season}", {"Accept": "application/json"})]
+
+    def parse(self, bodies):
+        players = json.loads(bodies[0]).get("players", [])
+        df = pd.DataFrame(players)
+        columns = {"name": "name", "position": "position", "team": "team", "adp": "ADP", "stdev": "adp_std",
+                   "high": "adp_high", "low": "adp_low", "times_drafted": "times_drafted", "bye": "bye"}
+        df = df.reindex(columns=list(columns)).rename(columns=columns)
+        # "Dallas Defense" -> "Dallas", as in the site's CSV export
+        defense = df["position"] == "DEF"
+        df.loc[defense, "name"] = df.loc[defense, "name"].str.removesuffix(" Defense")
+        return df.sort_values("ADP", kind="stable").reset_index(drop=True)
+
+
+async def fetch_sources_async(sources, fetcher: Fetcher) -> dict:
+    """Fetch every source's requests concurrently (sharing the fetcher's concurrency limit) and parse them."""
+    bodies = await asyncio.gather(*(fetcher.fetch_all(source.requests()) for source in sources))
+    return {source.name: source.parse(source_bodies) for source, source_bodies in zip(sources, bodies)}
+
+
+def fetch_sources(sources, fetcher: Fetcher = None) -> dict:
+    """
+    Synchronous entry point: fetch and parse several sources.
+
+    Parameters:
+    - sources: List[ProjectionSource]
+    - fetcher: Fetcher -> defaults to Fetcher(cache=ResponseCache())
+
+    Returns:
+    - Dict[str, pd.DataFrame] -> normalized table per source name
+    """
+    if fetcher is None:
+        fetcher = Fetcher(cache=ResponseCache())
+    return asyncio.run(fetch_sources_async(sources, fetcher))
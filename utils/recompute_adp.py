@@ -1,17 +1,20 @@
+import os
 import pandas as pd
-import random
-from collections import defaultdict
+import time
+from statistics import NormalDist
 from paths import PROJECT_ROOT
 import numpy as np
+from utils.data_access import load_table
+from utils.draft_simulator import DraftSimulator
+from utils.instrumentation import record, span
+from utils.parallel_adp import ParallelDraftRunner
+from utils.player_pool import PlayerPool
 
 # Load VOR playbook
-filename = "vor_playbook.csv"
-playbook_filepath = PROJECT_ROOT / "assets" / "data" / filename
-vor_df = pd.read_csv(playbook_filepath)
+vor_df = load_table("vor_playbook.csv")
 
 # Load player projection data
-player_data_path = PROJECT_ROOT / "assets" / "data" / "2024_retrospective_data.csv"
-player_df = pd.read_csv(player_data_path)
+player_df = load_table("2024_retrospective_data.csv")
 
 # Positional limits (starter slots)
 position_limits = {
@@ -23,120 +26,168 @@ position_limits = {
     "PK": 1
 }
 
-# Helper to generate snake draft order
-def generate_snake_order(num_teams=12, rounds=8):
-    order = []
-    for r in range(rounds):
-        if r % 2 == 0:
-            order += list(range(1, num_teams + 1))
-        else:
-            order += list(range(num_teams, 0, -1))
-    return order
-
-# Draft simulation core
-def simulate_draft(player_df, num_teams=12, rounds=8):
-    snake_order = generate_snake_order(num_teams, rounds)
-    pick_to_team = {i + 1: team for i, team in enumerate(snake_order)}
-    team_rosters = {i: defaultdict(int) for i in range(1, num_teams + 1)}
-    team_picks = {i: [] for i in range(1, num_teams + 1)}
-    available = player_df.copy()
-
-    for i, pick_num in enumerate(range(1, num_teams * rounds + 1)):
-        team = pick_to_team[pick_num]
-        next_pick_num = pick_num + num_teams if (i + num_teams) < num_teams * rounds else pick_num + 12
-        pick = make_pick(available, team_rosters[team], next_pick_num)
-
-        if pick is not None:
-            team_picks[team].append((pick_num, pick['name'], pick['position'], pick['proj_points']))
-            team_rosters[team][pick['position']] += 1
-            available = available[available['name'] != pick['name']]
-
-    return team_picks
+# Simulator behind simulate_draft / make_pick, kept while they are called with the same pool
+_simulator_cache = None
+
+
+def _simulator(players):
+    global _simulator_cache
+    if _simulator_cache is None or _simulator_cache[0] is not players:
+        _simulator_cache = (players, DraftSimulator(players, position_limits))
+    return _simulator_cache[1]
+
+
+# Draft simulation core (array-backed, see utils/draft_simulator.py)
+def simulate_draft(player_df, num_teams=12, rounds=8, rng=None):
+    """
+    One snake draft (DraftSimulator.simulate). The simulator is built once per player table object
+    and reused while the same table is passed in, so modify a copy rather than the table in place.
+    """
+    return _simulator(player_df).simulate(num_teams, rounds, rng)
+
 
 # Sub-function to make a single pick
-def make_pick(pool, roster, next_pick):
-    replacement_pool = pool[pool['ADP'] >= next_pick]
-    pos_vor = {}
-
-    for pos in pool['position'].unique():
-        expected_proj = pool[pool['position'] == pos]['proj_points'].max()
-        replacement_proj = replacement_pool[replacement_pool['position'] == pos]['proj_points'].max()
-        vor = expected_proj - replacement_proj
-
-        if pos not in roster or roster[pos] < position_limits.get(pos, 99):
-            pos_vor[pos] = vor
-        elif pos in ["RB", "WR", "TE"]:
-            flex_limit = position_limits["RB"] + position_limits["WR"] + position_limits["TE"] + position_limits["FLEX"]
-            flex_count = roster["RB"] + roster["WR"] + roster["TE"]
-            if flex_count < flex_limit:
-                pos_vor[pos] = vor
-
-    best_pos = max(pos_vor, key=pos_vor.get)
-    best_points = pool[pool['position'] == best_pos]['proj_points'].max()
-    candidates = pool[(pool['position'] == best_pos) & (pool['proj_points'] > best_points*0.9)]
-    candidate = candidates.sample(1).iloc[0] if not candidates.empty else None
-    return candidate
+def make_pick(pool, roster, next_pick, rng=None):
+    """
+    Choose one player for a team: the position with the highest VOR (best remaining projection minus
+    the best one expected to last until next_pick) among the open ones, then a random player within
+    90% of that position's best projection (DraftSimulator.make_pick on a draft where everyone in
+    `pool` is still available).
+
+    Parameters:
+    - pool: PlayerPool, or pd.DataFrame with columns [name, position, 'ADP', 'proj_points'], of the
+      players still available
+    - roster: Dict[str, int] -> players drafted so far by position
+    - next_pick: int -> overall number of the team's next pick
+    - rng: np.random.Generator or seed passed to np.random.default_rng
+
+    Returns:
+    - the chosen row (an int for a PlayerPool, the DataFrame row otherwise), None if no candidate qualifies
+    """
+    simulator = _simulator(pool)
+    row = simulator.make_pick(simulator.new_draft(), roster, next_pick, np.random.default_rng(rng))
+    if row is None:
+        return None
+    return row if isinstance(pool, PlayerPool) else pool.iloc[row]
+
+
+# ADP fed back for players no simulated draft picked
+UNDRAFTED_ADP = 150
+
 
 # Run iterative simulation to convergence
 
-def run_iterative_simulation(player_df, max_iters=50, tolerance=0.05):
+
+def run_iterative_simulation(player_df, max_iters=50, tolerance=0.05, n_drafts=1000, rng=None, max_workers=None,
+                             damping=1.0, average=False, stop="ci", confidence=0.95, min_share=0.5, scorer=None,
+                             return_convergence=False):
+    """
+    Re-simulate drafts, feeding each iteration's simulated ADP back in, until ADP stops moving.
+
+    Every iteration runs `n_drafts` drafts in lock-step (DraftSimulator.simulate_batch), or over a
+    process pool with max_workers set (ParallelDraftRunner; for a given seed the results do not depend
+    on the worker count). Pick counts and sums are accumulated per player row with bincounts, and the
+    ADP fed back is an array over the same rows, so the loop does no per-name DataFrame work.
+
+    The ADP fed back is a player's mean pick over all drafts of the iteration, a draft that did not
+    take them counting as UNDRAFTED_ADP. The next iteration's ADP moves towards it by `damping`
+    (1 replaces it outright). With average=True, once ADP is near convergence the steps become
+    1/2, 1/3, ..., averaging the remaining simulation noise and back-and-forth out of the ADP.
+
+    The residual of an iteration is |fed-back minus input ADP| over the players taken in at least
+    `min_share` of the drafts. stop="ci" stops once the upper `confidence` bound of the mean residual
+    beyond sampling noise (sqrt(2/pi) standard errors per player) is below `tolerance` picks;
+    stop="tolerance" stops once the raw mean residual is below `tolerance`.
+
+    Team point totals are season projections summed, or weekly best-lineup points with a `scorer`
+    (weekly_projections.LineupScorer); they do not feed back into the ADP.
+
+    Returns:
+    - Tuple[pd.DataFrame, List[pd.DataFrame], List[List[float]]] -> final name / sim_adp,
+      per-iteration ADP tables (name, sim_adp, position; sim_adp over the drafts that took the player)
+      and per-iteration team point totals; with return_convergence=True also a per-iteration
+      convergence table (iteration, residual, max_residual, excess_bound, players, converged)
+    """
+    if stop not in ("ci", "tolerance"):
+        raise ValueError(f"Unknown stop rule: {stop}")
+    rng = np.random.default_rng(rng)
+    working_df = player_df.reset_index(drop=True)
+    pool = PlayerPool.from_frame(working_df)
+    adp = pool.adp
+    runner = ParallelDraftRunner(working_df, position_limits, max_workers, scorer=scorer) if max_workers else None
+    simulator = DraftSimulator(pool, position_limits)
+    z_crit = NormalDist().inv_cdf(confidence)
     adp_history = []
     total_points_history = []
-    prev_adp = None
-    working_df = player_df.copy()
-
-    for i in range(max_iters):
-        pick_records = defaultdict(list)
-        team_points = []
-
-        sim_result = simulate_draft(working_df)
-        for team in sim_result:
-            total_points = sum([x[3] for x in sim_result[team]])
-            team_points.append(total_points)
-            for pick_num, name, pos, proj in sim_result[team]:
-                pick_records[name].append(pick_num)
-
-        adp_data = [
-            {"name": name, "position": player_df[player_df['name'] == name]['position'].values[0],
-             "sim_adp": sum(picks) / len(picks), "times_drafted": len(picks)}
-            for name, picks in pick_records.items()
-        ]
-
-        adp_df = pd.DataFrame(adp_data).sort_values("sim_adp")
-        adp_df = adp_df.merge(player_df[['name', 'proj_points']], on='name')
-        adp_history.append(adp_df[['name', 'sim_adp', 'position']].copy())
-        total_points_history.append(team_points)
-
-        # Convergence check
-        if prev_adp is not None:
-            merged = prev_adp.merge(adp_df[['name', 'sim_adp']], on='name', suffixes=('_prev', '_curr'))
-            merged['abs_diff'] = abs(merged['sim_adp_prev'] - merged['sim_adp_curr'])
-            avg_change = merged['abs_diff'].mean()
-            print(f"Iteration {i+1}: Δ ADP = {avg_change:.3f}, Avg Total Points = {np.mean(team_points):.1f}, Spread = {np.std(team_points):.1f}")
-            if avg_change < tolerance:
+    convergence = []
+    averaging_from = None
+
+    try:
+        for i in range(max_iters):
+            iteration_start = time.perf_counter()
+            simulator.set_adp(adp)
+            if runner is not None:
+                with span("ParallelDraftRunner.run", n_drafts=n_drafts):
+                    sums, team_points = runner.run_sums(n_drafts, seed=int(rng.integers(2 ** 63)), adp=adp)
+            else:
+                pick_rows = simulator.simulate_batch(n_drafts, rng=rng)
+                sums, team_points = simulator.pick_sums(pick_rows), simulator.team_points(pick_rows, scorer=scorer)
+            adp_df = simulator.statistics_from_sums(sums)
+            adp_history.append(adp_df[['name', 'sim_adp', 'position']])
+            total_points_history.append(team_points.ravel().tolist())
+
+            # ADP fed back: mean pick over all drafts, a draft that skips the player counting as UNDRAFTED_ADP,
+            # so a player's ADP moves smoothly with how often they are taken rather than jumping to 150
+            count = sums["count"]
+            skipped = n_drafts - count
+            sim_adp = (sums["pick_sum"] + skipped * UNDRAFTED_ADP) / n_drafts
+            sq_mean = (sums["pick_sq_sum"] + skipped * UNDRAFTED_ADP ** 2) / n_drafts
+            std_err = np.sqrt(np.clip(sq_mean - sim_adp ** 2, 0, None) / max(n_drafts - 1, 1))
+
+            # Residual beyond sampling noise (E|noise| = sqrt(2/pi) * standard error) over regularly drafted
+            # players, and the upper confidence bound of its mean
+            core = count >= max(min_share * n_drafts, 1)
+            residual = np.abs(sim_adp[core] - adp[core])
+            excess = residual - np.sqrt(2 / np.pi) * std_err[core] if n_drafts > 1 else residual
+            mean_residual = float(residual.mean()) if len(residual) else 0.0
+            bound = (float(excess.mean() + z_crit * excess.std(ddof=1) / np.sqrt(len(excess)))
+                     if len(excess) > 1 else np.inf)
+            converged = (bound if stop == "ci" else mean_residual) < tolerance
+            convergence.append({"iteration": i + 1, "residual": mean_residual,
+                                "max_residual": float(residual.max()) if len(residual) else 0.0,
+                                "excess_bound": bound, "players": int(core.sum()), "converged": converged})
+            record("adp_iteration", iteration=i + 1, residual=mean_residual, mean_points=float(np.mean(team_points)),
+                   seconds=time.perf_counter() - iteration_start)
+            print(f"Iteration {i+1}: residual = {mean_residual:.3f} (beyond noise < {bound:.3f}), "
+                  f"Avg Total Points = {np.mean(team_points):.1f}, Spread = {np.std(team_points):.1f}")
+            if converged:
                 break
-        else:
-            print(f"Iteration {i+1}: Avg Total Points = {np.mean(team_points):.1f}, Spread = {np.std(team_points):.1f}")
-
-        prev_adp = adp_df[['name', 'sim_adp']].copy()
-        working_df = working_df.drop(columns=["ADP"], errors='ignore')
-        working_df = working_df.merge(adp_df[['name', 'sim_adp']], on='name', how='left')
-        working_df = working_df.rename(columns={"sim_adp": "ADP"})
-        working_df["ADP"] = working_df["ADP"].fillna(150)
 
-    final_adp = prev_adp.sort_values("sim_adp")
+            # Averaging starts once ADP is near its fixed point; earlier 1/k steps would freeze it too soon
+            if average and averaging_from is None and bound < 2 * tolerance:
+                averaging_from = i
+            step = 1 / (i - averaging_from + 2) if averaging_from is not None else damping
+            adp = np.where(np.isnan(adp), sim_adp, adp + step * (sim_adp - adp))
+    finally:
+        if runner is not None:
+            runner.close()
+
+    final_adp = adp_df[['name', 'sim_adp']]
+    if return_convergence:
+        return final_adp, adp_history, total_points_history, pd.DataFrame(convergence)
     return final_adp, adp_history, total_points_history
 
 # Run
-final_adp, adp_history, team_scores = run_iterative_simulation(player_df, max_iters=50)
-
-# Compute final average ADP over last X iterations
-history_threshold = min(10, len(adp_history))
-combined_adps = adp_history[-history_threshold:]
-avg_adp_df = pd.concat(combined_adps).groupby(["name", "position"]).mean().reset_index()
-avg_adp_df = avg_adp_df.rename(columns={"sim_adp": "final_average_adp"}).sort_values('final_average_adp')
-print(avg_adp_df.head(5))
-
-avg_adp_df.to_csv(PROJECT_ROOT / "assets" / "data" / "simulated_adp.csv", index=False)
-
-
+if __name__ == "__main__":
+    final_adp, adp_history, team_scores, convergence = run_iterative_simulation(
+        player_df, max_iters=50, n_drafts=1000, max_workers=os.cpu_count(), return_convergence=True)
+    print(f"{len(convergence)} iterations, final residual {convergence['residual'].iloc[-1]:.3f}")
+
+    # Compute final average ADP over last X iterations
+    history_threshold = min(10, len(adp_history))
+    combined_adps = adp_history[-history_threshold:]
+    avg_adp_df = pd.concat(combined_adps).groupby(["name", "position"]).mean().reset_index()
+    avg_adp_df = avg_adp_df.rename(columns={"sim_adp": "final_average_adp"}).sort_values('final_average_adp')
+    print(avg_adp_df.head(5))
+
+    avg_adp_df.to_csv(PROJECT_ROOT / "assets" / "data" / "simulated_adp.csv", index=False)
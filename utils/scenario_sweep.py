@@ -0,0 +1,314 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from utils.availability_index import AvailabilityIndex
+from utils.availability_model import adp_std_estimate
+from utils.data_access import CACHE_DIR, DATA_DIR, load_table
+from utils.draft_pool_calcs import compute_proj_by_position
+from utils.draft_schedule import generate_pick_order, picks_by_team
+from utils.instrumentation import span
+from utils.mip_draft_model import DraftOptimizer
+from utils.pipeline import DEFAULT_LEAGUE, PLAYER_DATA, load_league
+
+SWEEP_DIR = CACHE_DIR / "sweeps"
+POINT_QUANTILES = [0.05, 0.25, 0.5, 0.75, 0.95]
+
+# Per-process state set up by _init_worker: the player table, league and one optimizer reused for every solve
+_worker = None
+
+
+def perturb_players(player_df, rng, proj_noise=0.15, adp_noise=1.0, adp_std=None) -> pd.DataFrame:
+    """
+    One scenario: projections scaled by (1 + N(0, proj_noise)) (floored at 0) and ADP shifted by
+    N(0, adp_noise * the player's ADP std dev, see availability_model.adp_std_estimate).
+    """
+    if adp_std is None:
+        adp_std = adp_std_estimate(player_df)
+    n = len(player_df)
+    proj = player_df["proj_points"].to_numpy(dtype=float) * np.maximum(1 + rng.normal(0, proj_noise, n), 0)
+    adp = player_df["ADP"].to_numpy(dtype=float) + rng.normal(0, 1, n) * adp_noise * adp_std
+    return player_df.assign(proj_points=proj, ADP=adp)
+
+
+def _rounds(league):
+    return league["flex_limit"] + sum(con["limit"] for con in league["position_constraints"])
+
+
+def _init_worker(player_df, league, proj_noise, adp_noise):
+    global _worker
+    rounds = _rounds(league)
+    _worker = {
+        "player_df": player_df.reset_index(drop=True),
+        "adp_std": adp_std_estimate(player_df),
+        "league": league,
+        "player_picks": picks_by_team(generate_pick_order(league["num_teams"], rounds, league["draft_type"])),
+        "proj_noise": proj_noise,
+        "adp_noise": adp_noise,
+        "optimizer": None,
+    }
+
+
+def _solve_slot(picks, proj_matrix):
+    """Solve one slot's plan with the worker's optimizer (built once, then only updated)."""
+    league = _worker["league"]
+    optimizer = _worker["optimizer"]
+    if optimizer is None:
+        positions = league["positions"]
+        optimizer = _worker["optimizer"] = DraftOptimizer(
+            picks=picks, current_roster={p: 0 for p in positions}, position_constraints=league["position_constraints"],
+            positions=positions, proj_matrix=proj_matrix, flex_limit=league["flex_limit"])
+        if league["solver"] != "dp":
+            optimizer.build()
+    else:
+        optimizer.update(picks=picks, proj_matrix=proj_matrix)
+    optimizer.solve(solver_name=league["solver"])
+    return optimizer
+
+
+def _run_chunk(chunk, n_scenarios, seed_seq):
+    """
+    Solve every slot for `n_scenarios` perturbed scenarios.
+
+    Returns:
+    - Tuple[int, np.ndarray, np.ndarray] -> chunk number, (n_scenarios, slots, rounds) int8 position
+      index per pick and (n_scenarios, slots) float32 planned points
+    """
+    rng = np.random.default_rng(seed_seq)
+    league = _worker["league"]
+    positions = league["positions"]
+    position_index = {p: k for k, p in enumerate(positions)}
+    player_picks = _worker["player_picks"]
+    all_picks = sorted({pick for picks in player_picks.values() for pick in picks})
+
+    plans = np.empty((n_scenarios, len(player_picks), _rounds(league)), dtype=np.int8)
+    points = np.empty((n_scenarios, len(player_picks)), dtype=np.float32)
+    for s in range(n_scenarios):
+        df = perturb_players(_worker["player_df"], rng, _worker["proj_noise"], _worker["adp_noise"],
+                             _worker["adp_std"])
+        # One projection matrix over every pick in the draft, shared by all slots
+        proj_matrix = compute_proj_by_position(df, all_picks, positions, index=AvailabilityIndex(df))
+        for j, picks in enumerate(player_picks.values()):
+            optimizer = _solve_slot(picks, proj_matrix)
+            plans[s, j] = [position_index[p] for p in optimizer.chosen_positions()]
+            points[s, j] = optimizer.objective_value
+    return chunk, plans, points
+
+
+class ScenarioSweep:
+    def __init__(self, player_df: pd.DataFrame, league=None, proj_noise=0.15, adp_noise=1.0, seed=0, chunk_size=100,
+                 checkpoint_dir=None):
+        """
+        Draft-slot plans (DraftOptimizer, as calc_draft_playbook_mip) re-solved over many perturbed
+        projection / ADP scenarios (perturb_players).
+
+        Scenarios come in fixed-size chunks; chunk k is always drawn from the k-th child of the seed,
+        so results do not depend on the worker count, an interrupted sweep resumes where it stopped
+        and a larger sweep reuses the chunks of a smaller one. Each finished chunk is written to
+        `checkpoint_dir` (by default a directory under assets/cache/sweeps named after the player
+        table, league and noise settings).
+
+        Parameters:
+        - player_df: pd.DataFrame with columns position, ADP, proj_points (and optionally adp_std,
+          adp_high, adp_low)
+        - league: Dict -> overrides of utils.pipeline.DEFAULT_LEAGUE (num_teams, draft_type, positions,
+          position_constraints, flex_limit, solver)
+        - proj_noise: float -> relative std dev of projection noise
+        - adp_noise: float -> ADP noise in units of each player's ADP std dev
+        - seed: int
+        - chunk_size: int -> scenarios per task and per checkpoint file; part of the seeding scheme
+        - checkpoint_dir: Path
+        """
+        self.player_df = player_df.reset_index(drop=True)
+        self.league = {**DEFAULT_LEAGUE, **(league or {})}
+        self.proj_noise = proj_noise
+        self.adp_noise = adp_noise
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.positions = list(self.league["positions"])
+        self.slots = list(picks_by_team(generate_pick_order(self.league["num_teams"], _rounds(self.league),
+                                                            self.league["draft_type"])))
+        self.checkpoint_dir = checkpoint_dir or SWEEP_DIR / self.key()
+
+    def config(self) -> dict:
+        """Everything a scenario's outcome depends on (the scenario count is not: chunks are reused)."""
+        columns = [c for c in ["position", "ADP", "proj_points", "adp_std", "adp_high", "adp_low"]
+                   if c in self.player_df.columns]
+        data = pd.util.hash_pandas_object(self.player_df[columns], index=False).to_numpy()
+        return {
+            "data": hashlib.sha256(data.tobytes()).hexdigest(),
+            "league": {k: self.league[k] for k in ["num_teams", "draft_type", "positions", "position_constraints",
+                                                   "flex_limit", "solver"]},
+            "proj_noise": self.proj_noise,
+            "adp_noise": self.adp_noise,
+            "seed": self.seed,
+            "chunk_size": self.chunk_size,
+        }
+
+    def key(self) -> str:
+        return hashlib.sha256(json.dumps(self.config(), sort_keys=True).encode()).hexdigest()[:16]
+
+    def _chunk_path(self, chunk):
+        return self.checkpoint_dir / f"chunk-{chunk:06d}.npz"
+
+    def completed(self, n_scenarios) -> list:
+        """Chunks of the first `n_scenarios` scenarios that already have a checkpoint."""
+        n_chunks = -(-n_scenarios // self.chunk_size)
+        return [k for k in range(n_chunks) if self._chunk_path(k).exists()]
+
+    def run(self, n_scenarios, max_workers=None):
+        """
+        Solve the chunks of the first `n_scenarios` scenarios that are not checkpointed yet.
+
+        Parameters:
+        - n_scenarios: int -> rounded up to whole chunks
+        - max_workers: int -> worker processes (defaults to os.cpu_count(); 1 runs in this process)
+
+        Returns:
+        - SweepResult over the first `n_scenarios` scenarios
+        """
+        n_chunks = -(-n_scenarios // self.chunk_size)
+        done = set(self.completed(n_scenarios))
+        pending = [k for k in range(n_chunks) if k not in done]
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        (self.checkpoint_dir / "sweep.json").write_text(json.dumps(self.config(), indent=2, sort_keys=True))
+        if done:
+            print(f"[sweep] resuming: {len(done)} of {n_chunks} chunks already done")
+
+        initargs = (self.player_df, self.league, self.proj_noise, self.adp_noise)
+        tasks = [(k, self.chunk_size, np.random.SeedSequence(self.seed, spawn_key=(k,))) for k in pending]
+        start = time.perf_counter()
+        with span("ScenarioSweep.run", chunks=len(pending)):
+            if (max_workers or os.cpu_count()) == 1 or len(pending) <= 1:
+                _init_worker(*initargs)
+                for finished, task in enumerate(tasks, 1):
+                    self._save(*_run_chunk(*task))
+                    self._progress(len(done) + finished, n_chunks, start)
+            else:
+                with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=initargs) as pool:
+                    futures = [pool.submit(_run_chunk, *task) for task in tasks]
+                    try:
+                        for finished, future in enumerate(as_completed(futures), 1):
+                            self._save(*future.result())
+                            self._progress(len(done) + finished, n_chunks, start)
+                    except BaseException:
+                        # Finished chunks are on disk; drop the queued ones so an interrupt returns promptly
+                        pool.shutdown(cancel_futures=True)
+                        raise
+        return self.load(n_scenarios)
+
+    def _save(self, chunk, plans, points):
+        # Write-then-rename, so an interrupted write never leaves a chunk that looks finished
+        path = self._chunk_path(chunk)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(f, plans=plans, points=points)
+        tmp_path.replace(path)
+
+    def _progress(self, finished, n_chunks, start):
+        if finished % max(1, n_chunks // 20) == 0 or finished == n_chunks:
+            print(f"[sweep] {finished}/{n_chunks} chunks ({time.perf_counter() - start:.0f}s)")
+
+    def load(self, n_scenarios=None) -> "SweepResult":
+        """Checkpointed results for the first `n_scenarios` scenarios (all contiguous chunks if None)."""
+        chunks = []
+        k = 0
+        while (n_scenarios is None or k * self.chunk_size < n_scenarios) and self._chunk_path(k).exists():
+            with np.load(self._chunk_path(k)) as arrays:
+                chunks.append((arrays["plans"], arrays["points"]))
+            k += 1
+        if not chunks:
+            raise FileNotFoundError(f"No checkpointed scenarios in {self.checkpoint_dir}")
+        plans = np.concatenate([plans for plans, _ in chunks])[:n_scenarios]
+        points = np.concatenate([points for _, points in chunks])[:n_scenarios]
+        return SweepResult(plans, points, self.positions, self.slots)
+
+
+class SweepResult:
+    def __init__(self, plans, points, positions, slots):
+        """
+        Parameters:
+        - plans: np.ndarray[int8] (scenarios, slots, rounds) -> index into positions per pick
+        - points: np.ndarray (scenarios, slots) -> planned projected points
+        - positions: List[str]
+        - slots: List[int] -> draft slot of each column
+        """
+        self.plans = plans
+        self.points = points
+        self.positions = positions
+        self.slots = slots
+
+    def position_frequency(self) -> pd.DataFrame:
+        """Share of scenarios drafting each position, per slot and round (columns player, round, *positions)."""
+        n_scenarios, n_slots, n_rounds = self.plans.shape
+        # One bincount over (slot, round, position) cells
+        cells = (np.arange(n_slots)[:, None] * n_rounds + np.arange(n_rounds)) * len(self.positions)
+        counts = np.bincount((cells + self.plans).ravel(), minlength=n_slots * n_rounds * len(self.positions))
+        share = counts.reshape(n_slots * n_rounds, len(self.positions)) / n_scenarios
+        df = pd.DataFrame(share, columns=self.positions)
+        df.insert(0, "round", np.tile(np.arange(1, n_rounds + 1), n_slots))
+        df.insert(0, "player", np.repeat(self.slots, n_rounds))
+        return df
+
+    def modal_plan(self) -> pd.DataFrame:
+        """
+        Most frequent whole plan per slot (columns player, round, position) and the share of
+        scenarios that drafted exactly that plan. Unlike the per-round modes of position_frequency,
+        it is always a plan some scenario produced.
+        """
+        n_scenarios, n_slots, n_rounds = self.plans.shape
+        modal = np.empty((n_slots, n_rounds), dtype=self.plans.dtype)
+        share = np.empty(n_slots)
+        for j in range(n_slots):
+            plans, counts = np.unique(self.plans[:, j], axis=0, return_counts=True)
+            modal[j] = plans[counts.argmax()]
+            share[j] = counts.max() / n_scenarios
+        return pd.DataFrame({"player": np.repeat(self.slots, n_rounds),
+                             "round": np.tile(np.arange(1, n_rounds + 1), n_slots),
+                             "position": np.array(self.positions)[modal.ravel()],
+                             "share": np.repeat(share, n_rounds)})
+
+    def points_distribution(self) -> pd.DataFrame:
+        """Planned points per slot: mean, std and POINT_QUANTILES over scenarios."""
+        points = self.points.astype(float)
+        df = pd.DataFrame({"player": self.slots, "scenarios": len(points), "mean": points.mean(axis=0),
+                           "std": points.std(axis=0, ddof=1) if len(points) > 1 else 0.0})
+        for q, values in zip(POINT_QUANTILES, np.quantile(points, POINT_QUANTILES, axis=0)):
+            df[f"p{round(q * 100):02d}"] = values
+        return df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m utils.scenario_sweep",
+                                     description="Re-solve the draft-slot plans over perturbed projections and ADP.")
+    parser.add_argument("--scenarios", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--proj-noise", type=float, default=0.15, help="relative std dev of projection noise")
+    parser.add_argument("--adp-noise", type=float, default=1.0, help="ADP noise in ADP std devs")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=100, help="scenarios per checkpoint")
+    parser.add_argument("--league", help="YAML/JSON file overriding the default league settings")
+    parser.add_argument("--checkpoint-dir", help="default: assets/cache/sweeps/<settings hash>")
+    args = parser.parse_args(argv)
+
+    sweep = ScenarioSweep(load_table(PLAYER_DATA, dtype=np.float64), league=load_league(args.league) if args.league else None,
+                          proj_noise=args.proj_noise, adp_noise=args.adp_noise, seed=args.seed,
+                          chunk_size=args.chunk_size, checkpoint_dir=Path(args.checkpoint_dir) if args.checkpoint_dir else None)
+    result = sweep.run(args.scenarios, max_workers=args.workers)
+
+    result.position_frequency().to_csv(DATA_DIR / "scenario_position_frequency.csv", index=False)
+    points = result.points_distribution()
+    points.to_csv(DATA_DIR / "scenario_points.csv", index=False)
+    plan = result.modal_plan()
+    print(plan.pivot(index="round", columns="player", values="position"))
+    print(points.round(1).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
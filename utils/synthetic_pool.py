@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+from utils.player_registry import TEAMS
+
+# Share of the pool and a rough season-projection curve per position (points of the best player,
+# points lost per position rank), loosely fit to 2025_cleaned_data.csv
+POSITION_SHAPE = {
+    "QB": (0.11, 380.0, 6.0),
+    "RB": (0.28, 330.0, 3.2),
+    "WR": (0.36, 350.0, 2.6),
+    "TE": (0.13, 260.0, 5.0),
+    "PK": (0.06, 150.0, 1.5),
+    "DEF": (0.06, 140.0, 2.0),
+}
+
+
+def make_player_pool(n_players=300, seed=0) -> pd.DataFrame:
+    """
+    Synthetic player pool in the normalized schema (utils.data_access), for benchmarks and scenario runs.
+
+    Positions follow POSITION_SHAPE; projections fall off with position rank plus noise, and ADP follows
+    projection value with noise, so positional runs and ADP/projection disagreements both occur.
+
+    Parameters:
+    - n_players: int
+    - seed: int -> same seed, same pool
+
+    Returns:
+    - pd.DataFrame with columns name, position, team, ADP, proj_points, adp_std, adp_high, adp_low,
+      sorted by ADP
+    """
+    rng = np.random.default_rng(seed)
+    positions = list(POSITION_SHAPE)
+    share = np.array([POSITION_SHAPE[p][0] for p in positions])
+    position = rng.choice(positions, size=n_players, p=share / share.sum())
+
+    proj_points = np.empty(n_players)
+    for pos in positions:
+        rows = np.flatnonzero(position == pos)
+        _, top, drop = POSITION_SHAPE[pos]
+        proj_points[rows] = np.maximum(top - drop * np.arange(len(rows)) + rng.normal(0, 8, len(rows)), 1.0)
+
+    # Drafters value RB/WR above QB/TE/K/DEF at equal points; ADP is the rank of that noisy value
+    scarcity = {"QB": 0.75, "RB": 1.1, "WR": 1.05, "TE": 0.9, "PK": 0.4, "DEF": 0.45}
+    value = proj_points * np.vectorize(scarcity.get)(position) * rng.lognormal(0, 0.12, n_players)
+    adp = np.empty(n_players)
+    adp[np.argsort(-value, kind="stable")] = np.arange(1, n_players + 1)
+    adp = np.round(adp + rng.normal(0, 0.3, n_players).clip(-0.45, 0.45), 1)
+
+    adp_std = np.round(0.1 * adp + 1.0, 1)
+    return pd.DataFrame({
+        "name": [f"Player {i:05d}" for i in range(n_players)],
+        "position": position,
+        "team": rng.choice(sorted(TEAMS), size=n_players),
+        "ADP": adp,
+        "proj_points": np.round(proj_points, 1),
+        "adp_std": adp_std,
+        "adp_high": np.maximum(np.floor(adp - 2 * adp_std), 1),
+        "adp_low": np.ceil(adp + 2 * adp_std),
+    }).sort_values("ADP", kind="stable", ignore_index=True)
+
+
+def make_roster_constraints(rounds, flex_limit=1):
+    """
+    DraftOptimizer position_constraints with exactly `rounds` roster spots (starters, then extra
+    RB/WR/QB/TE depth for deeper drafts), as calc_draft_playbook_mip uses for 9 rounds.
+
+    Returns:
+    - Tuple[List[Dict], List[str]] -> position_constraints and positions
+    """
+    limits = {"QB": 1, "RB": 2, "WR": 2, "TE": 1, "DEF": 1, "PK": 1}
+    depth = ["RB", "WR", "QB", "TE"]
+    spots = rounds - flex_limit
+    while sum(limits.values()) > spots:
+        # Shallow drafts drop kicker, defense, then depth
+        drop = next(p for p in ["PK", "DEF", "TE", "QB", "WR", "RB"] if limits[p] > 0)
+        limits[drop] -= 1
+    i = 0
+    while sum(limits.values()) < spots:
+        limits[depth[i % len(depth)]] += 1
+        i += 1
+    flex = {"RB", "WR", "TE"}
+    constraints = [{"positions_against_limit": [p], "limit": n, "flex": p in flex} for p, n in limits.items()]
+    return constraints, list(limits)
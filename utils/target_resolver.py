@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+
+from utils.availability_index import AvailabilityIndex
+from utils.draft_schedule import generate_pick_order
+from utils.player_pool import PlayerPool, find_column
+
+
+def overall_pick_table(num_teams=12, rounds=8, draft_type="snake"):
+    """
+    Overall pick number for every (team, round).
+
+    Returns:
+    - np.ndarray[int] of shape (num_teams + 1, rounds + 1); entry [team, round] is the overall pick
+      (1-indexed team and round, row/column 0 unused)
+    """
+    table = np.zeros((num_teams + 1, rounds + 1), dtype=np.int64)
+    order = np.asarray(generate_pick_order(num_teams, rounds, draft_type))
+    rounds_of_pick = np.arange(len(order)) // num_teams + 1
+    table[order, rounds_of_pick] = np.arange(1, len(order) + 1)
+    return table
+
+
+def drafted_player(player_df, position, player, round, num_teams=12, draft_type="snake", index=None,
+                   name_col=None, position_col=None):
+    """
+    Best projected player at `position` who should still be available at `player`'s pick in `round`
+    (ADP >= overall pick). Single-query form of resolve_targets; player_df may also be a PlayerPool.
+    """
+    if index is None:
+        index = AvailabilityIndex(player_df, position_col=position_col)
+    pick_number = overall_pick_table(num_teams, round, draft_type)[player, round]
+    row = index.best_available_row(position, [pick_number])[0]
+    if row < 0:
+        return None
+    if isinstance(player_df, PlayerPool):
+        return player_df.name(row)
+    return player_df[find_column(player_df, "name", name_col)].iloc[row]
+
+
+def resolve_targets(player_df, targets_df, num_teams=12, draft_type="snake", top_k=3, index=None,
+                    name_col=None, position_col=None):
+    """
+    Turn (draft slot, round, position) targets into player names in one batched pass.
+
+    For each target the pick number comes from the draft schedule and the player is the best projected
+    one at that position with ADP >= pick, as in drafted_player; the next `top_k` players are returned
+    as alternates.
+
+    Parameters:
+    - player_df: PlayerPool, or pd.DataFrame with columns [name_col, position_col, 'ADP', 'proj_points']
+      (name_col / position_col found by player_pool.find_column when omitted)
+    - targets_df: pd.DataFrame with columns player (draft slot), round, position
+    - num_teams: int -> teams in the league
+    - draft_type: str -> see draft_schedule.generate_pick_order
+    - top_k: int -> number of alternates per target
+    - index: AvailabilityIndex -> prebuilt index over player_df (built here if omitted)
+
+    Returns:
+    - pd.DataFrame with columns player, round, position, pick_number, player_name, proj_points, alternates
+    """
+    if index is None:
+        index = AvailabilityIndex(player_df, position_col=position_col)
+
+    slots = targets_df["player"].to_numpy(dtype=np.int64)
+    rounds = targets_df["round"].to_numpy(dtype=np.int64)
+    target_positions = targets_df["position"].to_numpy()
+    pick_numbers = overall_pick_table(num_teams, int(rounds.max()) if len(rounds) else 0, draft_type)[slots, rounds]
+
+    top = np.full((len(targets_df), top_k + 1), -1, dtype=np.int64)
+    for pos in pd.unique(target_positions):
+        mask = target_positions == pos
+        top[mask] = index.top_available_rows(pos, pick_numbers[mask], top_k + 1)
+
+    if isinstance(player_df, PlayerPool):
+        names, proj = player_df.names, player_df.proj
+    else:
+        names = player_df[find_column(player_df, "name", name_col)].to_numpy()
+        proj = player_df["proj_points"].to_numpy(dtype=float)
+    best = top[:, 0]
+    found = best >= 0
+
+    return pd.DataFrame({
+        "player": slots,
+        "round": rounds,
+        "position": target_positions,
+        "pick_number": pick_numbers,
+        "player_name": np.where(found, names[best], None),
+        "proj_points": np.where(found, proj[best], np.nan),
+        "alternates": [[names[r] for r in row if r >= 0] for row in top[:, 1:]],
+    })
+
+
+def target_frequency(resolved_df):
+    """
+    How often each player comes up as a target across draft slots.
+
+    Returns:
+    - pd.DataFrame with columns player_name, position, frequency_drafted, share_of_slots,
+      earliest_round, mean_round, sorted by frequency
+    """
+    n_slots = resolved_df["player"].nunique()
+    frequency_df = (
+        resolved_df.dropna(subset=["player_name"])
+        .groupby("player_name")
+        .agg(position=("position", "first"),
+             frequency_drafted=("player", "size"),
+             earliest_round=("round", "min"),
+             mean_round=("round", "mean"))
+        .reset_index()
+    )
+    frequency_df.insert(3, "share_of_slots", frequency_df["frequency_drafted"] / n_slots)
+    return frequency_df.sort_values(["frequency_drafted", "earliest_round"], ascending=[False, True],
+                                    ignore_index=True)
@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+from utils.availability_index import AvailabilityIndex
+from utils.availability_model import ProbabilisticAvailability
+
+# Column order used by assets/data/vor_playbook.csv
+PLAYBOOK_POSITIONS = ["RB", "WR", "QB", "TE", "PK"]
+
+
+def compute_vor_grid(df: pd.DataFrame, pick_numbers, gaps, offsets=(0, -6, 6), position_col=None, index=None,
+                     method="offsets", model=None):
+    """
+    Expected VOR for every (pick_number, picks_until_next) cell at once.
+
+    Same quantity as draft_pool_calcs.calculate_expected_vor: for each offset the VOR is
+    best projection with ADP >= pick minus best projection with ADP >= pick + gap, and the
+    estimates are averaged over the offsets whose shifted pick is still >= 1. With
+    method="probabilistic" the VOR is instead the difference of expected best available
+    projections under the ADP distribution model (availability_model), and offsets are unused.
+
+    Parameters:
+    - df: pd.DataFrame with columns [position_col, 'ADP', 'proj_points']
+    - pick_numbers: Iterable[int] -> overall pick numbers (grid rows)
+    - gaps: Iterable[int] -> picks until next pick (grid columns)
+    - offsets: Iterable[int] -> pick offsets averaged over
+    - position_col: str -> name of the position column (found by player_pool.find_column if omitted)
+    - index: AvailabilityIndex -> prebuilt index over df (built here if omitted)
+    - method: str -> "offsets" or "probabilistic"
+    - model: ProbabilisticAvailability -> prebuilt model over df (method="probabilistic" only)
+
+    Returns:
+    - Tuple[List[str], np.ndarray] -> positions found in df and a
+      (len(pick_numbers), len(gaps), len(positions)) array of expected VOR
+    """
+    pick_numbers = np.asarray(pick_numbers, dtype=float)
+    gaps = np.asarray(gaps, dtype=float)
+    if method == "probabilistic":
+        return _probabilistic_vor_grid(df, pick_numbers, gaps, position_col, model)
+    if method != "offsets":
+        raise ValueError(f"Unknown method: {method}")
+
+    if index is None:
+        index = AvailabilityIndex(df, position_col=position_col)
+    positions = index.positions
+
+    vor_sum = np.zeros((len(pick_numbers), len(gaps), len(positions)))
+    n_estimates = np.zeros((len(pick_numbers), 1, 1))
+
+    for offset in offsets:
+        this_pick = pick_numbers + offset
+        valid = this_pick >= 1
+        next_pick = this_pick[:, None] + gaps[None, :]
+
+        for j, pos in enumerate(positions):
+            expected = np.nan_to_num(index.best_available_batch(pos, this_pick), nan=0.0)
+            replacement = np.nan_to_num(index.best_available_batch(pos, next_pick), nan=0.0)
+            vor = expected[:, None] - replacement
+            vor_sum[valid, :, j] += vor[valid]
+
+        n_estimates[valid] += 1
+
+    return positions, vor_sum / n_estimates
+
+
+def _probabilistic_vor_grid(df, pick_numbers, gaps, position_col, model):
+    if model is None:
+        model = ProbabilisticAvailability(df, position_col=position_col)
+    positions = model.positions
+
+    # Every cell only needs the expected best at pick and at pick + gap: evaluate each distinct pick once
+    needed, inverse = np.unique(np.concatenate([pick_numbers, (pick_numbers[:, None] + gaps[None, :]).ravel()]),
+                                return_inverse=True)
+    grid = np.zeros((len(pick_numbers), len(gaps), len(positions)))
+    for j, pos in enumerate(positions):
+        expected_best = model.expected_best(pos, needed)[inverse]
+        expected = expected_best[:len(pick_numbers)]
+        replacement = expected_best[len(pick_numbers):].reshape(len(pick_numbers), len(gaps))
+        grid[:, :, j] = expected[:, None] - replacement
+    return positions, grid
+
+
+def build_vor_playbook(df: pd.DataFrame, max_pick=100, max_gap=24, offsets=(0, -6, 6), position_col=None,
+                       playbook_positions=PLAYBOOK_POSITIONS, index=None, method="offsets"):
+    """
+    Build the VOR playbook table written to assets/data/vor_playbook.csv.
+
+    Parameters:
+    - df: pd.DataFrame with columns [position_col, 'ADP', 'proj_points']
+    - max_pick: int -> last pick_number in the playbook
+    - max_gap: int -> largest picks_until_next in the playbook
+    - offsets: Iterable[int] -> pick offsets averaged over
+    - position_col: str -> name of the position column (found by player_pool.find_column if omitted)
+    - playbook_positions: List[str] -> positions written as <pos>_vor columns (0 if absent from df)
+    - index: AvailabilityIndex -> prebuilt index over df (built here if omitted)
+    - method: str -> "offsets" or "probabilistic", see compute_vor_grid
+
+    Returns:
+    - pd.DataFrame with columns pick_number, picks_until_next and one <pos>_vor per position
+    """
+    pick_numbers = np.arange(1, max_pick + 1)
+    gaps = np.arange(1, max_gap + 1)
+    positions, grid = compute_vor_grid(df, pick_numbers, gaps, offsets, position_col, index, method=method)
+
+    playbook = {
+        "pick_number": np.repeat(pick_numbers, len(gaps)),
+        "picks_until_next": np.tile(gaps, len(pick_numbers)),
+    }
+    for pos in playbook_positions:
+        if pos in positions:
+            playbook[f"{pos.lower()}_vor"] = grid[:, :, positions.index(pos)].ravel()
+        else:
+            playbook[f"{pos.lower()}_vor"] = 0
+
+    return pd.DataFrame(playbook)
@@ -0,0 +1,261 @@
+import argparse
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from utils.data_access import CACHE_DIR, DATA_DIR, file_hash, load_table
+from utils.instrumentation import count, timed
+from utils.player_pool import find_column
+
+# Regular-season weeks; every team has one bye, so a player plays N_WEEKS - 1 games
+N_WEEKS = 18
+
+
+def weekly_matrix(player_df: pd.DataFrame, n_weeks=N_WEEKS, weekly_df=None) -> np.ndarray:
+    """
+    Players x weeks projected points.
+
+    A player's season proj_points is spread evenly over the weeks they play: 0 in their bye week
+    (column 'bye', 1-indexed) and proj_points / (n_weeks - 1) in every other week. Without a known
+    bye the bye is equally likely to be any week, so every week gets proj_points / n_weeks. Either
+    way a row sums to proj_points. Missing projections count as 0.
+
+    Parameters:
+    - player_df: pd.DataFrame with a name column, 'proj_points' and optionally 'bye'
+    - n_weeks: int -> weeks in the season
+    - weekly_df: pd.DataFrame with columns name, week (1-indexed), proj_points -> actual weekly
+      projections; they replace the spread-out values of those (player, week) cells
+
+    Returns:
+    - np.ndarray[float32] of shape (len(player_df), n_weeks), rows in player_df order
+    """
+    proj = np.nan_to_num(player_df["proj_points"].to_numpy(dtype=np.float64))
+    bye = (pd.to_numeric(player_df["bye"], errors="coerce").to_numpy(dtype=np.float64) if "bye" in player_df.columns
+           else np.full(len(player_df), np.nan))
+    has_bye = (bye >= 1) & (bye <= n_weeks)
+
+    matrix = np.repeat(np.where(has_bye, proj / (n_weeks - 1), proj / n_weeks)[:, None], n_weeks, axis=1)
+    matrix[np.flatnonzero(has_bye), bye[has_bye].astype(np.int64) - 1] = 0.0
+
+    if weekly_df is not None:
+        names = player_df[find_column(player_df, "name")].to_numpy()
+        row_of = {name: row for row, name in reversed(list(enumerate(names)))}
+        rows = np.array([row_of.get(name, -1) for name in weekly_df[find_column(weekly_df, "name")]], dtype=np.int64)
+        weeks = weekly_df["week"].to_numpy(dtype=np.int64) - 1
+        known = (rows >= 0) & (weeks >= 0) & (weeks < n_weeks)
+        matrix[rows[known], weeks[known]] = np.nan_to_num(weekly_df["proj_points"].to_numpy(dtype=np.float64)[known])
+    return matrix.astype(np.float32)
+
+
+def _players_path(path):
+    return Path(path).with_suffix(".players.npz")
+
+
+class WeeklyProjections:
+    def __init__(self, matrix, names, positions, path=None):
+        """
+        Weekly projection store: a players x weeks float32 matrix plus each row's name and position.
+
+        Stores opened from disk (open / for_table) hold a read-only memory map, so every process
+        reading the same file shares the operating system's page cache instead of its own copy, and
+        pickling the store (e.g. as ProcessPoolExecutor initargs) only sends the path.
+
+        Parameters:
+        - matrix: np.ndarray or np.memmap of shape (n_players, n_weeks)
+        - names: np.ndarray[object] -> player name per row
+        - positions: np.ndarray[object] -> position per row
+        - path: Path -> .npy file the matrix is mapped from (None for an in-memory store)
+        """
+        self.matrix = matrix
+        self.names = names
+        self.positions = positions
+        self.path = path
+
+    @classmethod
+    def build(cls, player_df: pd.DataFrame, path, n_weeks=N_WEEKS, weekly_df=None) -> "WeeklyProjections":
+        """Write the weekly_matrix of player_df to `path` (.npy plus a .players.npz sidecar) and open it."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        names = player_df[find_column(player_df, "name")].to_numpy()
+        positions = player_df[find_column(player_df, "position")].to_numpy()
+        with open(_players_path(path), "wb") as f:
+            np.savez(f, names=np.asarray(names, dtype=str), positions=np.asarray(positions, dtype=str))
+
+        # Write-then-rename (the matrix last), so readers never map a partial file
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        values = weekly_matrix(player_df, n_weeks, weekly_df)
+        matrix = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float32, shape=values.shape)
+        matrix[:] = values
+        matrix.flush()
+        del matrix
+        tmp_path.replace(path)
+        return cls.open(path)
+
+    @classmethod
+    def open(cls, path) -> "WeeklyProjections":
+        """Map a store written by build() read-only."""
+        path = Path(path)
+        with np.load(_players_path(path)) as players:
+            names, positions = players["names"].astype(object), players["positions"].astype(object)
+        return cls(np.load(path, mmap_mode="r"), names, positions, path)
+
+    @classmethod
+    @timed("WeeklyProjections.for_table")
+    def for_table(cls, filename, n_weeks=N_WEEKS, data_dir=None, cache_dir=None) -> "WeeklyProjections":
+        """
+        Store for a player table in assets/data (rows in file order), built on first use and cached in
+        `cache_dir` under the file's content hash, as load_table does for the table itself.
+        """
+        path = (data_dir or DATA_DIR) / filename
+        cache_dir = cache_dir or CACHE_DIR
+        content_hash = file_hash(path)
+        store_path = cache_dir / f"{path.stem}-{content_hash[:16]}-weekly{n_weeks}.npy"
+        if store_path.exists() and _players_path(store_path).exists():
+            count("WeeklyProjections.cache_hit")
+            return cls.open(store_path)
+
+        count("WeeklyProjections.build")
+        for stale in cache_dir.glob(f"{path.stem}-*-weekly{n_weeks}.*"):
+            if stale.name.split(".")[0] != store_path.stem:
+                stale.unlink(missing_ok=True)
+        return cls.build(load_table(filename, dtype=np.float64, data_dir=data_dir), store_path, n_weeks)
+
+    def __reduce__(self):
+        if self.path is None:
+            return super().__reduce__()
+        return WeeklyProjections.open, (self.path,)
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    @property
+    def n_weeks(self) -> int:
+        return self.matrix.shape[1]
+
+    def rows_for(self, names) -> np.ndarray:
+        """Store row of each name (the first row with that name), -1 for names not in the store."""
+        row_of = {name: row for row, name in reversed(list(enumerate(self.names)))}
+        return np.array([row_of.get(name, -1) for name in names], dtype=np.int64)
+
+
+class LineupScorer:
+    def __init__(self, store: WeeklyProjections, position_constraints, flex_limit=1, chunk_size=4096):
+        """
+        Season value of rosters as the sum over weeks of their best starting lineup.
+
+        Each week a roster starts its `limit` best players of every constraint group and then the
+        `flex_limit` best of the remaining players in flex groups. With disjoint groups (as in every
+        league config here) filling each group greedily and FLEX from what is left is optimal.
+        Players of positions outside every group never start.
+
+        Rosters are scored in chunks of `chunk_size`, all weeks at once with array operations.
+
+        Parameters:
+        - store: WeeklyProjections
+        - position_constraints: List[Dict] -> as for DraftOptimizer (positions_against_limit, limit, flex)
+        - flex_limit: int -> FLEX slots
+        - chunk_size: int -> rosters per chunk (memory is chunk_size x roster size x weeks floats)
+        """
+        self.store = store
+        self.position_constraints = position_constraints
+        self.flex_limit = flex_limit
+        self.chunk_size = chunk_size
+        group_of = {p: g for g, con in enumerate(position_constraints) for p in con["positions_against_limit"]}
+        # Group per store row, with an extra -1 entry for empty roster spots (row -1)
+        self._group = np.array([group_of.get(p, -1) for p in store.positions] + [-1], dtype=np.int64)
+        self._limits = [con["limit"] for con in position_constraints]
+        self._flex = [con.get("flex", False) for con in position_constraints]
+
+    def __reduce__(self):
+        return LineupScorer, (self.store, self.position_constraints, self.flex_limit, self.chunk_size)
+
+    @timed("LineupScorer.score")
+    def score(self, rosters, weekly=False) -> np.ndarray:
+        """
+        Parameters:
+        - rosters: array-like of int, shape (n_rosters, roster_size) -> store rows, -1 for empty spots
+        - weekly: bool -> return the lineup points of every week instead of the season total
+
+        Returns:
+        - np.ndarray of shape (n_rosters,) or (n_rosters, n_weeks)
+        """
+        rosters = np.asarray(rosters, dtype=np.int64)
+        if rosters.ndim == 1:
+            rosters = rosters[None, :]
+        points = np.zeros((len(rosters), self.store.n_weeks))
+        for start in range(0, len(rosters), self.chunk_size):
+            points[start:start + self.chunk_size] = self._score_chunk(rosters[start:start + self.chunk_size])
+        return points if weekly else points.sum(axis=1)
+
+    def _score_chunk(self, rosters):
+        filled = rosters >= 0
+        # (rosters, spots, weeks); reading the rows pages them in from the mapped file
+        points = np.asarray(self.store.matrix[np.where(filled, rosters, 0)])
+        group = self._group[np.where(filled, rosters, -1)]
+
+        lineup = np.zeros((len(rosters), points.shape[2]), dtype=points.dtype)
+        bench = []
+        for g, (limit, flex) in enumerate(zip(self._limits, self._flex)):
+            in_group = (group == g)[:, :, None]
+            if not in_group.any():
+                continue
+            # Best first along the roster axis; -inf marks spots outside the group
+            ranked = -np.sort(np.where(in_group, -points, np.inf), axis=1)
+            lineup += _finite_sum(ranked[:, :limit])
+            if flex:
+                bench.append(ranked[:, limit:])
+        if bench and self.flex_limit:
+            ranked = -np.sort(-np.concatenate(bench, axis=1), axis=1)
+            lineup += _finite_sum(ranked[:, :self.flex_limit])
+        return lineup
+
+
+def _finite_sum(values):
+    return np.where(np.isfinite(values), values, 0.0).sum(axis=1)
+
+
+def expected_rows(index, picks, positions, store_rows=None, depth=None) -> dict:
+    """
+    Players expected at each (pick, position): the best projected ones with ADP >= pick
+    (AvailabilityIndex.top_available_rows), best first. The first is the player behind
+    compute_proj_by_position's offset-0 value; the rest let a plan with several picks at one
+    position take the next best instead of the same player again (DraftOptimizer._solve_lineup).
+
+    Parameters:
+    - index: AvailabilityIndex over the player table
+    - picks: Iterable[int] -> overall pick numbers
+    - positions: Iterable[str]
+    - store_rows: np.ndarray -> store row per player table row (WeeklyProjections.rows_for), if the
+      store was not built from the same table
+    - depth: int -> players per (pick, position) (defaults to one per pick, the most a plan can use)
+
+    Returns:
+    - Dict[(int, str), np.ndarray[int]] -> rows per (pick, position), best first, empty where nobody
+      is left (as DraftOptimizer's player_rows)
+    """
+    picks = list(picks)
+    depth = depth or len(picks)
+    rows = {}
+    for pos in positions:
+        for pick, top in zip(picks, index.top_available_rows(pos, np.asarray(picks, dtype=float), depth)):
+            top = top[top >= 0]
+            if store_rows is not None:
+                top = store_rows[top]
+            rows[(pick, pos)] = top
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m utils.weekly_projections",
+                                     description="Build (or reuse) the weekly projection store of a player table.")
+    parser.add_argument("table", nargs="?", default="2025_cleaned_data.csv", help="CSV under assets/data")
+    parser.add_argument("--weeks", type=int, default=N_WEEKS, help="weeks in the season")
+    args = parser.parse_args(argv)
+
+    store = WeeklyProjections.for_table(args.table, n_weeks=args.weeks)
+    print(f"{len(store)} players x {store.n_weeks} weeks mapped from {store.path}")
+
+
+if __name__ == "__main__":
+    main()